@@ -158,15 +158,128 @@ CREATE TABLE IF NOT EXISTS fundamental_data (
 );
 
 -- API Query Cache Table
+-- Shared L2 behind the in-process caches (src/cache/query_cache.py);
+-- payload holds compressed binary values described by encoding; symbol and
+-- range_start/range_end let market_data writes invalidate overlapping rows
 CREATE TABLE IF NOT EXISTS query_cache (
     id BIGINT AUTO_INCREMENT PRIMARY KEY,
-    query_hash VARCHAR(64),
+    query_hash VARCHAR(64) NOT NULL,
     endpoint VARCHAR(255),
     parameters JSON,
     response JSON,
+    payload LONGBLOB,
+    encoding VARCHAR(16),
+    symbol VARCHAR(20),
+    range_start DATETIME,
+    range_end DATETIME,
     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-    expires_at DATETIME,
-    INDEX idx_query (query_hash, expires_at)
+    expires_at DATETIME NOT NULL,
+    UNIQUE KEY uq_query_hash (query_hash),
+    INDEX idx_expires (expires_at),
+    INDEX idx_symbol_range (symbol, range_start)
+);
+
+-- Upgrade query_cache tables created before it became the shared L2; the
+-- CREATE above is skipped for them. MySQL has no ADD COLUMN IF NOT EXISTS,
+-- so each change runs only when information_schema shows it is missing.
+-- Rows are only a cache: unkeyed, unexpiring and duplicate ones are dropped.
+DELETE FROM query_cache WHERE query_hash IS NULL OR expires_at IS NULL;
+DELETE older FROM query_cache older
+    JOIN query_cache newer ON older.query_hash = newer.query_hash AND older.id < newer.id;
+ALTER TABLE query_cache
+    MODIFY query_hash VARCHAR(64) NOT NULL,
+    MODIFY expires_at DATETIME NOT NULL;
+
+SET @ddl = IF((SELECT COUNT(*) FROM information_schema.COLUMNS
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'query_cache'
+                 AND COLUMN_NAME = 'payload') = 0,
+              'ALTER TABLE query_cache ADD COLUMN payload LONGBLOB AFTER response', 'DO 0');
+PREPARE query_cache_ddl FROM @ddl;
+EXECUTE query_cache_ddl;
+DEALLOCATE PREPARE query_cache_ddl;
+
+SET @ddl = IF((SELECT COUNT(*) FROM information_schema.COLUMNS
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'query_cache'
+                 AND COLUMN_NAME = 'encoding') = 0,
+              'ALTER TABLE query_cache ADD COLUMN encoding VARCHAR(16) AFTER payload', 'DO 0');
+PREPARE query_cache_ddl FROM @ddl;
+EXECUTE query_cache_ddl;
+DEALLOCATE PREPARE query_cache_ddl;
+
+SET @ddl = IF((SELECT COUNT(*) FROM information_schema.STATISTICS
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'query_cache'
+                 AND INDEX_NAME = 'uq_query_hash') = 0,
+              'ALTER TABLE query_cache ADD UNIQUE KEY uq_query_hash (query_hash)', 'DO 0');
+PREPARE query_cache_ddl FROM @ddl;
+EXECUTE query_cache_ddl;
+DEALLOCATE PREPARE query_cache_ddl;
+
+SET @ddl = IF((SELECT COUNT(*) FROM information_schema.STATISTICS
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'query_cache'
+                 AND INDEX_NAME = 'idx_expires') = 0,
+              'ALTER TABLE query_cache ADD INDEX idx_expires (expires_at)', 'DO 0');
+PREPARE query_cache_ddl FROM @ddl;
+EXECUTE query_cache_ddl;
+DEALLOCATE PREPARE query_cache_ddl;
+
+-- uq_query_hash replaces the old (query_hash, expires_at) index
+SET @ddl = IF((SELECT COUNT(*) FROM information_schema.STATISTICS
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'query_cache'
+                 AND INDEX_NAME = 'idx_query') > 0,
+              'ALTER TABLE query_cache DROP INDEX idx_query', 'DO 0');
+PREPARE query_cache_ddl FROM @ddl;
+EXECUTE query_cache_ddl;
+DEALLOCATE PREPARE query_cache_ddl;
+
+-- Range columns used to invalidate rows overlapping market_data writes
+SET @ddl = IF((SELECT COUNT(*) FROM information_schema.COLUMNS
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'query_cache'
+                 AND COLUMN_NAME = 'symbol') = 0,
+              'ALTER TABLE query_cache ADD COLUMN symbol VARCHAR(20) AFTER encoding', 'DO 0');
+PREPARE query_cache_ddl FROM @ddl;
+EXECUTE query_cache_ddl;
+DEALLOCATE PREPARE query_cache_ddl;
+
+SET @ddl = IF((SELECT COUNT(*) FROM information_schema.COLUMNS
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'query_cache'
+                 AND COLUMN_NAME = 'range_start') = 0,
+              'ALTER TABLE query_cache ADD COLUMN range_start DATETIME AFTER symbol', 'DO 0');
+PREPARE query_cache_ddl FROM @ddl;
+EXECUTE query_cache_ddl;
+DEALLOCATE PREPARE query_cache_ddl;
+
+SET @ddl = IF((SELECT COUNT(*) FROM information_schema.COLUMNS
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'query_cache'
+                 AND COLUMN_NAME = 'range_end') = 0,
+              'ALTER TABLE query_cache ADD COLUMN range_end DATETIME AFTER range_start', 'DO 0');
+PREPARE query_cache_ddl FROM @ddl;
+EXECUTE query_cache_ddl;
+DEALLOCATE PREPARE query_cache_ddl;
+
+SET @ddl = IF((SELECT COUNT(*) FROM information_schema.STATISTICS
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'query_cache'
+                 AND INDEX_NAME = 'idx_symbol_range') = 0,
+              'ALTER TABLE query_cache ADD INDEX idx_symbol_range (symbol, range_start)', 'DO 0');
+PREPARE query_cache_ddl FROM @ddl;
+EXECUTE query_cache_ddl;
+DEALLOCATE PREPARE query_cache_ddl;
+
+-- Backfill Progress Table
+-- Per-chunk checkpoints of historical backfills (src/fetch_modules/backfill.py);
+-- a chunk is marked done in the transaction that writes its market_data rows
+CREATE TABLE IF NOT EXISTS backfill_progress (
+    job_id VARCHAR(64) NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    timeframe VARCHAR(8) NOT NULL,
+    chunk_start DATE NOT NULL,
+    chunk_end DATE NOT NULL,
+    status ENUM('pending', 'running', 'done', 'failed') NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    rows_loaded INT,
+    error VARCHAR(1000),
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_id, symbol, timeframe, chunk_start),
+    INDEX idx_job_status (job_id, status)
 );
 
 -- Symbols Table
@@ -287,14 +400,9 @@ BEGIN
     DELETE FROM audit_log WHERE timestamp < cleanup_date;
 END //
 
-CREATE PROCEDURE rotate_partitions()
-BEGIN
-    -- Use fixed dates for partitions
-    ALTER TABLE market_data REORGANIZE PARTITION p_future INTO (
-        PARTITION p4 VALUES LESS THAN (TO_DAYS('2028-12-31')),
-        PARTITION p_future VALUES LESS THAN MAXVALUE
-    );
-END //
+-- market_data partitions are split ahead of time by
+-- src/database/partitions.PartitionManager instead of a fixed-date procedure;
+-- DataManager.start_maintenance runs it at API startup and then daily
 
 -- Additional Database Procedures
 -- Market Statistics Procedure
@@ -517,6 +625,5 @@ STARTS CURRENT_DATE + INTERVAL 1 DAY
 DO
 BEGIN
     CALL cleanup_old_data(90);
-    CALL rotate_partitions();
     CALL check_database_health();
 END;
\ No newline at end of file
@@ -117,8 +117,14 @@ END //
 -- Test Database Maintenance
 CREATE PROCEDURE test_maintenance()
 BEGIN
-    -- Test partition rotation
-    CALL rotate_partitions();
+    -- Test partition headroom; PartitionManager splits p_future ahead of
+    -- time (DataManager.start_maintenance), there is no SQL rotation step
+    SELECT
+        SUM(PARTITION_DESCRIPTION <> 'MAXVALUE'
+            AND CAST(PARTITION_DESCRIPTION AS UNSIGNED) > TO_DAYS(CURRENT_DATE)) AS future_partitions,
+        SUM(PARTITION_NAME = 'p_future') AS has_catch_all
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'market_data';
     
     -- Test data archival
     CALL archive_old_data(DATE_SUB(CURRENT_DATE, INTERVAL 90 DAY));
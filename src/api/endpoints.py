@@ -1,5 +1,6 @@
 # src/core/data/api/endpoints.py
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
@@ -11,7 +12,19 @@ from ..data_manager import DataManager, RequestType, DataSource
 from ..models import MarketDataRequest, MarketData
 from ..database_config import DatabaseConfig
 
-app = FastAPI(title="Market Data API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the pool and warm caches before serving; drain on shutdown"""
+    await market_data_endpoints.data_manager.db.core.open()
+    # Splits p_future before new bars land in it, then again daily
+    await market_data_endpoints.data_manager.start_maintenance()
+    # Range cache sweeps, shared cache sweep and access log flushing
+    await market_data_endpoints.data_manager.market_data.start()
+    await market_data_endpoints.data_manager.warm_cache()
+    yield
+    await market_data_endpoints.data_manager.close()
+
+app = FastAPI(title="Market Data API", lifespan=lifespan)
 logger = logging.getLogger(__name__)
 
 class MarketDataEndpoints:
@@ -113,4 +126,9 @@ async def database_operation(operation: str):
             "operation": operation
         })
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/database/pool")
+async def pool_stats():
+    """Report async connection pool occupancy"""
+    return market_data_endpoints.data_manager.db.core.pool_stats()
@@ -0,0 +1,169 @@
+# src/cache/async_memo.py
+
+import asyncio
+import functools
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+@dataclass
+class MemoStats:
+    """Counters for an AsyncMemo"""
+    hits: int = 0
+    misses: int = 0
+    joins: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+
+def make_key(args: Tuple, kwargs: Dict[str, Any]) -> Hashable:
+    """Default cache key: positional args plus sorted keyword args"""
+    return args + tuple(sorted(kwargs.items())) if kwargs else args
+
+
+class AsyncMemo:
+    """TTL and size bounded memoization for a coroutine function
+
+    Results, not coroutine objects, are cached. Concurrent calls for a key
+    that is still being computed await the same in-flight task
+    (single-flight), so one upstream request serves all of them. Failures
+    are propagated to every waiter and never cached. A ttl of 0 keeps only
+    the single-flight deduplication. ttl_for, called with the function's
+    arguments, overrides ttl per call.
+    """
+
+    def __init__(self, func: Callable[..., Awaitable[Any]],
+                 maxsize: int = 1000,
+                 ttl: float = 300.0,
+                 key: Optional[Callable[..., Hashable]] = None,
+                 ttl_for: Optional[Callable[..., float]] = None):
+        self.func = func
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttl_for = ttl_for
+        self.key = key
+        self.stats = MemoStats()
+        self._results: 'OrderedDict[Hashable, Tuple[Any, float]]' = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.logger = logging.getLogger(__name__)
+        functools.update_wrapper(self, func)
+
+    def _key(self, args: Tuple, kwargs: Dict[str, Any]) -> Hashable:
+        return self.key(*args, **kwargs) if self.key else make_key(args, kwargs)
+
+    async def __call__(self, *args, **kwargs) -> Any:
+        key = self._key(args, kwargs)
+
+        entry = self._results.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if time.monotonic() < expires_at:
+                self._results.move_to_end(key)
+                self.stats.hits += 1
+                return value
+            del self._results[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats.joins += 1
+        else:
+            self.stats.misses += 1
+            task = asyncio.ensure_future(self._run(key, args, kwargs))
+            self._inflight[key] = task
+        # A cancelled caller must not cancel the fetch other callers share
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+        try:
+            value = await self.func(*args, **kwargs)
+        except BaseException:
+            self.stats.errors += 1
+            raise
+        else:
+            ttl = self.ttl_for(*args, **kwargs) if self.ttl_for else self.ttl
+            if ttl > 0 and self.maxsize > 0:
+                self._store(key, value, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._results[key] = (value, time.monotonic() + ttl)
+        self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, *args, **kwargs) -> bool:
+        """Drop the cached result for these arguments"""
+        return self._results.pop(self._key(args, kwargs), None) is not None
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop cached results whose key matches predicate"""
+        keys = [k for k in self._results if predicate(k)]
+        for k in keys:
+            del self._results[k]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every cached result; in-flight calls still complete"""
+        self._results.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of memo counters"""
+        return {
+            'size': len(self._results),
+            'maxsize': self.maxsize,
+            'inflight': len(self._inflight),
+            'hits': self.stats.hits,
+            'misses': self.stats.misses,
+            'joins': self.stats.joins,
+            'evictions': self.stats.evictions,
+            'errors': self.stats.errors
+        }
+
+
+class MemoizedFunction:
+    """Coroutine function wrapped by async_memoize
+
+    Called directly it shares one AsyncMemo. Accessed as a method, each
+    instance gets its own AsyncMemo, created on first access and stored on
+    the instance, so cached results never keep instances alive from a
+    class-level table.
+    """
+
+    def __init__(self, func: Callable[..., Awaitable[Any]], maxsize: int,
+                 ttl: float, key: Optional[Callable[..., Hashable]]):
+        self.func = func
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.key = key
+        self.name = func.__name__
+        self.memo = AsyncMemo(func, maxsize, ttl, key)
+        functools.update_wrapper(self, func)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    async def __call__(self, *args, **kwargs) -> Any:
+        return await self.memo(*args, **kwargs)
+
+    def __get__(self, instance: Any, owner: type = None) -> Any:
+        if instance is None:
+            return self
+        memo = AsyncMemo(self.func.__get__(instance, owner), self.maxsize, self.ttl, self.key)
+        # Later lookups find the instance attribute and skip the descriptor
+        instance.__dict__[self.name] = memo
+        return memo
+
+
+def async_memoize(maxsize: int = 1000, ttl: float = 300.0,
+                  key: Optional[Callable[..., Hashable]] = None
+                  ) -> Callable[[Callable[..., Awaitable[Any]]], MemoizedFunction]:
+    """Decorator form of AsyncMemo for coroutine functions and methods"""
+    def decorator(func: Callable[..., Awaitable[Any]]) -> MemoizedFunction:
+        return MemoizedFunction(func, maxsize, ttl, key)
+    return decorator
@@ -0,0 +1,90 @@
+# src/cache/codec.py
+
+import io
+import json
+import zlib
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Encodings stored next to payloads so readers know how to decode them
+FRAME_ZLIB = 'frame+zlib'
+JSON_ZLIB = 'json+zlib'
+
+# Array name for the DataFrame index inside an encoded frame
+INDEX_COLUMN = '__index__'
+
+
+def column_array(values: Any) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Fixed-width array for a column plus what is needed to restore it"""
+    if isinstance(values, pd.DatetimeIndex) or pd.api.types.is_datetime64_any_dtype(values):
+        stamps = pd.DatetimeIndex(values)
+        tz = str(stamps.tz) if stamps.tz is not None else None
+        if tz is not None:
+            stamps = stamps.tz_convert('UTC').tz_localize(None)
+        return stamps.asi8, {'kind': 'datetime', 'tz': tz, 'unit': stamps.unit}
+    array = np.asarray(values)
+    if array.dtype == object:
+        # Fixed-width unicode keeps object columns mmap-able and pickle-free
+        return array.astype(str), {'kind': 'str'}
+    return array, {'kind': 'plain'}
+
+
+def restore_column(array: np.ndarray, meta: Dict[str, Any]) -> Any:
+    """Inverse of column_array"""
+    if meta['kind'] == 'datetime':
+        stamps = pd.DatetimeIndex(array.view(f"datetime64[{meta.get('unit', 'ns')}]"))
+        return stamps.tz_localize('UTC').tz_convert(meta['tz']) if meta.get('tz') else stamps
+    if meta['kind'] == 'str':
+        return array.astype(object)
+    return array
+
+
+def encode_frame(frame: pd.DataFrame, level: int = 6) -> bytes:
+    """Compressed, pickle-free binary form of a DataFrame"""
+    arrays = {}
+    columns = []
+    index_array, index_meta = column_array(frame.index)
+    arrays['0'] = index_array
+    for i, column in enumerate(frame.columns, 1):
+        array, meta = column_array(frame[column])
+        arrays[str(i)] = array
+        columns.append({'name': column, **meta})
+    header = {'index': {'name': frame.index.name, **index_meta}, 'columns': columns}
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    body = json.dumps(header).encode()
+    return zlib.compress(len(body).to_bytes(4, 'big') + body + buffer.getvalue(), level)
+
+
+def decode_frame(payload: bytes) -> pd.DataFrame:
+    """Inverse of encode_frame"""
+    raw = zlib.decompress(payload)
+    size = int.from_bytes(raw[:4], 'big')
+    header = json.loads(raw[4:4 + size])
+    with np.load(io.BytesIO(raw[4 + size:]), allow_pickle=False) as arrays:
+        index = pd.Index(restore_column(arrays['0'], header['index']),
+                         name=header['index'].get('name'))
+        data = {
+            c['name']: restore_column(arrays[str(i)], c)
+            for i, c in enumerate(header['columns'], 1)
+        }
+    return pd.DataFrame(data, index=index, columns=[c['name'] for c in header['columns']])
+
+
+def encode_value(value: Any, level: int = 6) -> Tuple[bytes, str]:
+    """Payload and encoding name for a DataFrame or JSON-able value"""
+    if isinstance(value, pd.DataFrame):
+        return encode_frame(value, level), FRAME_ZLIB
+    return zlib.compress(json.dumps(value, default=str).encode(), level), JSON_ZLIB
+
+
+def decode_value(payload: bytes, encoding: str) -> Any:
+    """Inverse of encode_value"""
+    if encoding == FRAME_ZLIB:
+        return decode_frame(payload)
+    if encoding == JSON_ZLIB:
+        return json.loads(zlib.decompress(payload))
+    raise ValueError(f"Unknown cache payload encoding: {encoding}")
@@ -0,0 +1,327 @@
+# src/cache/disk_cache.py
+
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .codec import INDEX_COLUMN, column_array, restore_column
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - no flock; one process per directory
+    fcntl = None
+
+INDEX_FILE = 'index.json'
+INDEX_VERSION = 1
+# Held while the index is read, changed and written, by every process
+LOCK_FILE = 'index.lock'
+# Temporary segment dirs younger than this may be another writer's put
+STALE_TMP_SECONDS = 3600.0
+
+
+@dataclass
+class DiskSegment:
+    """Index record for one stored segment directory"""
+    name: str
+    symbol: str
+    timeframe: str
+    first: str
+    last: str
+    rows: int
+    bytes: int
+    columns: List[Dict[str, Any]] = field(default_factory=list)
+    index: Dict[str, Any] = field(default_factory=dict)
+    accessed: float = 0.0
+
+    @property
+    def span(self) -> Tuple[date, date]:
+        return date.fromisoformat(self.first), date.fromisoformat(self.last)
+
+
+def _fsync_dir(path: str) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class DiskCache:
+    """Persistent tier of per-(symbol, timeframe) bar segments
+
+    Each segment is a directory of one .npy file per column, written under
+    a temporary name and renamed into place, so readers never see partial
+    data. index.json, replaced atomically after every change, records each
+    segment's span, size and last access. Numeric and datetime columns are
+    opened with mmap_mode='r', so loading a segment maps the file rather
+    than copying it. Segments are evicted least recently used first once
+    the directory exceeds max_bytes.
+
+    Several processes (e.g. API workers) may share a directory: every
+    index change re-reads index.json and rewrites it under an flock on
+    index.lock, so no process drops segments written by another.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 10 * 1024 ** 3):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = Lock()
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(directory, exist_ok=True)
+        self.segments: Dict[str, DiskSegment] = {}
+        self._index_mtime: Optional[int] = None
+        with self._exclusive():
+            self._sync()
+            self._remove_orphans()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    @contextmanager
+    def _exclusive(self):
+        """Hold the thread lock and the directory's inter-process lock"""
+        with self.lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.directory, LOCK_FILE), 'a') as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _load_index(self) -> Dict[str, DiskSegment]:
+        try:
+            self._index_mtime = os.stat(self.index_path).st_mtime_ns
+            with open(self.index_path) as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable cache index {self.index_path}: {e}")
+            return {}
+        if raw.get('version') != INDEX_VERSION:
+            return {}
+        segments = {}
+        for item in raw.get('segments', []):
+            seg = DiskSegment(**item)
+            if os.path.isdir(os.path.join(self.directory, seg.name)):
+                segments[seg.name] = seg
+        return segments
+
+    def _sync(self) -> None:
+        """Adopt the shared index, keeping newer local access times; hold _exclusive"""
+        stored = self._load_index()
+        for name, seg in stored.items():
+            mine = self.segments.get(name)
+            if mine is not None and mine.accessed > seg.accessed:
+                seg.accessed = mine.accessed
+        self.segments = stored
+
+    def _refresh(self) -> None:
+        """Pick up index changes made by other processes"""
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._index_mtime:
+            with self._exclusive():
+                self._sync()
+
+    def _remove_orphans(self) -> None:
+        # Segments renamed into place are indexed under the same lock, so an
+        # unindexed one is left from a crash; temporary dirs may still be
+        # another process's write in progress unless they are old
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir() or entry.name in self.segments:
+                continue
+            if entry.name.endswith('.tmp'):
+                try:
+                    if now - entry.stat().st_mtime < STALE_TMP_SECONDS:
+                        continue
+                except OSError:
+                    continue
+            self._remove_dir(entry.name)
+
+    def _write_index(self) -> None:
+        tmp = f"{self.index_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'segments': [asdict(s) for s in self.segments.values()]
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+        _fsync_dir(self.directory)
+        self._index_mtime = os.stat(self.index_path).st_mtime_ns
+
+    def _remove_dir(self, name: str) -> None:
+        shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def series(self, symbol: str, timeframe: str) -> List[DiskSegment]:
+        """Stored segments for a series in span order"""
+        self._refresh()
+        with self.lock:
+            found = [s for s in self.segments.values()
+                     if s.symbol == symbol and s.timeframe == timeframe]
+        return sorted(found, key=lambda s: s.first)
+
+    def timeframes(self, symbol: str) -> List[str]:
+        """Timeframes with stored segments for a symbol"""
+        self._refresh()
+        with self.lock:
+            return sorted({s.timeframe for s in self.segments.values() if s.symbol == symbol})
+
+    def put(self, symbol: str, timeframe: str, first: date, last: date,
+            frame: pd.DataFrame) -> DiskSegment:
+        """Store [first, last] for a series, replacing segments it overlaps"""
+        name = f"{symbol}_{timeframe}_{first:%Y%m%d}_{last:%Y%m%d}_{uuid.uuid4().hex[:8]}"
+        tmp = os.path.join(self.directory, f".{name}.tmp")
+        os.makedirs(tmp)
+        try:
+            columns = []
+            size = 0
+            frame = frame if frame is not None else pd.DataFrame()
+            arrays = [(INDEX_COLUMN, frame.index)] + [(c, frame[c]) for c in frame.columns]
+            index = {}
+            for i, (column, values) in enumerate(arrays):
+                array, meta = column_array(values)
+                path = os.path.join(tmp, f"{i}.npy")
+                np.save(path, array, allow_pickle=False)
+                size += os.path.getsize(path)
+                if column == INDEX_COLUMN:
+                    index = {'name': frame.index.name, 'file': f"{i}.npy", **meta}
+                else:
+                    columns.append({'name': column, 'file': f"{i}.npy", **meta})
+            for entry in os.scandir(tmp):
+                with open(entry.path, 'rb+') as f:
+                    os.fsync(f.fileno())
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        seg = DiskSegment(
+            name=name, symbol=symbol, timeframe=timeframe,
+            first=first.isoformat(), last=last.isoformat(),
+            rows=len(frame), bytes=size, columns=columns, index=index,
+            accessed=time.time()
+        )
+        with self._exclusive():
+            self._sync()
+            try:
+                os.rename(tmp, os.path.join(self.directory, name))
+            except BaseException:
+                shutil.rmtree(tmp, ignore_errors=True)
+                raise
+            replaced = [
+                s.name for s in self.segments.values()
+                if s.symbol == symbol and s.timeframe == timeframe
+                and s.first <= seg.last and s.last >= seg.first
+            ]
+            for old in replaced:
+                del self.segments[old]
+            self.segments[name] = seg
+            evicted = self._evict()
+            self._write_index()
+        for old in replaced + evicted:
+            self._remove_dir(old)
+        return seg
+
+    def _evict(self) -> List[str]:
+        total = sum(s.bytes for s in self.segments.values())
+        evicted = []
+        for seg in sorted(self.segments.values(), key=lambda s: s.accessed):
+            if total <= self.max_bytes:
+                break
+            del self.segments[seg.name]
+            total -= seg.bytes
+            evicted.append(seg.name)
+            self.evictions += 1
+        return evicted
+
+    @staticmethod
+    def _map(path: str, name: str) -> np.ndarray:
+        # Plain read-only ndarray view over the mapping, not an np.memmap
+        return np.load(os.path.join(path, name), mmap_mode='r').view(np.ndarray)
+
+    def load(self, seg: DiskSegment) -> Optional[pd.DataFrame]:
+        """Memory-map a stored segment; None if its files are gone"""
+        path = os.path.join(self.directory, seg.name)
+        try:
+            index = restore_column(self._map(path, seg.index['file']), seg.index)
+            data = {c['name']: restore_column(self._map(path, c['file']), c) for c in seg.columns}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Dropping unreadable cache segment {seg.name}: {e}")
+            with self._exclusive():
+                self._sync()
+                self.segments.pop(seg.name, None)
+                self._write_index()
+            self.misses += 1
+            return None
+
+        index = pd.Index(index, name=seg.index.get('name'))
+        seg.accessed = time.time()
+        with self.lock:
+            # seg may predate a sync that replaced the indexed record
+            current = self.segments.get(seg.name)
+            if current is not None:
+                current.accessed = seg.accessed
+        self.hits += 1
+        # copy=False keeps each column backed by its mapped file
+        return pd.DataFrame(data, index=index, columns=[c['name'] for c in seg.columns],
+                            copy=False)
+
+    def remove(self, symbol: str, timeframe: Optional[str] = None) -> int:
+        """Drop stored segments for a symbol (all timeframes unless given)"""
+        with self._exclusive():
+            self._sync()
+            names = [s.name for s in self.segments.values()
+                     if s.symbol == symbol and (timeframe is None or s.timeframe == timeframe)]
+            for name in names:
+                del self.segments[name]
+            if names:
+                self._write_index()
+        for name in names:
+            self._remove_dir(name)
+        return len(names)
+
+    def flush(self) -> None:
+        """Persist access times so LRU order survives restarts"""
+        with self._exclusive():
+            self._sync()
+            self._write_index()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of disk tier counters"""
+        with self.lock:
+            return {
+                'segments': len(self.segments),
+                'bytes': sum(s.bytes for s in self.segments.values()),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
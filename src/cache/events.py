@@ -0,0 +1,128 @@
+# src/cache/events.py
+
+import logging
+import types
+import weakref
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """Bars for symbol in [start, end] were written to storage
+
+    data carries the written bars (indexed or columned by timestamp) when
+    the writer has them, so caches can patch instead of dropping ranges.
+    timeframe is None when the writer cannot tell which bar size changed.
+    """
+    symbol: str
+    start: datetime
+    end: datetime
+    timeframe: Optional[str] = None
+    data: Optional[pd.DataFrame] = None
+    table: str = 'market_data'
+
+    @classmethod
+    def from_frame(cls, symbol: str, frame: pd.DataFrame,
+                   timeframe: Optional[str] = None,
+                   table: str = 'market_data') -> Optional['ChangeEvent']:
+        """Event spanning the timestamps in frame; None for an empty frame"""
+        if frame is None or frame.empty:
+            return None
+        stamps = frame['timestamp'] if 'timestamp' in frame.columns else frame.index
+        stamps = pd.DatetimeIndex(stamps)
+        return cls(symbol, stamps.min().to_pydatetime(), stamps.max().to_pydatetime(),
+                   timeframe, frame, table)
+
+    def overlaps(self, start: Any, end: Any) -> bool:
+        """Whether [start, end] shares a calendar day with this change"""
+        return (pd.Timestamp(start).date() <= self.end.date()
+                and pd.Timestamp(end).date() >= self.start.date())
+
+
+Handler = Callable[[ChangeEvent], None]
+BatchHandler = Callable[[List[ChangeEvent]], None]
+
+
+def _ref(handler: Callable) -> Callable[[], Optional[Callable]]:
+    if isinstance(handler, types.MethodType):
+        return weakref.WeakMethod(handler)
+    return lambda: handler
+
+
+class ChangeBus:
+    """Synchronous in-process fan-out of ChangeEvents
+
+    Bound-method handlers are held weakly, so subscribing a cache does not
+    keep its owner alive. A failing handler is logged and does not stop
+    delivery to the others or fail the write that published the event.
+    Writers that touch many symbols at once publish_many(); subscribers
+    that registered a batch handler get the whole list in one call, so
+    per-event work such as a cache scan or a DELETE runs once per batch.
+    """
+
+    def __init__(self):
+        self._handlers: List[Tuple[Callable[[], Optional[Handler]],
+                                   Optional[Callable[[], Optional[BatchHandler]]]]] = []
+        self.logger = logging.getLogger(__name__)
+
+    def subscribe(self, handler: Handler,
+                  batch: Optional[BatchHandler] = None) -> Callable[[], None]:
+        """Register handler (and optional batch); returns a function that unsubscribes"""
+        entry = (_ref(handler), _ref(batch) if batch is not None else None)
+        self._handlers.append(entry)
+
+        def unsubscribe() -> None:
+            if entry in self._handlers:
+                self._handlers.remove(entry)
+        return unsubscribe
+
+    def _call(self, handler: Callable, arg: Any, symbol: str) -> bool:
+        try:
+            handler(arg)
+            return True
+        except Exception as e:
+            self.logger.error(f"Change handler failed for {symbol}: {e}")
+            return False
+
+    def _prune(self) -> None:
+        self._handlers = [entry for entry in self._handlers if entry[0]() is not None]
+
+    def publish(self, event: Optional[ChangeEvent]) -> int:
+        """Deliver event to live handlers; returns how many received it"""
+        if event is None:
+            return 0
+        delivered = 0
+        for ref, _ in list(self._handlers):
+            handler = ref()
+            if handler is not None and self._call(handler, event, event.symbol):
+                delivered += 1
+        self._prune()
+        return delivered
+
+    def publish_many(self, events: Iterable[Optional[ChangeEvent]]) -> int:
+        """Deliver events as one batch; returns how many handlers received it"""
+        events = [event for event in events if event is not None]
+        if not events:
+            return 0
+        label = f"{len(events)} symbols"
+        delivered = 0
+        for ref, batch_ref in list(self._handlers):
+            handler = ref()
+            if handler is None:
+                continue
+            batch = batch_ref() if batch_ref is not None else None
+            if batch is not None:
+                delivered += self._call(batch, events, label)
+            else:
+                results = [self._call(handler, event, event.symbol) for event in events]
+                delivered += all(results)
+        self._prune()
+        return delivered
+
+
+# Process-wide bus for market_data writes
+market_data_changes = ChangeBus()
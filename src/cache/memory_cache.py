@@ -1,75 +1,309 @@
 # src/cache/memory_cache.py
 
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Set
 from datetime import datetime, timedelta
 import logging
 from collections import OrderedDict
+from fnmatch import fnmatchcase
 import asyncio
+import heapq
+import itertools
+import sys
+import time
 from threading import Lock
-import json
+
+import numpy as np
+import pandas as pd
+
+
+def sizeof(value: Any) -> int:
+    """Approximate bytes held by a cached value"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True, index=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def key_symbol(key: str) -> str:
+    """Symbol part of a "SYMBOL:..." cache key"""
+    return key.split(':', 1)[0]
+
 
 class CacheEntry:
-    def __init__(self, data: Any, expires_at: datetime):
+    def __init__(self, data: Any, expires_at: datetime, size: int = 0,
+                 deadline: float = float('inf')):
         self.data = data
         self.expires_at = expires_at
+        self.size = size
+        self.created_at = datetime.now()
+        # Monotonic expiry used for ordering; expires_at is for display
+        self.deadline = deadline
+        # Set by lock-free reads in place of an LRU move (see MemoryCache)
+        self.referenced = True
+
 
 class MemoryCache:
-    def __init__(self, ttl_seconds: int = 3600):
-        self.cache: Dict[str, CacheEntry] = {}
+    """LRU cache bounded by an approximate byte budget with TTL expiry
+
+    Entry sizes come from DataFrame.memory_usage(deep=True), so the budget
+    tracks what cached bars actually hold. Expiry deadlines are kept in a
+    min-heap; sweep() pops only what is due, and connect() starts a
+    background task that sweeps every sweep_interval seconds so expired
+    entries are released even if nobody reads them. Keys are expected to
+    start with "SYMBOL:", which feeds a per-symbol index for
+    remove_pattern(). ttl_for(key), e.g. TTLPolicy.key_ttl, picks the TTL
+    of entries set without one; ttl_seconds applies where it returns None.
+
+    Entries that never expire are immutable once set, so get() returns
+    them without taking the lock; instead of moving them to the LRU end it
+    sets a reference bit, and eviction gives referenced entries a second
+    chance (CLOCK). Counters updated on that path are approximate under
+    thread contention.
+    """
+
+    def __init__(self, ttl_seconds: int = 3600,
+                 max_bytes: int = 512 * 1024 * 1024,
+                 max_entries: Optional[int] = None,
+                 sweep_interval: float = 30.0,
+                 ttl_for: Optional[Callable[[str], Optional[float]]] = None):
+        self.cache: 'OrderedDict[str, CacheEntry]' = OrderedDict()
         self.ttl = timedelta(seconds=ttl_seconds)
+        self.ttl_for = ttl_for
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
         self.lock = Lock()
         self.logger = logging.getLogger(__name__)
 
-    def get(self, key: str) -> Optional[Any]:
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._symbols: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._sweeper: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+        self.last_cleanup: Optional[datetime] = None
+
+    def _unlink(self, key: str) -> Optional[CacheEntry]:
+        entry = self.cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            keys = self._symbols.get(key_symbol(key))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._symbols[key_symbol(key)]
+        return entry
+
+    def _expire_due(self, now: float) -> int:
+        count = 0
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(self._heap)
+            entry = self.cache.get(key)
+            # Heap items are left behind when a key is overwritten or removed
+            if entry is not None and entry.deadline == deadline:
+                self._unlink(key)
+                count += 1
+        self.expirations += count
+        return count
+
+    async def get(self, key: str) -> Optional[Any]:
         """Get value from cache if not expired"""
+        entry = self.cache.get(key)
+        if entry is not None and entry.deadline == float('inf'):
+            entry.referenced = True
+            self.hits += 1
+            return entry.data
         with self.lock:
-            if key in self.cache:
-                entry = self.cache[key]
-                if datetime.now() < entry.expires_at:
+            entry = self.cache.get(key)
+            if entry is not None:
+                if time.monotonic() < entry.deadline:
+                    self.cache.move_to_end(key)
+                    self.hits += 1
                     return entry.data
-                del self.cache[key]
+                self._unlink(key)
+                self.expirations += 1
+            self.misses += 1
         return None
 
-class DataCache:
-    """Thread-safe LRU cache with TTL support"""
-    def __init__(self, maxsize: int = 1000, ttl: int = 300):
-        self.maxsize = maxsize
-        self.ttl = ttl
-        self._cache: OrderedDict[str, tuple[Any, datetime]] = OrderedDict()
-        self._lock = asyncio.Lock()
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Cache value under key; False if it alone exceeds the byte budget"""
+        size = sizeof(value)
+        if size > self.max_bytes:
+            self.rejected += 1
+            self.logger.debug(f"Not caching {key}: {size} bytes exceeds budget")
+            return False
 
-    async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache if not expired"""
-        async with self._lock:
-            if key not in self._cache:
-                return None
-            
-            value, timestamp = self._cache[key]
-            if datetime.now() - timestamp > timedelta(seconds=self.ttl):
-                del self._cache[key]
-                return None
-                
-            # Move to end (most recently used)
-            self._cache.move_to_end(key)
-            return value
-
-    async def set(self, key: str, value: Any) -> None:
-        """Set value in cache with timestamp"""
-        async with self._lock:
-            if len(self._cache) >= self.maxsize:
-                # Remove oldest item
-                self._cache.popitem(last=False)
-            self._cache[key] = (value, datetime.now())
+        if ttl is None and self.ttl_for is not None:
+            ttl = self.ttl_for(key)
+        ttl = self.ttl.total_seconds() if ttl is None else ttl
+        now = time.monotonic()
+        deadline = now + ttl
+        with self.lock:
+            self._unlink(key)
+            self._expire_due(now)
+            expires_at = datetime.now() + timedelta(seconds=min(ttl, 10 ** 9))
+            self.cache[key] = CacheEntry(value, expires_at, size, deadline)
+            self._bytes += size
+            self._symbols.setdefault(key_symbol(key), set()).add(key)
+            if deadline != float('inf'):
+                heapq.heappush(self._heap, (deadline, next(self._seq), key))
+
+            while self._bytes > self.max_bytes or \
+                    (self.max_entries is not None and len(self.cache) > self.max_entries):
+                oldest = next(iter(self.cache))
+                entry = self.cache[oldest]
+                if entry.referenced:
+                    entry.referenced = False
+                    self.cache.move_to_end(oldest)
+                    continue
+                self._unlink(oldest)
+                self.evictions += 1
+        return True
+
+    async def delete(self, key: str) -> bool:
+        """Remove specific key from cache"""
+        with self.lock:
+            return self._unlink(key) is not None
+
+    async def remove_pattern(self, pattern: str) -> int:
+        """Remove keys matching a glob pattern, e.g. AAPL:*"""
+        symbol = key_symbol(pattern)
+        with self.lock:
+            if ':' in pattern and not any(c in symbol for c in '*?['):
+                candidates = list(self._symbols.get(symbol, ()))
+            else:
+                candidates = list(self.cache)
+            keys = [k for k in candidates if fnmatchcase(k, pattern)]
+            for k in keys:
+                self._unlink(k)
+        return len(keys)
+
+    def remove_where(self, symbol: str, predicate: Callable[[str], bool]) -> int:
+        """Remove a symbol's keys for which predicate(key) is true"""
+        with self.lock:
+            keys = [k for k in self._symbols.get(symbol, ()) if predicate(k)]
+            for k in keys:
+                self._unlink(k)
+        return len(keys)
 
     async def clear(self) -> None:
         """Clear all cached data"""
-        async with self._lock:
-            self._cache.clear()
+        with self.lock:
+            self.cache.clear()
+            self._heap.clear()
+            self._symbols.clear()
+            self._bytes = 0
+
+    def sweep(self) -> int:
+        """Drop every entry whose TTL has passed"""
+        with self.lock:
+            count = self._expire_due(time.monotonic())
+            self.last_cleanup = datetime.now()
+        if count:
+            self.logger.debug(f"Expired {count} cache entries")
+        return count
+
+    async def cleanup(self, max_age: Optional[timedelta] = None) -> int:
+        """Drop expired entries and, if given, entries older than max_age"""
+        count = self.sweep()
+        if max_age is not None:
+            cutoff = datetime.now() - max_age
+            with self.lock:
+                old = [k for k, e in self.cache.items() if e.created_at < cutoff]
+                for k in old:
+                    self._unlink(k)
+            count += len(old)
+        return count
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                self.logger.error(f"Cache sweep failed: {e}")
+
+    async def connect(self) -> None:
+        """Start the background expiry sweeper"""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def disconnect(self) -> None:
+        """Stop the background expiry sweeper"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    async def size(self) -> int:
+        return len(self.cache)
+
+    async def get_all_keys(self) -> List[str]:
+        with self.lock:
+            return list(self.cache)
+
+    async def get_hits(self) -> int:
+        return self.hits
+
+    async def get_misses(self) -> int:
+        return self.misses
+
+    async def get_memory_usage(self) -> int:
+        """Bytes held by cached values"""
+        return self._bytes
+
+    async def get_last_cleanup_time(self) -> Optional[datetime]:
+        return self.last_cleanup
+
+    async def is_healthy(self) -> bool:
+        return self._bytes <= self.max_bytes and (
+            self._sweeper is None or not self._sweeper.done()
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters"""
+        with self.lock:
+            return {
+                'size': len(self.cache),
+                'symbols': len(self._symbols),
+                'memory_usage': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'rejected': self.rejected,
+                'last_cleanup': self.last_cleanup
+            }
+
+class DataCache(MemoryCache):
+    """MemoryCache bounded by entry count as well as bytes"""
+    def __init__(self, maxsize: int = 1000, ttl: int = 300,
+                 max_bytes: int = 256 * 1024 * 1024,
+                 ttl_for: Optional[Callable[[str], Optional[float]]] = None):
+        super().__init__(ttl_seconds=ttl, max_bytes=max_bytes, max_entries=maxsize,
+                         ttl_for=ttl_for)
+        self.maxsize = maxsize
 
     async def remove(self, key: str) -> None:
         """Remove specific key from cache"""
-        async with self._lock:
-            self._cache.pop(key, None)
+        await self.delete(key)
 
 # src/core/data/validation/market_data.py
 from dataclasses import dataclass
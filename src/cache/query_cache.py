@@ -0,0 +1,367 @@
+# src/cache/query_cache.py
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from ..database.core import Core
+from .codec import decode_value, encode_value
+from .events import ChangeEvent
+from .memory_cache import MemoryCache
+
+# Longest TTL written to expires_at; "never expires" is stored as this
+MAX_TTL_SECONDS = 10 * 365 * 24 * 3600
+
+
+def query_hash(key: str) -> str:
+    """query_cache.query_hash for a cache key"""
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+@dataclass
+class QueryCacheStats:
+    """Counters for a QueryCache"""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    errors: int = 0
+    expired: int = 0
+    bytes_written: int = 0
+    invalidated: int = 0
+
+
+class QueryCache:
+    """Cross-process L2 cache over the query_cache table
+
+    Values are stored as compressed binary payloads (see codec) keyed by a
+    SHA-256 of the cache key, so every worker and scheduler sharing the
+    database shares results. Expiry uses the database clock. Failures are
+    logged and reported as misses, so a database hiccup degrades to a cold
+    L2 rather than failing the request. Expired rows are deleted in
+    bounded batches by sweep(), which start() runs periodically. Batches
+    of change events (on_changes) are invalidated in one transaction, with
+    one DELETE per changed range covering up to invalidate_batch symbols.
+    """
+
+    def __init__(self, core: Union[Core, Callable[[], Core]],
+                 sweep_interval: float = 300.0,
+                 sweep_batch: int = 1000, compression: int = 6,
+                 invalidate_batch: int = 1000):
+        # A factory defers opening the pool until the first lookup
+        self._core = core
+        self.sweep_interval = sweep_interval
+        self.sweep_batch = sweep_batch
+        self.compression = compression
+        self.invalidate_batch = invalidate_batch
+        self.stats = QueryCacheStats()
+        self.logger = logging.getLogger(__name__)
+        self._sweeper: Optional[asyncio.Task] = None
+        # Invalidations started from on_change, held so they are not collected
+        self._pending: set = set()
+
+    @property
+    def core(self) -> Core:
+        if not isinstance(self._core, Core):
+            self._core = self._core()
+        return self._core
+
+    def _get(self, key: str) -> Optional[Tuple[Any, float]]:
+        rows = self.core.execute(
+            """
+            SELECT payload, encoding, TIMESTAMPDIFF(SECOND, NOW(), expires_at) AS ttl
+            FROM query_cache
+            WHERE query_hash = %s AND expires_at > NOW()
+            """,
+            (query_hash(key),)
+        )
+        if not rows or rows[0]['payload'] is None:
+            return None
+        row = rows[0]
+        return decode_value(bytes(row['payload']), row['encoding']), float(row['ttl'])
+
+    def _set(self, key: str, value: Any, ttl: float, endpoint: Optional[str],
+             parameters: Optional[Dict[str, Any]]) -> int:
+        payload, encoding = encode_value(value, self.compression)
+        # Range rows are tagged so invalidate_range() can find them
+        params = parameters or {}
+        with self.core.transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    """
+                    INSERT INTO query_cache
+                        (query_hash, endpoint, parameters, payload, encoding,
+                         expires_at, symbol, range_start, range_end)
+                    VALUES (%s, %s, %s, %s, %s, NOW() + INTERVAL %s SECOND, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE
+                        endpoint = VALUES(endpoint), parameters = VALUES(parameters),
+                        payload = VALUES(payload), encoding = VALUES(encoding),
+                        symbol = VALUES(symbol), range_start = VALUES(range_start),
+                        range_end = VALUES(range_end), timestamp = CURRENT_TIMESTAMP, expires_at = VALUES(expires_at)
+                    """,
+                    (query_hash(key), endpoint,
+                     json.dumps(parameters, default=str) if parameters is not None else None,
+                     payload, encoding, int(min(ttl, MAX_TTL_SECONDS)),
+                     params.get('symbol'), params.get('start'), params.get('end'))
+                )
+            finally:
+                cursor.close()
+        return len(payload)
+
+    def _delete(self, key: str) -> int:
+        with self.core.transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("DELETE FROM query_cache WHERE query_hash = %s", (query_hash(key),))
+                return cursor.rowcount
+            finally:
+                cursor.close()
+
+    def _invalidate_range(self, symbol: str, start: datetime, end: datetime) -> int:
+        with self.core.transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    """
+                    DELETE FROM query_cache
+                    WHERE symbol = %s AND range_start <= %s AND range_end >= %s
+                    """,
+                    (symbol, end, start)
+                )
+                return cursor.rowcount
+            finally:
+                cursor.close()
+
+    def _invalidate_changes(self, events: List[ChangeEvent]) -> int:
+        symbols = defaultdict(set)
+        for event in events:
+            symbols[(event.start, event.end)].add(event.symbol)
+        total = 0
+        with self.core.transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                for (start, end), names in symbols.items():
+                    names = sorted(names)
+                    for i in range(0, len(names), self.invalidate_batch):
+                        chunk = names[i:i + self.invalidate_batch]
+                        cursor.execute(
+                            f"""
+                            DELETE FROM query_cache
+                            WHERE symbol IN ({', '.join(['%s'] * len(chunk))})
+                              AND range_start <= %s AND range_end >= %s
+                            """,
+                            (*chunk, end, start)
+                        )
+                        total += cursor.rowcount
+            finally:
+                cursor.close()
+        return total
+
+    def _sweep(self) -> int:
+        total = 0
+        while True:
+            # Small batches keep each DELETE's row locks short
+            with self.core.transaction() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(
+                        "DELETE FROM query_cache WHERE expires_at <= NOW() LIMIT %s",
+                        (self.sweep_batch,)
+                    )
+                    deleted = cursor.rowcount
+                finally:
+                    cursor.close()
+            total += deleted
+            if deleted < self.sweep_batch:
+                return total
+
+    async def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """(value, remaining ttl seconds) or None on miss or error"""
+        try:
+            found = await asyncio.to_thread(self._get, key)
+        except Exception as e:
+            self.stats.errors += 1
+            self.logger.warning(f"query_cache read failed for {key}: {e}")
+            return None
+        if found is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return found
+
+    async def set(self, key: str, value: Any, ttl: float,
+                  endpoint: Optional[str] = None,
+                  parameters: Optional[Dict[str, Any]] = None) -> bool:
+        """Write value for ttl seconds; False if the write failed"""
+        try:
+            size = await asyncio.to_thread(self._set, key, value, ttl, endpoint, parameters)
+        except Exception as e:
+            self.stats.errors += 1
+            self.logger.warning(f"query_cache write failed for {key}: {e}")
+            return False
+        self.stats.writes += 1
+        self.stats.bytes_written += size
+        return True
+
+    async def delete(self, key: str) -> bool:
+        try:
+            return await asyncio.to_thread(self._delete, key) > 0
+        except Exception as e:
+            self.stats.errors += 1
+            self.logger.warning(f"query_cache delete failed for {key}: {e}")
+            return False
+
+    async def invalidate_range(self, symbol: str, start: datetime, end: datetime) -> int:
+        """Delete rows for symbol whose range overlaps [start, end]"""
+        try:
+            deleted = await asyncio.to_thread(self._invalidate_range, symbol, start, end)
+        except Exception as e:
+            self.stats.errors += 1
+            self.logger.warning(f"query_cache invalidation failed for {symbol}: {e}")
+            return 0
+        self.stats.invalidated += deleted
+        return deleted
+
+    async def invalidate_changes(self, events: List[ChangeEvent]) -> int:
+        """Delete rows overlapping any of events in one transaction"""
+        try:
+            deleted = await asyncio.to_thread(self._invalidate_changes, events)
+        except Exception as e:
+            self.stats.errors += 1
+            self.logger.warning(f"query_cache invalidation failed for {len(events)} changes: {e}")
+            return 0
+        self.stats.invalidated += deleted
+        return deleted
+
+    def _in_background(self, invalidate: Callable[[], Awaitable[int]],
+                       inline: Callable[[], int], label: str) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None:
+            # Synchronous writers (scripts, schedulers) invalidate inline
+            try:
+                self.stats.invalidated += inline()
+            except Exception as e:
+                self.stats.errors += 1
+                self.logger.warning(f"query_cache invalidation failed for {label}: {e}")
+            return
+        task = loop.create_task(invalidate())
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def on_change(self, event: ChangeEvent) -> None:
+        """ChangeBus handler: drop shared rows overlapping a write"""
+        self._in_background(
+            lambda: self.invalidate_range(event.symbol, event.start, event.end),
+            lambda: self._invalidate_range(event.symbol, event.start, event.end),
+            event.symbol
+        )
+
+    def on_changes(self, events: List[ChangeEvent]) -> None:
+        """ChangeBus batch handler: one invalidation for a whole batch"""
+        self._in_background(
+            lambda: self.invalidate_changes(events),
+            lambda: self._invalidate_changes(events),
+            f"{len(events)} changes"
+        )
+
+    async def sweep(self) -> int:
+        """Delete expired rows in batches of sweep_batch"""
+        deleted = await asyncio.to_thread(self._sweep)
+        self.stats.expired += deleted
+        if deleted:
+            self.logger.debug(f"Swept {deleted} expired query_cache rows")
+        return deleted
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                self.logger.error(f"query_cache sweep failed: {e}")
+
+    async def start(self) -> None:
+        """Start the periodic expiry sweep"""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def stop(self) -> None:
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of L2 counters"""
+        return {
+            'hits': self.stats.hits,
+            'misses': self.stats.misses,
+            'writes': self.stats.writes,
+            'errors': self.stats.errors,
+            'expired': self.stats.expired,
+            'bytes_written': self.stats.bytes_written,
+            'invalidated': self.stats.invalidated
+        }
+
+
+class TieredCache:
+    """Read-through L1 MemoryCache in front of an L2 QueryCache
+
+    L2 hits are copied into L1 for the TTL they have left, so a value one
+    process fetched is served from memory by every other process after its
+    first lookup.
+    """
+
+    def __init__(self, l1: MemoryCache, l2: Optional[QueryCache] = None):
+        self.l1 = l1
+        self.l2 = l2
+        self.logger = logging.getLogger(__name__)
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.l1.get(key)
+        if value is not None or self.l2 is None:
+            return value
+        found = await self.l2.get(key)
+        if found is None:
+            return None
+        value, ttl = found
+        await self.l1.set(key, value, ttl=ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None,
+                  endpoint: Optional[str] = None,
+                  parameters: Optional[Dict[str, Any]] = None) -> None:
+        ttl = self.l1.ttl.total_seconds() if ttl is None else ttl
+        await self.l1.set(key, value, ttl=ttl)
+        if self.l2 is not None:
+            await self.l2.set(key, value, ttl, endpoint, parameters)
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]],
+                           ttl: Optional[float] = None,
+                           endpoint: Optional[str] = None,
+                           parameters: Optional[Dict[str, Any]] = None) -> Any:
+        """Cached value for key, calling fetch and writing both tiers on a miss"""
+        value = await self.get(key)
+        if value is None:
+            value = await fetch()
+            if value is not None:
+                await self.set(key, value, ttl, endpoint, parameters)
+        return value
+
+    async def delete(self, key: str) -> None:
+        await self.l1.delete(key)
+        if self.l2 is not None:
+            await self.l2.delete(key)
@@ -0,0 +1,467 @@
+# src/cache/range_cache.py
+
+import asyncio
+import logging
+import time as clock
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import (
+    Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+)
+
+import pandas as pd
+
+from .disk_cache import DiskCache
+from .events import ChangeEvent
+from .memory_cache import sizeof
+from .refresh import BackgroundRefresher
+from .sessions import TradingCalendar
+from .ttl_policy import TTLPolicy
+
+# fetch(symbol, start, end, timeframe) for one uncovered span of trading days;
+# start is the first day's midnight and end the last instant of the last day
+GapFetcher = Callable[[str, datetime, datetime, str], Awaitable[pd.DataFrame]]
+
+
+def day_bounds(first: date, last: date) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """Timestamp bounds [first 00:00, last + 1 day) of a span of days"""
+    return pd.Timestamp(first), pd.Timestamp(last + timedelta(days=1))
+
+
+def clip(frame: pd.DataFrame, start: datetime, end: datetime) -> pd.DataFrame:
+    """Bars in [start, end]; an end at midnight stands for that whole day"""
+    if frame.empty:
+        return frame
+    lo = pd.Timestamp(start)
+    hi = pd.Timestamp(end)
+    if hi == hi.normalize():
+        hi += pd.Timedelta(days=1)
+        side = 'left'
+    else:
+        side = 'right'
+    index = frame.index
+    return frame.iloc[index.searchsorted(lo, 'left'):index.searchsorted(hi, side)]
+
+
+def as_bars(frame: pd.DataFrame) -> pd.DataFrame:
+    """Bars indexed by timestamp in ascending order"""
+    if frame is None or frame.empty:
+        return pd.DataFrame()
+    if not isinstance(frame.index, pd.DatetimeIndex) and 'timestamp' in frame.columns:
+        frame = frame.set_index('timestamp')
+    if not frame.index.is_monotonic_increasing:
+        frame = frame.sort_index(kind='stable')
+    return frame
+
+
+@dataclass
+class Segment:
+    """Contiguous sessions [first, last] with every bar the source returned"""
+    first: date
+    last: date
+    data: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    def slice(self, first: date, last: date) -> pd.DataFrame:
+        if self.data.empty:
+            return self.data
+        lo, hi = day_bounds(first, last)
+        index = self.data.index
+        return self.data.iloc[index.searchsorted(lo, 'left'):index.searchsorted(hi, 'left')]
+
+
+class SeriesCoverage:
+    """Sorted, disjoint, non-adjacent segments for one (symbol, timeframe)"""
+
+    def __init__(self, calendar: TradingCalendar):
+        self.calendar = calendar
+        self.segments: List[Segment] = []
+        # (first, last, deadline) spans; deadlines are time.monotonic() values
+        self.expiry: List[Tuple[date, date, float]] = []
+
+    def gaps(self, first: date, last: date) -> List[Tuple[date, date]]:
+        """Session spans in [first, last] no segment covers"""
+        gaps = []
+        cursor = first
+        for seg in self.segments:
+            if seg.last < cursor:
+                continue
+            if seg.first > last:
+                break
+            if seg.first > cursor:
+                gaps.append((cursor, self.calendar.previous_session(seg.first)))
+            cursor = self.calendar.next_session(seg.last)
+            if cursor > last:
+                return gaps
+        gaps.append((cursor, last))
+        return gaps
+
+    def add(self, first: date, last: date, data: pd.DataFrame) -> Segment:
+        """Record [first, last] as covered, merging overlapping or adjacent segments"""
+        lo, hi = day_bounds(first, last)
+        data = as_bars(data)
+        if not data.empty:
+            data = data[(data.index >= lo) & (data.index < hi)]
+
+        merged = Segment(first, last, data)
+        keep = []
+        touching = []
+        for seg in self.segments:
+            # Adjacent means no session lies between the two spans
+            if seg.last < self.calendar.previous_session(first) or \
+                    seg.first > self.calendar.next_session(last):
+                keep.append(seg)
+            else:
+                touching.append(seg)
+
+        if touching:
+            merged.first = min(first, touching[0].first)
+            merged.last = max(last, touching[-1].last)
+            # Newly fetched bars win over cached bars for the same timestamp
+            parts = [seg.data for seg in touching if not seg.data.empty]
+            if not data.empty:
+                parts.append(data)
+            if parts:
+                combined = pd.concat(parts).sort_index(kind='stable')
+                merged.data = combined[~combined.index.duplicated(keep='last')]
+
+        keep.append(merged)
+        keep.sort(key=lambda seg: seg.first)
+        self.segments = keep
+        return merged
+
+    def slice(self, first: date, last: date) -> pd.DataFrame:
+        """Bars for [first, last]; only valid when gaps(first, last) is empty"""
+        parts = [
+            seg.slice(max(first, seg.first), min(last, seg.last))
+            for seg in self.segments if seg.last >= first and seg.first <= last
+        ]
+        parts = [p for p in parts if not p.empty]
+        if not parts:
+            return pd.DataFrame()
+        return parts[0] if len(parts) == 1 else pd.concat(parts)
+
+    def _trim_expiry(self, first: date, last: date) -> List[Tuple[date, date, float]]:
+        kept = []
+        for lo, hi, at in self.expiry:
+            if hi < first or lo > last:
+                kept.append((lo, hi, at))
+                continue
+            if lo < first:
+                kept.append((lo, self.calendar.previous_session(first), at))
+            if hi > last:
+                kept.append((self.calendar.next_session(last), hi, at))
+        return kept
+
+    def stamp(self, first: date, last: date, deadline: float) -> None:
+        """Set the expiry deadline of [first, last], trimming older stamps"""
+        kept = self._trim_expiry(first, last)
+        kept.append((first, last, deadline))
+        kept.sort()
+        self.expiry = kept
+
+    def patch(self, first: date, last: date, data: pd.DataFrame) -> List[Segment]:
+        """Upsert bars into the cached part of [first, last]; returns changed segments"""
+        data = as_bars(data)
+        changed = []
+        if data.empty:
+            return changed
+        for seg in self.segments:
+            if seg.last < first or seg.first > last:
+                continue
+            lo, hi = day_bounds(max(first, seg.first), min(last, seg.last))
+            part = data[(data.index >= lo) & (data.index < hi)]
+            if part.empty:
+                continue
+            if not seg.data.empty:
+                part = part.reindex(columns=seg.data.columns)
+                combined = pd.concat([seg.data, part]).sort_index(kind='stable')
+                part = combined[~combined.index.duplicated(keep='last')]
+            seg.data = part
+            changed.append(seg)
+        return changed
+
+    def remove(self, first: date, last: date) -> int:
+        """Forget [first, last] so it is refetched; returns segments cut"""
+        kept = []
+        cut = 0
+        for seg in self.segments:
+            if seg.last < first or seg.first > last:
+                kept.append(seg)
+                continue
+            cut += 1
+            if seg.first < first:
+                end = self.calendar.previous_session(first)
+                kept.append(Segment(seg.first, end, seg.slice(seg.first, end)))
+            if seg.last > last:
+                begin = self.calendar.next_session(last)
+                kept.append(Segment(begin, seg.last, seg.slice(begin, seg.last)))
+        self.segments = kept
+        self.expiry = self._trim_expiry(first, last)
+        return cut
+
+    def stale(self, first: date, last: date, now: float) -> List[Tuple[date, date]]:
+        """Cached spans in [first, last] whose deadline has passed"""
+        return [
+            (max(lo, first), min(hi, last)) for lo, hi, at in self.expiry
+            if at <= now and hi >= first and lo <= last
+        ]
+
+    def covered(self) -> List[Tuple[date, date]]:
+        return [(seg.first, seg.last) for seg in self.segments]
+
+
+@dataclass
+class RangeCacheStats:
+    """Counters for a RangeCache"""
+    hits: int = 0
+    partial_hits: int = 0
+    misses: int = 0
+    gap_fetches: int = 0
+    stale_hits: int = 0
+    refreshes: int = 0
+    evictions: int = 0
+    patched: int = 0
+    invalidated: int = 0
+
+
+class RangeCache:
+    """Time-series cache keyed by (symbol, timeframe) instead of exact request
+
+    Requests are normalized to the trading sessions they cover, so
+    'Saturday to Sunday' and 'Friday to Monday' style variants coalesce.
+    Any sub-range of what is cached is answered by slicing; otherwise only
+    the uncovered session spans are fetched, always as whole days, and
+    merged into the coverage. Results are cut to the exact [start, end].
+    Concurrent requests for one series are serialized so a gap is fetched
+    once. With a DiskCache store, series are loaded from disk on first use
+    and segments are written back after every gap fill.
+
+    With a ttl, fetched spans go stale ttl seconds later. Stale spans are
+    refetched before answering, unless a refresher is given: then the
+    stale data is returned immediately and one background refresh per
+    series is queued (stale-while-revalidate), so callers never wait on a
+    TTL boundary. A TTLPolicy replaces the single ttl: each filled span is
+    stamped per piece, so closed history never expires and only the tail
+    in the live session is ever revalidated.
+
+    apply() takes ChangeEvents from writers: bars written for a cached
+    series are patched into the covering segments, and other changed
+    ranges are cut out of the coverage so only they are refetched. That
+    keeps long TTLs safe for data this process writes.
+    """
+
+    def __init__(self, calendar: Optional[TradingCalendar] = None,
+                 max_series: int = 1000, store: Optional[DiskCache] = None,
+                 ttl: Optional[float] = None,
+                 refresher: Optional[BackgroundRefresher] = None,
+                 policy: Optional[TTLPolicy] = None):
+        self.calendar = calendar or TradingCalendar()
+        self.max_series = max_series
+        self.store = store
+        self.ttl = ttl
+        self.refresher = refresher
+        self.policy = policy
+        self.stats = RangeCacheStats()
+        self._series: 'OrderedDict[Hashable, SeriesCoverage]' = OrderedDict()
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        # Series changed by apply() whose stored copy must be rewritten
+        self._dirty: set = set()
+        self.logger = logging.getLogger(__name__)
+
+    def _coverage(self, key: Hashable) -> SeriesCoverage:
+        coverage = self._series.get(key)
+        if coverage is None:
+            coverage = self._series[key] = SeriesCoverage(self.calendar)
+            if self.store is not None:
+                self._load_stored(key, coverage)
+            while len(self._series) > self.max_series:
+                evicted, _ = self._series.popitem(last=False)
+                self._locks.pop(evicted, None)
+                self.stats.evictions += 1
+        self._series.move_to_end(key)
+        return coverage
+
+    def _load_stored(self, key: Hashable, coverage: SeriesCoverage) -> None:
+        for stored in self.store.series(*key):
+            frame = self.store.load(stored)
+            if frame is not None:
+                coverage.segments.append(Segment(*stored.span, frame))
+                self._stamp(coverage, *stored.span, stored=True)
+        if coverage.segments:
+            self.logger.debug(f"Loaded {len(coverage.segments)} stored segment(s) for {key}")
+
+    async def _persist(self, key: Hashable, segments: List[Segment]) -> None:
+        if self.store is None:
+            return
+        for seg in segments:
+            try:
+                await asyncio.to_thread(self.store.put, *key, seg.first, seg.last, seg.data)
+            except Exception as e:
+                self.logger.warning(f"Could not persist {key} {seg.first}..{seg.last}: {e}")
+
+    def _stamp(self, coverage: SeriesCoverage, first: date, last: date,
+               stored: bool = False) -> None:
+        if self.policy is not None:
+            now = clock.monotonic()
+            for lo, hi, ttl in self.policy.split(first, last):
+                # Age on disk is unknown, so a stored live tail starts out stale
+                coverage.stamp(lo, hi, 0.0 if stored and ttl != float('inf') else now + ttl)
+        elif stored:
+            coverage.stamp(first, last, 0.0 if self.ttl is not None else float('inf'))
+        else:
+            coverage.stamp(first, last, self._deadline())
+
+    def _deadline(self) -> float:
+        return clock.monotonic() + self.ttl if self.ttl is not None else float('inf')
+
+    async def _fill(self, key: Hashable, coverage: SeriesCoverage,
+                    spans: List[Tuple[date, date]], fetch: GapFetcher) -> None:
+        symbol, timeframe = key
+        frames = await asyncio.gather(*(
+            # Whole sessions, so a covered day holds every bar of that day
+            fetch(symbol, datetime.combine(lo, time.min),
+                  datetime.combine(hi, time.max), timeframe)
+            for lo, hi in spans
+        ))
+        for (lo, hi), frame in zip(spans, frames):
+            coverage.add(lo, hi, frame)
+            self._stamp(coverage, lo, hi)
+        await self._persist(key, [
+            seg for seg in coverage.segments
+            if any(seg.last >= lo and seg.first <= hi for lo, hi in spans)
+        ])
+
+    async def _revalidate(self, key: Hashable, first: date, last: date,
+                          fetch: GapFetcher) -> None:
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            coverage = self._series.get(key)
+            if coverage is None:
+                return
+            # A foreground request may have refreshed it while this was queued
+            stale = coverage.stale(first, last, clock.monotonic())
+            if stale:
+                self.stats.refreshes += 1
+                await self._fill(key, coverage, stale, fetch)
+
+    async def get(self, symbol: str, timeframe: str, start: datetime, end: datetime,
+                  fetch: GapFetcher) -> pd.DataFrame:
+        """Bars for [start, end], fetching only sessions not yet cached"""
+        span = self.calendar.normalize(start, end)
+        if span is None:
+            return pd.DataFrame()
+        first, last = span
+        key = (symbol, timeframe)
+        if self.refresher is not None:
+            self.refresher.record_access(key)
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            coverage = self._coverage(key)
+            if key in self._dirty:
+                self._dirty.discard(key)
+                await self._persist(key, coverage.segments)
+            gaps = coverage.gaps(first, last)
+            stale = coverage.stale(first, last, clock.monotonic())
+            if not gaps:
+                if not stale:
+                    self.stats.hits += 1
+                    return clip(coverage.slice(first, last), start, end)
+                if self.refresher is not None:
+                    self.stats.stale_hits += 1
+                    self.refresher.schedule(
+                        key, lambda: self._revalidate(key, first, last, fetch)
+                    )
+                    return clip(coverage.slice(first, last), start, end)
+
+            if gaps == [(first, last)]:
+                self.stats.misses += 1
+            else:
+                self.stats.partial_hits += 1
+            spans = sorted(gaps + stale)
+            self.stats.gap_fetches += len(spans)
+            self.logger.debug(f"{symbol} {timeframe}: fetching {len(spans)} span(s) {spans}")
+
+            await self._fill(key, coverage, spans, fetch)
+            return clip(coverage.slice(first, last), start, end)
+
+    def put(self, symbol: str, timeframe: str, start: datetime, end: datetime,
+            data: pd.DataFrame) -> None:
+        """Record bars for [start, end] obtained outside get()"""
+        span = self.calendar.normalize(start, end)
+        if span is not None:
+            coverage = self._coverage((symbol, timeframe))
+            coverage.add(*span, data)
+            self._stamp(coverage, *span)
+
+    def coverage(self, symbol: str, timeframe: str) -> List[Tuple[date, date]]:
+        """Cached session spans for a series"""
+        coverage = self._series.get((symbol, timeframe))
+        return coverage.covered() if coverage else []
+
+    def invalidate(self, symbol: str, timeframe: Optional[str] = None) -> int:
+        """Drop cached series for a symbol (all timeframes unless given)"""
+        keys = [k for k in self._series
+                if k[0] == symbol and (timeframe is None or k[1] == timeframe)]
+        for k in keys:
+            del self._series[k]
+        if self.store is not None:
+            self.store.remove(symbol, timeframe)
+        return len(keys)
+
+    def apply(self, event: ChangeEvent) -> int:
+        """Patch or cut cached ranges touched by a write; returns series changed"""
+        span = self.calendar.normalize(event.start, event.end)
+        if span is None:
+            return 0
+        first, last = span
+        keys = {k for k in self._series if k[0] == event.symbol}
+        if self.store is not None:
+            keys.update((event.symbol, tf) for tf in self.store.timeframes(event.symbol))
+        if event.timeframe is not None and event.data is None:
+            keys = {k for k in keys if k[1] == event.timeframe}
+
+        changed = 0
+        for key in keys:
+            coverage = self._coverage(key)
+            if event.data is not None and key[1] == event.timeframe:
+                touched = len(coverage.patch(first, last, event.data))
+                self.stats.patched += touched
+            else:
+                touched = coverage.remove(first, last)
+                self.stats.invalidated += touched
+            if touched:
+                changed += 1
+                if self.store is not None:
+                    # Rewritten from memory on the next get() of this series
+                    self.store.remove(*key)
+                    self._dirty.add(key)
+        if changed:
+            self.logger.debug(f"Applied {event.symbol} change {first}..{last} to {changed} series")
+        return changed
+
+    def symbols(self) -> List[str]:
+        return sorted({symbol for symbol, _ in self._series})
+
+    def clear(self) -> None:
+        self._series.clear()
+        self._dirty.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of range cache counters"""
+        return {
+            'series': len(self._series),
+            'segments': sum(len(c.segments) for c in self._series.values()),
+            'memory_usage': sum(
+                sizeof(seg.data) for c in self._series.values() for seg in c.segments
+            ),
+            'hits': self.stats.hits,
+            'partial_hits': self.stats.partial_hits,
+            'misses': self.stats.misses,
+            'gap_fetches': self.stats.gap_fetches,
+            'stale_hits': self.stats.stale_hits,
+            'refreshes': self.stats.refreshes,
+            'evictions': self.stats.evictions,
+            'patched': self.stats.patched,
+            'invalidated': self.stats.invalidated
+        }
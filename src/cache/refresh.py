@@ -0,0 +1,120 @@
+# src/cache/refresh.py
+
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+@dataclass
+class RefreshStats:
+    """Counters for a BackgroundRefresher"""
+    scheduled: int = 0
+    deduplicated: int = 0
+    completed: int = 0
+    failed: int = 0
+    dropped: int = 0
+
+
+class BackgroundRefresher:
+    """Bounded pool of background refreshes ordered by access frequency
+
+    schedule() queues at most one refresh per key; repeated requests for a
+    key that is already queued or running are folded into it. Workers
+    always take the queued key with the most recorded accesses next, so
+    the hottest symbols are revalidated first when many expire together.
+    At most max_concurrency refreshes run at a time and at most max_pending
+    wait; beyond that the least accessed request is dropped, which only
+    means that entry is served stale a little longer.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_pending: int = 1000):
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.access = Counter()
+        self.stats = RefreshStats()
+        self.logger = logging.getLogger(__name__)
+        self._pending: Dict[Hashable, Callable[[], Awaitable[Any]]] = {}
+        self._running: set = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: list = []
+
+    def record_access(self, key: Hashable) -> None:
+        self.access[key] += 1
+
+    def schedule(self, key: Hashable, refresh: Callable[[], Awaitable[Any]]) -> bool:
+        """Queue refresh() for key; False if key is already queued or running"""
+        if key in self._pending or key in self._running:
+            self.stats.deduplicated += 1
+            return False
+        if len(self._pending) >= self.max_pending:
+            coldest = min(self._pending, key=lambda k: self.access[k])
+            if self.access[coldest] >= self.access[key]:
+                self.stats.dropped += 1
+                return False
+            del self._pending[coldest]
+            self.stats.dropped += 1
+
+        self._pending[key] = refresh
+        self.stats.scheduled += 1
+        self._ensure_workers()
+        self._wakeup.set()
+        return True
+
+    def _ensure_workers(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.max_concurrency:
+            self._workers.append(asyncio.create_task(self._work()))
+
+    def _next(self) -> Optional[Hashable]:
+        if not self._pending:
+            return None
+        return max(self._pending, key=lambda k: self.access[k])
+
+    async def _work(self) -> None:
+        while True:
+            key = self._next()
+            if key is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            refresh = self._pending.pop(key)
+            self._running.add(key)
+            try:
+                await refresh()
+                self.stats.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats.failed += 1
+                self.logger.warning(f"Background refresh of {key} failed: {e}")
+            finally:
+                self._running.discard(key)
+
+    async def join(self) -> None:
+        """Wait until nothing is queued or running"""
+        while self._pending or self._running:
+            await asyncio.sleep(0.005)
+
+    async def stop(self) -> None:
+        """Cancel workers and drop queued refreshes"""
+        self._pending.clear()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of refresher counters"""
+        return {
+            'pending': len(self._pending),
+            'running': len(self._running),
+            'scheduled': self.stats.scheduled,
+            'deduplicated': self.stats.deduplicated,
+            'completed': self.stats.completed,
+            'failed': self.stats.failed,
+            'dropped': self.stats.dropped
+        }
@@ -0,0 +1,57 @@
+# src/cache/sessions.py
+
+from datetime import date, datetime
+from typing import Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class TradingCalendar:
+    """Weekday session calendar with optional exchange holidays"""
+
+    def __init__(self, holidays: Iterable[date] = ()):
+        self.holidays = np.array(sorted(set(holidays)), dtype='datetime64[D]')
+
+    @staticmethod
+    def _day(value: Any) -> date:
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return pd.Timestamp(value).date()
+
+    def _offset(self, day: date, offset: int, roll: str) -> date:
+        return np.busday_offset(
+            np.datetime64(day, 'D'), offset, roll=roll, holidays=self.holidays
+        ).astype(date)
+
+    def is_session(self, day: Any) -> bool:
+        return bool(np.is_busday(np.datetime64(self._day(day), 'D'), holidays=self.holidays))
+
+    def roll_forward(self, day: Any) -> date:
+        """day itself if it is a session, else the next session"""
+        return self._offset(self._day(day), 0, 'forward')
+
+    def roll_back(self, day: Any) -> date:
+        """day itself if it is a session, else the previous session"""
+        return self._offset(self._day(day), 0, 'backward')
+
+    def next_session(self, day: Any) -> date:
+        return self._offset(self._day(day), 1, 'backward')
+
+    def previous_session(self, day: Any) -> date:
+        return self._offset(self._day(day), -1, 'forward')
+
+    def sessions(self, start: Any, end: Any) -> List[date]:
+        """Sessions in [start, end]"""
+        first, last = self.roll_forward(start), self.roll_back(end)
+        if last < first:
+            return []
+        days = np.arange(np.datetime64(first, 'D'), np.datetime64(last, 'D') + 1)
+        return list(days[np.is_busday(days, holidays=self.holidays)].astype(date))
+
+    def normalize(self, start: Any, end: Any) -> Optional[Tuple[date, date]]:
+        """Snap a request to the sessions it covers; None if it covers none"""
+        first, last = self.roll_forward(start), self.roll_back(end)
+        return (first, last) if first <= last else None
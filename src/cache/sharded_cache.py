@@ -0,0 +1,154 @@
+# src/cache/sharded_cache.py
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .memory_cache import MemoryCache
+
+
+class ShardedCache:
+    """MemoryCache striped over independently locked shards
+
+    Keys are hashed to one of `shards` MemoryCaches, each with its own
+    lock, heap and an equal share of the byte and entry budgets, so
+    concurrent readers and writers only contend when they hit the same
+    shard. Reads of immutable (never-expiring) entries take no lock at all
+    (see MemoryCache). The interface matches MemoryCache, so it drops in
+    wherever one is used; symbol-wide operations fan out to every shard.
+    """
+
+    def __init__(self, shards: int = 16, ttl_seconds: int = 3600,
+                 max_bytes: int = 512 * 1024 * 1024,
+                 max_entries: Optional[int] = None,
+                 sweep_interval: float = 30.0,
+                 ttl_for: Optional[Callable[[str], Optional[float]]] = None):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        per_shard_entries = -(-max_entries // shards) if max_entries is not None else None
+        self.shards = [
+            MemoryCache(ttl_seconds=ttl_seconds, max_bytes=max_bytes // shards,
+                        max_entries=per_shard_entries, ttl_for=ttl_for)
+            for _ in range(shards)
+        ]
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self.logger = logging.getLogger(__name__)
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def shard(self, key: str) -> MemoryCache:
+        return self.shards[hash(key) % len(self.shards)]
+
+    def get(self, key: str) -> Awaitable[Optional[Any]]:
+        # Hands back the shard's coroutine, saving a frame on the hot path
+        return self.shards[hash(key) % len(self.shards)].get(key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return await self.shard(key).set(key, value, ttl)
+
+    async def delete(self, key: str) -> bool:
+        return await self.shard(key).delete(key)
+
+    async def remove_pattern(self, pattern: str) -> int:
+        """Remove keys matching a glob pattern, e.g. AAPL:*"""
+        return sum([await shard.remove_pattern(pattern) for shard in self.shards])
+
+    def remove_where(self, symbol: str, predicate: Callable[[str], bool]) -> int:
+        """Remove a symbol's keys for which predicate(key) is true"""
+        return sum(shard.remove_where(symbol, predicate) for shard in self.shards)
+
+    async def clear(self) -> None:
+        for shard in self.shards:
+            await shard.clear()
+
+    def sweep(self) -> int:
+        """Drop every entry whose TTL has passed"""
+        return sum(shard.sweep() for shard in self.shards)
+
+    async def cleanup(self, max_age: Optional[timedelta] = None) -> int:
+        return sum([await shard.cleanup(max_age) for shard in self.shards])
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                self.logger.error(f"Cache sweep failed: {e}")
+
+    async def connect(self) -> None:
+        """Start one background expiry sweeper for all shards"""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def disconnect(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    @property
+    def hits(self) -> int:
+        return sum(shard.hits for shard in self.shards)
+
+    @property
+    def misses(self) -> int:
+        return sum(shard.misses for shard in self.shards)
+
+    @property
+    def evictions(self) -> int:
+        return sum(shard.evictions for shard in self.shards)
+
+    @property
+    def expirations(self) -> int:
+        return sum(shard.expirations for shard in self.shards)
+
+    @property
+    def last_cleanup(self) -> Optional[datetime]:
+        times = [shard.last_cleanup for shard in self.shards if shard.last_cleanup]
+        return max(times) if times else None
+
+    async def size(self) -> int:
+        return sum(len(shard.cache) for shard in self.shards)
+
+    async def get_all_keys(self) -> List[str]:
+        return [key for shard in self.shards for key in await shard.get_all_keys()]
+
+    async def get_hits(self) -> int:
+        return self.hits
+
+    async def get_misses(self) -> int:
+        return self.misses
+
+    async def get_memory_usage(self) -> int:
+        """Bytes held by cached values"""
+        return sum([await shard.get_memory_usage() for shard in self.shards])
+
+    async def get_last_cleanup_time(self) -> Optional[datetime]:
+        return self.last_cleanup
+
+    async def is_healthy(self) -> bool:
+        return all([await shard.is_healthy() for shard in self.shards]) and (
+            self._sweeper is None or not self._sweeper.done()
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Totals across shards plus per-shard sizes to spot skew"""
+        per_shard = [shard.get_stats() for shard in self.shards]
+        totals = {
+            name: sum(stats[name] for stats in per_shard)
+            for name in ('size', 'memory_usage', 'hits', 'misses',
+                         'evictions', 'expirations', 'rejected')
+        }
+        totals.update({
+            'shards': len(self.shards),
+            'max_bytes': self.max_bytes,
+            'shard_sizes': [stats['size'] for stats in per_shard],
+            'last_cleanup': self.last_cleanup
+        })
+        return totals
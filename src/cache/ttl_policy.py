@@ -0,0 +1,69 @@
+# src/cache/ttl_policy.py
+
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from .sessions import TradingCalendar
+
+
+class TTLPolicy:
+    """TTLs by data recency instead of one fixed lifetime
+
+    Bars for sessions that closed (plus a settle period for late
+    corrections) never change, so ranges ending in them get closed_ttl,
+    which defaults to never expiring. Ranges that reach into the current
+    or a future session get live_ttl. split() cuts a range at the closed
+    boundary so a cache can keep the history and refresh only the tail.
+    Writes that do change history are handled by change events, not TTL.
+    """
+
+    def __init__(self, calendar: Optional[TradingCalendar] = None,
+                 live_ttl: float = 60.0, closed_ttl: float = float('inf'),
+                 close: time = time(16, 0), settle: timedelta = timedelta(minutes=15),
+                 timezone: str = 'America/New_York',
+                 now: Optional[Callable[[], datetime]] = None):
+        self.calendar = calendar or TradingCalendar()
+        self.live_ttl = live_ttl
+        self.closed_ttl = closed_ttl
+        self.close = close
+        self.settle = settle
+        self.timezone = ZoneInfo(timezone)
+        self._now = now or (lambda: datetime.now(self.timezone))
+
+    def closed_through(self, now: Optional[datetime] = None) -> date:
+        """Last session whose bars are final"""
+        local = now or self._now()
+        if local.tzinfo is not None:
+            local = local.astimezone(self.timezone)
+        today = local.date()
+        settled = datetime.combine(today, self.close, local.tzinfo) + self.settle
+        if self.calendar.is_session(today) and local >= settled:
+            return today
+        return self.calendar.previous_session(today)
+
+    def ttl_for(self, end: Any, now: Optional[datetime] = None) -> float:
+        """TTL for a range ending at end"""
+        last = self.calendar.roll_back(end)
+        return self.closed_ttl if last <= self.closed_through(now) else self.live_ttl
+
+    def split(self, first: date, last: date,
+              now: Optional[datetime] = None) -> List[Tuple[date, date, float]]:
+        """(first, last, ttl) pieces of a session span, cut at the closed boundary"""
+        boundary = self.closed_through(now)
+        if last <= boundary:
+            return [(first, last, self.closed_ttl)]
+        if first > boundary:
+            return [(first, last, self.live_ttl)]
+        return [(first, boundary, self.closed_ttl),
+                (self.calendar.next_session(boundary), last, self.live_ttl)]
+
+    def key_ttl(self, key: str) -> Optional[float]:
+        """TTL for a SYMBOL:timeframe:start:end cache key; None without a span"""
+        parts = key.split(':')
+        if len(parts) != 4:
+            return None
+        try:
+            return self.ttl_for(parts[3])
+        except ValueError:
+            return None
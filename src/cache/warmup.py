@@ -0,0 +1,264 @@
+# src/cache/warmup.py
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, List, Optional, Union
+
+from ..database.core import Core
+
+# system_metrics.metric_name of access count rows
+ACCESS_METRIC = 'cache_access'
+
+
+@dataclass(frozen=True)
+class WarmupTarget:
+    """One symbol range as requested; kind is the timeframe or source"""
+    symbol: str
+    kind: str
+    start: datetime
+    end: datetime
+
+    @property
+    def key(self) -> str:
+        return '|'.join((self.symbol, self.kind, self.start.isoformat(), self.end.isoformat()))
+
+    @classmethod
+    def from_key(cls, key: str) -> 'WarmupTarget':
+        symbol, kind, start, end = key.split('|')
+        return cls(symbol, kind, datetime.fromisoformat(start), datetime.fromisoformat(end))
+
+
+class FileAccessStore:
+    """Access counts accumulated in a local JSON file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self, limit: Optional[int] = None) -> Counter:
+        try:
+            with open(self.path) as f:
+                counts = Counter(json.load(f))
+        except FileNotFoundError:
+            return Counter()
+        return Counter(dict(counts.most_common(limit)))
+
+    def save(self, deltas: Counter) -> None:
+        counts = self.load()
+        counts.update(deltas)
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(dict(counts), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+
+class MetricsAccessStore:
+    """Access counts as system_metrics rows, summed over a recent window
+
+    Each flush inserts one row per range with the accesses since the last
+    flush, so every process contributes and old traffic ages out of the
+    window instead of pinning yesterday's hot set forever.
+    """
+
+    def __init__(self, core: Union[Core, Callable[[], Core]], window_hours: int = 24):
+        self._core = core
+        self.window_hours = window_hours
+
+    @property
+    def core(self) -> Core:
+        if not isinstance(self._core, Core):
+            self._core = self._core()
+        return self._core
+
+    def load(self, limit: Optional[int] = None) -> Counter:
+        rows = self.core.execute(
+            f"""
+            SELECT JSON_UNQUOTE(JSON_EXTRACT(metadata, '$.key')) AS access_key,
+                   SUM(metric_value) AS hits
+            FROM system_metrics
+            WHERE metric_name = %s
+              AND timestamp >= DATE_SUB(NOW(), INTERVAL %s HOUR)
+            GROUP BY access_key
+            ORDER BY hits DESC
+            {'LIMIT %s' if limit is not None else ''}
+            """,
+            (ACCESS_METRIC, self.window_hours) + ((limit,) if limit is not None else ())
+        )
+        return Counter({row['access_key']: int(row['hits']) for row in rows})
+
+    def save(self, deltas: Counter) -> None:
+        with self.core.transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.executemany(
+                    """
+                    INSERT INTO system_metrics (metric_name, metric_value, metadata)
+                    VALUES (%s, %s, %s)
+                    """,
+                    [(ACCESS_METRIC, count, json.dumps({'key': key}))
+                     for key, count in deltas.items()]
+                )
+            finally:
+                cursor.close()
+
+
+AccessStore = Union[FileAccessStore, MetricsAccessStore]
+
+
+class AccessLog:
+    """Per-range access counter, flushed periodically to an AccessStore"""
+
+    def __init__(self, store: Optional[AccessStore] = None, flush_interval: float = 300.0):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger(__name__)
+        # Accesses not yet written to the store
+        self._pending = Counter()
+        self._flusher: Optional[asyncio.Task] = None
+
+    def record(self, target: WarmupTarget) -> None:
+        self._pending[target.key] += 1
+
+    async def top(self, n: int) -> List[WarmupTarget]:
+        """Most accessed ranges, stored history plus unflushed accesses"""
+        counts = Counter(self._pending)
+        if self.store is not None:
+            try:
+                counts.update(await asyncio.to_thread(self.store.load, n))
+            except Exception as e:
+                self.logger.warning(f"Could not load access history: {e}")
+        targets = []
+        for key, _ in counts.most_common(n):
+            try:
+                targets.append(WarmupTarget.from_key(key))
+            except ValueError:
+                self.logger.debug(f"Skipping malformed access key {key!r}")
+        return targets
+
+    async def flush(self) -> int:
+        """Persist accesses recorded since the last flush"""
+        if self.store is None or not self._pending:
+            return 0
+        deltas, self._pending = self._pending, Counter()
+        try:
+            await asyncio.to_thread(self.store.save, deltas)
+        except Exception as e:
+            # Keep the counts for the next attempt
+            self._pending.update(deltas)
+            self.logger.warning(f"Could not persist access counts: {e}")
+            return 0
+        return len(deltas)
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_forever())
+
+    async def stop(self) -> None:
+        """Stop periodic flushing and write what is left"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+
+@dataclass
+class WarmupProgress:
+    """Running totals reported after every preloaded range"""
+    total: int
+    done: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.done + self.failed + self.skipped >= self.total
+
+
+class CacheWarmer:
+    """Preload the most accessed ranges before serving traffic
+
+    load(target) is whatever fills the cache for a range, normally the
+    same call a request would make. At most `concurrency` loads run at a
+    time and new loads start no faster than `rate` per second, so warmup
+    stays inside upstream rate limits. Failures are logged and counted but
+    never abort warmup; after max_seconds the remaining loads are
+    cancelled so a slow upstream cannot hold startup hostage.
+    """
+
+    def __init__(self, log: AccessLog, load: Callable[[WarmupTarget], Awaitable[Any]],
+                 top_n: int = 100, concurrency: int = 4, rate: float = 10.0,
+                 max_seconds: Optional[float] = None,
+                 progress: Optional[Callable[[WarmupProgress], None]] = None):
+        self.log = log
+        self.load = load
+        self.top_n = top_n
+        self.concurrency = concurrency
+        self.rate = rate
+        self.max_seconds = max_seconds
+        self.progress = progress
+        self.logger = logging.getLogger(__name__)
+
+    async def run(self) -> WarmupProgress:
+        targets = await self.log.top(self.top_n)
+        state = WarmupProgress(total=len(targets))
+        if not targets:
+            return state
+
+        t0 = time.monotonic()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pace = asyncio.Lock()
+        next_start = t0
+
+        def report() -> None:
+            state.elapsed = time.monotonic() - t0
+            if self.progress is not None:
+                self.progress(state)
+
+        async def warm(target: WarmupTarget) -> None:
+            nonlocal next_start
+            async with semaphore:
+                async with pace:
+                    delay = next_start - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    next_start = max(next_start, time.monotonic()) + 1.0 / self.rate
+                try:
+                    await self.load(target)
+                    state.done += 1
+                except Exception as e:
+                    state.failed += 1
+                    self.logger.warning(f"Warmup of {target.key} failed: {e}")
+                report()
+
+        tasks = [asyncio.create_task(warm(t)) for t in targets]
+        _, pending = await asyncio.wait(tasks, timeout=self.max_seconds)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        state.skipped = len(pending)
+        report()
+        self.logger.info(
+            f"Cache warmup: {state.done}/{state.total} ranges loaded, "
+            f"{state.failed} failed, {state.skipped} skipped in {state.elapsed:.1f}s"
+        )
+        return state
@@ -1,5 +1,6 @@
 # FILE: src/core/data/data_fetcher.py
 
+import asyncio
 import pandas as pd
 import requests
 import logging
@@ -9,9 +10,12 @@ from dotenv import load_dotenv
 import os
 import mysql.connector
 from polygon import RESTClient
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence
 from .polygon_client import PolygonClient
 from .database_client import DatabaseClient
+from .database.bulk import BulkLoader
+from .fetch_modules.backfill import BackfillEngine, BackfillReport
+from .fetch_modules.polygon import PolygonClient as AsyncPolygonClient
 
 
 class DataFetcher:
@@ -24,6 +28,7 @@ class DataFetcher:
         load_dotenv()
         self.polygon_client = PolygonClient()
         self.database_client = DatabaseClient()
+        self.bulk_loader = BulkLoader()
 
     def log_debug_message(self, cursor, message):
         cursor.execute("INSERT INTO DebugLogs (message) VALUES (%s)", (message,))
@@ -161,25 +166,15 @@ class DataFetcher:
             df = pd.DataFrame(data)
 
             # Insert data into the appropriate table
-            for _, row in df.iterrows():
-                cursor.execute(
-                    f"""
-                    INSERT INTO {table_name} (
-                        open, high, low, close, volume, vwap, timestamp, transactions, otc
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                    (
-                        row["open"],
-                        row["high"],
-                        row["low"],
-                        row["close"],
-                        row["volume"],
-                        row["vwap"],
-                        row["timestamp"],
-                        row["transactions"],
-                        row["otc"],
-                    ),
-                )
+            self.bulk_loader.load_frame(
+                table_name,
+                df,
+                columns=[
+                    "open", "high", "low", "close", "volume",
+                    "vwap", "timestamp", "transactions", "otc",
+                ],
+                cursor=cursor,
+            )
 
             print(
                 f"Polygon data for {ticker} from {start_date} to {end_date} inserted into the {table_name} table"
@@ -254,30 +249,25 @@ class DataFetcher:
         combined_df = polygon_df  # Assuming only Polygon data is used now
 
         # Insert combined data into HistoricalData table
-        for _, row in combined_df.iterrows():
-            cursor.execute(
-                """
-                INSERT INTO HistoricalData (
-                    symbol, trade_type, order_type, trade_outcome,
-                    realtime_start, realtime_end, date, fred_value,
-                    units, start, cik, entity
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-                (
-                    "AAPL",
-                    "BUY",
-                    "market",
-                    1,  # Placeholder values
-                    row["realtime_start"],
-                    row["realtime_end"],
-                    row["date"],
-                    row["fred_value"],
-                    row["units"],
-                    row["start"],
-                    row["cik"],
-                    row["entity"],
-                ),
-            )
+        historical_df = combined_df[
+            ["realtime_start", "realtime_end", "date", "fred_value",
+             "units", "start", "cik", "entity"]
+        ].assign(
+            symbol="AAPL",
+            trade_type="BUY",
+            order_type="market",
+            trade_outcome=1,  # Placeholder values
+        )
+        self.bulk_loader.load_frame(
+            "HistoricalData",
+            historical_df,
+            columns=[
+                "symbol", "trade_type", "order_type", "trade_outcome",
+                "realtime_start", "realtime_end", "date", "fred_value",
+                "units", "start", "cik", "entity",
+            ],
+            cursor=cursor,
+        )
 
         # Commit and close the database connection
         db_connection.commit()
@@ -286,34 +276,37 @@ class DataFetcher:
 
         print("Combined data inserted into HistoricalData table")
 
-    def fetch_historical_data(self):
-        """
-        Fetch historical data from various sources and insert it into the database.
+    def fetch_historical_data(self, symbols: Sequence[str] = ("AAPL",),
+                              start_date: str = "2022-01-01",
+                              end_date: str = "2022-12-31",
+                              timeframe: str = "1d",
+                              concurrency: int = 4) -> BackfillReport:
         """
-        # Get MySQL database credentials from environment variables
-        db_host = os.getenv("DB_HOST")
-        db_user = os.getenv("DB_USER")
-        db_password = os.getenv("DB_PASSWORD")
-        db_database = os.getenv("DB_DATABASE")
+        Backfill market_data in page-sized chunks, resuming an interrupted run.
 
-        # Connect to MySQL database
-        db_connection = mysql.connector.connect(
-            host=db_host, user=db_user, password=db_password, database=db_database
-        )
-        cursor = db_connection.cursor()
-
-        # Log debug message
-        self.log_debug_message(cursor, "Connected to the database")
-
-        # Fetch and insert data from Polygon API
-        self.fetch_polygon_data(cursor, "stocks", "AAPL", "2022-01-01", "2022-12-31")
-
-        # Commit and close the database connection
-        db_connection.commit()
-        cursor.close()
-        db_connection.close()
+        Args:
+            symbols (Sequence[str]): Symbols to backfill.
+            start_date (str): First day, YYYY-MM-DD.
+            end_date (str): Last day, YYYY-MM-DD.
+            timeframe (str): Bar size such as "1m", "5m", "1h" or "1d".
+            concurrency (int): Chunks fetched at once.
 
-        print("Historical data fetched and inserted into the database")
+        Returns:
+            BackfillReport: Chunk and row counts of the run.
+        """
+        async def run() -> BackfillReport:
+            async with AsyncPolygonClient() as client:
+                engine = BackfillEngine(client, lambda: self.database_client.core,
+                                        concurrency=concurrency,
+                                        bulk_loader=self.bulk_loader)
+                return await engine.run(symbols, timeframe, start_date, end_date)
+
+        report = asyncio.run(run())
+        print(
+            f"Historical data backfilled: {report.done} chunks loaded, "
+            f"{report.skipped} already done, {report.failed} failed"
+        )
+        return report
 
     def fetch_market_data(self, symbol: str, start_date: str, end_date: str):
         """Fetch market data from Polygon API"""
@@ -346,28 +339,24 @@ class DataFetcher:
     def store_processed_data(self, data: pd.DataFrame, symbol: str):
         """Store processed data in database with edge case handling"""
         try:
-            db_client = DatabaseClient()
-            query = """
-            INSERT INTO processed_market_data
-            (symbol, timestamp, value, trade_outcome)
-            VALUES (%s, %s, %s, %s)
-            """
+            columns = ["symbol", "timestamp", "value", "trade_outcome"]
 
             # Handle empty DataFrame
             if data.empty:
                 # Insert placeholder row for empty data
-                params = (symbol, 0, 0, 1)
-                db_client.execute_query(query, params)
-                return
-
-            for _, row in data.iterrows():
-                params = (
-                    symbol,
-                    float(row.get("timestamp", 0)),
-                    float(row.get("value", 0)),
-                    int(row.get("trade_outcome", 1)),
-                )
-                db_client.execute_query(query, params)
+                rows = pd.DataFrame([(symbol, 0, 0, 1)], columns=columns)
+            else:
+                rows = pd.DataFrame({
+                    "symbol": symbol,
+                    "timestamp": data.get("timestamp", 0),
+                    "value": data.get("value", 0),
+                    "trade_outcome": data.get("trade_outcome", 1),
+                }, index=data.index)
+                rows = rows.astype({
+                    "timestamp": float, "value": float, "trade_outcome": int
+                })
+
+            self.database_client.bulk_insert("processed_market_data", rows, columns)
 
         except Exception as e:
             raise Exception(f"Failed to store data: {e}")
@@ -5,7 +5,6 @@ from typing import Dict, Any, Optional, List, Union
 from datetime import datetime, timedelta
 import pandas as pd
 import asyncio
-from functools import lru_cache
 import argparse
 import schedule
 import time
@@ -16,10 +15,27 @@ from dotenv import load_dotenv
 import numpy as np
 
 # Current imports
+from .cache.async_memo import AsyncMemo
+from .cache.events import ChangeEvent, market_data_changes
+from .cache.memory_cache import MarketDataValidator
+from .cache.query_cache import QueryCache
+from .cache.warmup import (
+    AccessLog, CacheWarmer, FileAccessStore, MetricsAccessStore, WarmupProgress, WarmupTarget
+)
+from .cache.ttl_policy import TTLPolicy
 from .database_client import DatabaseClient
 from .database_config import DatabaseConfig
+from .database.async_core import AsyncCore
+from .database.async_operations import AsyncOperations
+from .database.bulk import MARKET_DATA_KEY, MARKET_DATA_CONFLICT_POLICIES, market_data_frame
+from .database.config import Config
+from .database.partitions import MARKET_DATA_RANGE_QUERY, PartitionManager
+from .fetch_modules.backfill import BackfillEngine
+from .fetch_modules.incremental import Gap, IncrementalSync, Watermarks
+from .fetch_modules.polygon.grouped_daily import GroupedDailyIngest
 from .fetch_modules.polygon.polygon_client import PolygonClient
-from .models import MarketDataValidator
+from .fetch_modules.polygon.polygon_data_source import PolygonDataSource
+from .managers.market_data import MarketDataManager
 
 # Based on project structure, these are correct since:
 # - All imported files are at same level or in subdirectories
@@ -49,8 +65,173 @@ class DataManager:
         self.polygon_api_key = os.getenv('POLYGON_API_KEY')
         self.polygon_client = PolygonClient(self.polygon_api_key)
         self.validator = MarketDataValidator()
-        self.cache = lru_cache(maxsize=1000)(self._fetch_from_source)
+        cache_config = self.config.get('cache', {})
+        # Closed sessions are cached indefinitely, the live session briefly
+        self.ttl_policy = TTLPolicy(live_ttl=cache_config.get('live_ttl_seconds', 60))
+        self.cache = AsyncMemo(
+            self._fetch_from_source,
+            maxsize=cache_config.get('max_size', 1000),
+            ttl=cache_config.get('ttl_seconds', 300),
+            ttl_for=self._memo_ttl
+        )
+        # Cross-process L2 read through on self.cache misses
+        self.shared_cache = QueryCache(lambda: self.db_client.core)
+        market_data_changes.subscribe(self._on_change, self._on_changes)
+        # Polygon reads go through the range cache, whose gap fetches share
+        # self.shared_cache; disk_dir adds a persistent tier across restarts
+        self.market_data = MarketDataManager(
+            data_source=PolygonDataSource(client=self.polygon_client),
+            cache_dir=cache_config.get('disk_dir'),
+            # Gap fetches land in a striped L1 so concurrent symbols do not contend
+            cache_shards=cache_config.get('shards', 16),
+            cache_max_bytes=cache_config.get('max_bytes', 512 * 1024 * 1024),
+            ttl_policy=self.ttl_policy,
+            db_client=self.db_client,
+            shared=self.shared_cache,
+            # Kept apart from self.access_log, whose kinds are source names
+            access_log=AccessLog()
+        )
+        # Request frequency drives startup warmup; a local file or system_metrics
+        warmup_config = cache_config.get('warmup', {})
+        self.access_log = AccessLog(
+            FileAccessStore(warmup_config['file']) if warmup_config.get('file')
+            else MetricsAccessStore(lambda: self.db_client.core)
+        )
+        # Scheduled market_data tasks fetch only past each symbol's latest bar
+        self.watermarks = Watermarks(lambda: self.db_client.core)
+        market_data_changes.subscribe(self.watermarks.on_change)
+        self.backfill = BackfillEngine(self.polygon_client, lambda: self.db_client.core)
+        self.incremental = IncrementalSync(
+            self._fetch_polygon_data, self._store_market_data, self.watermarks,
+            refill=self._refill_gap,
+            check_gaps=self.config.get('sync', {}).get('check_gaps', True)
+        )
+        # Whole-market daily refresh, one request per session
+        self.grouped_daily = GroupedDailyIngest(
+            self.polygon_client, lambda: self.db_client.core,
+            symbols=self.config.get('sync', {}).get('universe')
+        )
         self.scheduled_tasks = {}
+        self._db = None
+        self._partitions = None
+        # Keeps market_data partitions ahead of the data; see maintain_partitions
+        self.maintenance_interval = self.config.get('maintenance', {}).get(
+            'interval_seconds', 24 * 60 * 60
+        )
+        self._maintainer: Optional[asyncio.Task] = None
+
+    @property
+    def db(self) -> AsyncOperations:
+        """Async database operations; the pool opens on first use"""
+        if self._db is None:
+            config = Config.from_mapping(self.config.get('database'))
+            self._db = AsyncOperations(AsyncCore(config))
+        return self._db
+
+    @property
+    def partitions(self) -> PartitionManager:
+        """market_data partition manager on the shared sync core"""
+        if self._partitions is None:
+            core = self.db_client.core
+            self._partitions = PartitionManager(
+                core,
+                granularity=core.config.partition_granularity,
+                ahead=core.config.partitions_ahead
+            )
+        return self._partitions
+
+    async def maintain_partitions(self) -> List[str]:
+        """Split future market_data partitions off p_future; returns new names"""
+        try:
+            added = await asyncio.to_thread(self.partitions.ensure_future_partitions)
+        except Exception as e:
+            self.logger.error(f"Partition maintenance failed: {e}")
+            return []
+        if added and self._db is not None:
+            # Range reads slice on the new bounds from now on
+            self._db.bounds.clear()
+        return added
+
+    async def _maintain_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.maintenance_interval)
+            await self.maintain_partitions()
+
+    async def start_maintenance(self) -> None:
+        """Run partition maintenance now and then every maintenance_interval"""
+        await self.maintain_partitions()
+        if self._maintainer is None or self._maintainer.done():
+            self._maintainer = asyncio.create_task(self._maintain_forever())
+
+    async def stop_maintenance(self) -> None:
+        if self._maintainer is not None:
+            self._maintainer.cancel()
+            try:
+                await self._maintainer
+            except asyncio.CancelledError:
+                pass
+            self._maintainer = None
+
+    def _memo_ttl(self, symbol: str, start_date: datetime, end_date: datetime,
+                  source: DataSource) -> float:
+        """Recency TTL for Polygon reads; ttl_seconds for everything else"""
+        # Stored bars change through backfills and other processes this
+        # process hears nothing about, so closed ranges must still expire
+        if source == DataSource.POLYGON:
+            return self.ttl_policy.ttl_for(end_date)
+        return self.cache.ttl
+
+    def _on_change(self, event: ChangeEvent) -> None:
+        """Drop memoized results overlapping a market_data write"""
+        # self.market_data handles the range cache and self.shared_cache
+        self.cache.invalidate_where(
+            lambda key: key[0] == event.symbol and event.overlaps(key[1], key[2])
+        )
+
+    def _on_changes(self, events: List[ChangeEvent]) -> None:
+        """Batch form of _on_change: one memo scan for the whole batch"""
+        by_symbol: Dict[str, List[ChangeEvent]] = {}
+        for event in events:
+            by_symbol.setdefault(event.symbol, []).append(event)
+        self.cache.invalidate_where(
+            lambda key: any(event.overlaps(key[1], key[2]) for event in by_symbol.get(key[0], ()))
+        )
+
+    async def warm_cache(self) -> WarmupProgress:
+        """Preload the most requested ranges; run before accepting requests"""
+        warmup_config = self.config.get('cache', {}).get('warmup', {})
+
+        async def load(target: WarmupTarget) -> None:
+            await self.cache(target.symbol, target.start, target.end, DataSource(target.kind))
+
+        def report(progress: WarmupProgress) -> None:
+            self.logger.debug(
+                f"Warmup {progress.done + progress.failed}/{progress.total} "
+                f"({progress.elapsed:.1f}s)"
+            )
+
+        warmer = CacheWarmer(
+            self.access_log, load,
+            top_n=warmup_config.get('top_n', 100),
+            concurrency=warmup_config.get('concurrency', 4),
+            rate=warmup_config.get('rate', 5.0),
+            max_seconds=warmup_config.get('max_seconds', 60.0),
+            progress=report
+        )
+        progress = await warmer.run()
+        await self.access_log.start()
+        return progress
+
+    async def close(self) -> None:
+        """Stop cache background work and release pooled connections"""
+        await self.stop_maintenance()
+        await self.access_log.stop()
+        await self.incremental.stop()
+        # Also stops the shared cache sweep
+        await self.market_data.close()
+        await self.polygon_client.close()
+        if self._db is not None:
+            await self._db.core.close()
 
     def _load_config(self, config_path: str) -> None:
         """Load configuration from JSON file"""
@@ -93,14 +274,10 @@ class DataManager:
         start_date = datetime.fromisoformat(request['start_date'])
         end_date = datetime.fromisoformat(request['end_date'])
         source = DataSource(request.get('source', 'polygon'))
-        
-        if source == DataSource.POLYGON:
-            data = await self._fetch_polygon_data(symbol, start_date, end_date)
-        elif source == DataSource.DATABASE:
-            data = await self._fetch_database_data(symbol, start_date, end_date)
-        else:
-            data = await self._fetch_mock_data(symbol, start_date, end_date)
-            
+        self.access_log.record(WarmupTarget(symbol, source.value, start_date, end_date))
+
+        data = await self.cache(symbol, start_date, end_date, source)
+
         # Store in database if requested
         if request.get('store', False):
             await self._store_market_data(symbol, data)
@@ -167,30 +344,42 @@ class DataManager:
         raise ValueError(f"Unknown scheduled action: {action}")
 
     async def _fetch_polygon_data(self, symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
-        data = await self.polygon_client.get_market_data(symbol, start_date, end_date)
-        # Rest of the code...
+        return await self.polygon_client.get_market_data(symbol, start_date, end_date)
+
+    # Shared with PartitionManager.verify_pruning
+    MARKET_DATA_RANGE_QUERY = MARKET_DATA_RANGE_QUERY
 
     async def _fetch_database_data(self, symbol: str, start_date: datetime,
                                  end_date: datetime) -> pd.DataFrame:
         """Fetch data from database"""
         try:
-            query = """
-                SELECT * FROM market_data 
-                WHERE symbol = %s AND timestamp BETWEEN %s AND %s
-                ORDER BY timestamp
-            """
-            return await self.db_client.execute_query(query, (symbol, start_date, end_date))
+            return await self.db.read_range('market_data', symbol, start_date, end_date)
         except Exception as e:
             self.logger.error(f"Database fetch failed for {symbol}: {e}")
             raise
 
+    async def stream_database_data(self, symbol: str, start_date: datetime,
+                                   end_date: datetime, chunk_size: int = 50000):
+        """Yield stored bars for a range as DataFrame chunks"""
+        chunks = self.db.core.iter_frames(
+            self.MARKET_DATA_RANGE_QUERY, (symbol, start_date, end_date), chunk_size
+        )
+        try:
+            async for frame in chunks:
+                yield frame
+        finally:
+            await chunks.aclose()
+
     async def _store_market_data(self, symbol: str, data: pd.DataFrame) -> None:
         """Store market data in database"""
+        frame = market_data_frame(data, symbol)
         try:
-            await self.db_client.store_market_data(symbol, data)
+            await self.db.upsert_many('market_data', frame,
+                                      MARKET_DATA_KEY, MARKET_DATA_CONFLICT_POLICIES)
         except Exception as e:
             self.logger.error(f"Failed to store data for {symbol}: {e}")
             raise
+        market_data_changes.publish(ChangeEvent.from_frame(symbol, frame))
 
     async def _add_scheduled_task(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Add a new scheduled task"""
@@ -213,7 +402,7 @@ class DataManager:
                                end_date: datetime, source: DataSource) -> pd.DataFrame:
         """Fetch data from specified source with caching"""
         if source == DataSource.POLYGON:
-            return await self._fetch_polygon_data(symbol, start_date, end_date)
+            return await self.market_data.get_market_data(symbol, start_date, end_date)
         elif source == DataSource.DATABASE:
             return await self._fetch_database_data(symbol, start_date, end_date)
         elif source == DataSource.MOCK:
@@ -227,17 +416,63 @@ class DataManager:
             self.logger.info(f"Running scheduled task: {task_type}")
             
             if task_type == 'market_data':
-                await self._handle_market_data_request(task_config)
+                if self._is_incremental(task_config):
+                    await self._sync_market_data(task_config)
+                else:
+                    await self._handle_market_data_request(task_config)
+            elif task_type == 'grouped_daily':
+                await self._ingest_grouped_daily(task_config)
             elif task_type == 'backtest':
                 await self._handle_backtest_request(task_config)
             elif task_type == 'database':
                 await self._handle_database_request(task_config)
+            elif task_type == 'partitions':
+                await self.maintain_partitions()
             else:
                 raise ValueError(f"Unknown task type: {task_type}")
                 
         except Exception as e:
             self.logger.error(f"Scheduled task failed: {e}")
             
+    @staticmethod
+    def _is_incremental(task_config: Dict[str, Any]) -> bool:
+        """Polygon tasks sync incrementally unless mode is 'full'"""
+        source = DataSource(task_config.get('source', 'polygon'))
+        return source == DataSource.POLYGON and task_config.get('mode', 'incremental') == 'incremental'
+
+    async def _sync_market_data(self, task_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch and store bars after each symbol's watermark, queueing gap refills"""
+        symbols = task_config.get('symbols') or [task_config['symbol']]
+        start_date = datetime.fromisoformat(task_config['start_date'])
+        end_date = (datetime.fromisoformat(task_config['end_date'])
+                    if task_config.get('end_date') else datetime.now())
+        report = await self.incremental.sync(symbols, start_date, end_date)
+        self.logger.info(
+            f"Synced {sum(report.fetched.values())} bars for {len(symbols)} symbols; "
+            f"{len(report.gaps)} gap(s) found"
+        )
+        return {"status": "success", "fetched": report.fetched, "gaps": len(report.gaps)}
+
+    async def _ingest_grouped_daily(self, task_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Refresh daily bars of the whole universe from grouped daily responses"""
+        start_date = datetime.fromisoformat(task_config.get('start_date') or
+                                            datetime.now().date().isoformat())
+        end_date = (datetime.fromisoformat(task_config['end_date'])
+                    if task_config.get('end_date') else start_date)
+        report = await self.grouped_daily.backfill(start_date, end_date)
+        return {"status": "success", "rows": report.rows, "requests": report.requests,
+                "failed": [day.isoformat() for day in report.failed]}
+
+    async def _refill_gap(self, gap: Gap) -> int:
+        """Backfill one gap found by the incremental sync"""
+        report = await self.backfill.run([gap.symbol], '1d', gap.start, gap.end)
+        # Failed chunks are only counted; 0 rows must mean the source has none
+        if not report.complete:
+            raise RuntimeError(
+                f"{report.failed} of {report.total} chunk(s) failed for {gap.symbol}"
+            )
+        return report.rows
+
     async def _remove_scheduled_task(self, task_id: str) -> Dict[str, Any]:
         """Remove a scheduled task"""
         if task_id not in self.scheduled_tasks:
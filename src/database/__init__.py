@@ -1,6 +1,12 @@
 # src/database/__init__.py
-from .core import Database, Core
-from .operations import Operations 
+from .core import Core, get_shared_core
+from .operations import Operations
+from .async_core import AsyncCore
+from .async_operations import AsyncOperations
+from .bulk import BulkLoader, BulkLoadStats, MARKET_DATA_KEY, MARKET_DATA_CONFLICT_POLICIES
+from .pool import ConnectionPool, AsyncConnectionPool, PoolTimeoutError
+from .decode import decode_columns, decode_frame
+from .partitions import PartitionManager, PruningReport
 from .migrations import Migrations
 from .monitoring import Monitoring
 from .config import Config
@@ -11,4 +17,9 @@ class Database:
         self.core = Core(self.config)
         self.operations = Operations(self.core)
         self.migrations = Migrations(self.core)
-        self.monitoring = Monitoring(self.core)
\ No newline at end of file
+        self.monitoring = Monitoring(self.core)
+        self.partitions = PartitionManager(
+            self.core,
+            granularity=self.config.partition_granularity,
+            ahead=self.config.partitions_ahead
+        )
\ No newline at end of file
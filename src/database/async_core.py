@@ -0,0 +1,154 @@
+# src/database/async_core.py
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional
+
+import mysql.connector
+import numpy as np
+import pandas as pd
+
+from .config import Config
+from .decode import decode_columns, decode_frame
+from .pool import AsyncConnectionPool, AsyncPooledConnection
+
+
+class AsyncCore:
+    """asyncio counterpart of Core on mysql.connector.aio
+
+    Queries await the server instead of blocking a thread, so concurrent
+    API requests overlap their database I/O on one event loop.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.pool = AsyncConnectionPool(
+            self.config.get_connection_params(),
+            **self.config.get_pool_params()
+        )
+
+    async def open(self) -> None:
+        """Pre-open min_size connections"""
+        await self.pool.open()
+
+    @asynccontextmanager
+    async def get_connection(self) -> AsyncGenerator[AsyncPooledConnection, None]:
+        conn = None
+        try:
+            conn = await self.pool.get_connection()
+            yield conn
+        except mysql.connector.Error as e:
+            if conn:
+                await conn.rollback()
+            self.logger.error(f"Database error: {e}")
+            raise
+        finally:
+            if conn:
+                try:
+                    await conn.close()
+                except mysql.connector.Error:
+                    self.logger.warning("Failed to close connection")
+
+    async def execute(self, query: str, params: Optional[tuple] = None) -> list[dict]:
+        """Execute single query and return results"""
+        async with self.get_connection() as conn:
+            cursor = await conn.cursor(dictionary=True)
+            try:
+                await cursor.execute(query, params or ())
+                return await cursor.fetchall()
+            finally:
+                await cursor.close()
+
+    async def fetch_columns(self, query: str, params: Optional[tuple] = None,
+                            price_scale: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Execute query and return typed NumPy columns instead of dict rows"""
+        async with self.get_connection() as conn:
+            cursor = await conn.cursor(raw=True)
+            try:
+                await cursor.execute(query, params or ())
+                rows = await cursor.fetchall()
+                return decode_columns(cursor.description, rows, price_scale)
+            finally:
+                await cursor.close()
+
+    async def fetch_frame(self, query: str, params: Optional[tuple] = None,
+                          price_scale: Optional[int] = None) -> pd.DataFrame:
+        """Execute query and build a DataFrame from typed columns"""
+        columns = await self.fetch_columns(query, params, price_scale)
+        return pd.DataFrame(columns, copy=False)
+
+    @asynccontextmanager
+    async def stream(self, query: str, params: Optional[tuple] = None,
+                     dictionary: bool = False, raw: bool = False) -> AsyncGenerator[Any, None]:
+        """Execute query on an unbuffered cursor held for the caller"""
+        async with self.get_connection() as conn:
+            cursor = await conn.cursor(buffered=False, dictionary=dictionary, raw=raw)
+            try:
+                await cursor.execute(query, params or ())
+                yield cursor
+            finally:
+                # Rows left unread when the consumer stops early must be
+                # drained before the connection can go back to the pool
+                if conn.unread_result:
+                    await conn.consume_results()
+                await cursor.close()
+
+    async def iter_rows(self, query: str, params: Optional[tuple] = None,
+                        batch_size: int = 1000) -> AsyncIterator[dict]:
+        """Stream result rows as dicts in bounded memory"""
+        async with self.stream(query, params, dictionary=True) as cursor:
+            while rows := await cursor.fetchmany(batch_size):
+                for row in rows:
+                    yield row
+
+    async def iter_frames(self, query: str, params: Optional[tuple] = None,
+                          chunk_size: int = 50000, columnar: bool = True,
+                          price_scale: Optional[int] = None) -> AsyncIterator[pd.DataFrame]:
+        """Stream results as DataFrames of at most chunk_size rows"""
+        async with self.stream(query, params, raw=columnar) as cursor:
+            columns = [desc[0] for desc in cursor.description]
+            while rows := await cursor.fetchmany(chunk_size):
+                if columnar:
+                    yield decode_frame(cursor.description, rows, price_scale)
+                else:
+                    yield pd.DataFrame.from_records(rows, columns=columns)
+
+    async def execute_many(self, query: str, params_list: list[tuple]) -> None:
+        """Execute batch query with multiple parameter sets"""
+        async with self.get_connection() as conn:
+            cursor = await conn.cursor()
+            try:
+                await cursor.executemany(query, params_list)
+                await conn.commit()
+            finally:
+                await cursor.close()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncGenerator[AsyncPooledConnection, None]:
+        """Transaction context manager"""
+        async with self.get_connection() as conn:
+            try:
+                yield conn
+                await conn.commit()
+            except Exception as e:
+                await conn.rollback()
+                self.logger.error(f"Transaction failed: {e}")
+                raise
+
+    async def ping(self) -> bool:
+        """Test database connection"""
+        try:
+            async with self.get_connection() as conn:
+                await conn.ping(reconnect=True)
+                return True
+        except mysql.connector.Error as e:
+            self.logger.error(f"Ping failed: {e}")
+            return False
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool occupancy and latency statistics"""
+        return self.pool.get_stats()
+
+    async def close(self) -> None:
+        """Close connection pool"""
+        await self.pool.close()
@@ -0,0 +1,194 @@
+# src/database/async_operations.py
+import asyncio
+import time
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from .async_core import AsyncCore
+from .bulk import (
+    BulkLoader, BulkLoadStats, DEFAULT_MAX_PACKET, frame_to_rows, upsert_clause
+)
+from .operations import BoundsCache, Operations, stitch_frames
+from .partitions import PARTITIONS_QUERY
+
+
+class AsyncOperations:
+    """asyncio counterpart of Operations on top of AsyncCore"""
+
+    def __init__(self, core: AsyncCore):
+        self.core = core
+        # Only statement building is shared; LOAD DATA stays on the sync path
+        self.bulk = BulkLoader()
+        self.bounds = BoundsCache()
+
+    async def insert(self, table: str, data: Dict[str, Any]) -> int:
+        """Insert single record and return inserted id"""
+        columns = ', '.join(data.keys())
+        placeholders = ', '.join(['%s'] * len(data))
+        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+
+        async with self.core.transaction() as conn:
+            cursor = await conn.cursor()
+            try:
+                await cursor.execute(query, tuple(data.values()))
+                return cursor.lastrowid
+            finally:
+                await cursor.close()
+
+    async def insert_many(self, table: str, data: List[Dict[str, Any]]) -> None:
+        """Insert multiple records"""
+        if not data:
+            return
+        columns = list(data[0].keys())
+        await self._load_rows(table, columns, [tuple(row.values()) for row in data])
+
+    async def bulk_insert(self,
+                          table: str,
+                          data: Union[pd.DataFrame, List[Dict[str, Any]]],
+                          columns: Optional[Sequence[str]] = None) -> BulkLoadStats:
+        """Insert a DataFrame or record list in packet-sized multi-row batches"""
+        if not isinstance(data, pd.DataFrame):
+            data = pd.DataFrame(data)
+        columns = list(columns or data.columns)
+        return await self._load_rows(table, columns, frame_to_rows(data, columns))
+
+    async def upsert_many(self,
+                          table: str,
+                          data: Union[pd.DataFrame, List[Dict[str, Any]]],
+                          key_columns: Sequence[str],
+                          policies: Optional[Dict[str, str]] = None,
+                          columns: Optional[Sequence[str]] = None) -> BulkLoadStats:
+        """Batched INSERT ... ON DUPLICATE KEY UPDATE with per-column policies"""
+        if not isinstance(data, pd.DataFrame):
+            data = pd.DataFrame(data)
+        columns = list(columns or data.columns)
+        clause = upsert_clause(columns, key_columns, policies)
+        return await self._load_rows(table, columns, frame_to_rows(data, columns), clause)
+
+    async def _load_rows(self, table: str, columns: List[str], rows: List[tuple],
+                         on_duplicate: str = '') -> BulkLoadStats:
+        stats = BulkLoadStats()
+        if not rows:
+            return stats
+        start = time.perf_counter()
+        async with self.core.transaction() as conn:
+            cursor = await conn.cursor()
+            try:
+                await self._packet_limit(cursor)
+                for query, params, count in self.bulk.statements(table, columns, rows,
+                                                                 on_duplicate):
+                    await cursor.execute(query, params)
+                    stats.rows += count
+                    stats.batches += 1
+            finally:
+                await cursor.close()
+        stats.elapsed = time.perf_counter() - start
+        self.bulk.log_stats(table, stats)
+        return stats
+
+    async def _packet_limit(self, cursor: Any) -> int:
+        if self.bulk.max_packet is None:
+            try:
+                await cursor.execute("SELECT @@max_allowed_packet")
+                self.bulk.max_packet = int((await cursor.fetchall())[0][0])
+            except Exception as e:
+                self.bulk.logger.warning(f"Could not read max_allowed_packet: {e}")
+                self.bulk.max_packet = DEFAULT_MAX_PACKET
+        return self.bulk.max_packet
+
+    async def update(self, table: str, data: Dict[str, Any], where: Dict[str, Any]) -> int:
+        """Update records matching criteria"""
+        set_clause = ', '.join(f"{k} = %s" for k in data.keys())
+        where_clause = ' AND '.join(f"{k} = %s" for k in where.keys())
+        query = f"UPDATE {table} SET {set_clause} WHERE {where_clause}"
+
+        async with self.core.transaction() as conn:
+            cursor = await conn.cursor()
+            try:
+                await cursor.execute(query, (*data.values(), *where.values()))
+                return cursor.rowcount
+            finally:
+                await cursor.close()
+
+    async def delete(self, table: str, where: Dict[str, Any]) -> int:
+        """Delete records matching criteria"""
+        where_clause = ' AND '.join(f"{k} = %s" for k in where.keys())
+        query = f"DELETE FROM {table} WHERE {where_clause}"
+
+        async with self.core.transaction() as conn:
+            cursor = await conn.cursor()
+            try:
+                await cursor.execute(query, tuple(where.values()))
+                return cursor.rowcount
+            finally:
+                await cursor.close()
+
+    async def select_one(self, table: str,
+                         where: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
+        """Get single record matching criteria"""
+        results = await self.select(table, where, limit=1)
+        return results[0] if results else None
+
+    async def select(self,
+                     table: str,
+                     where: Optional[Dict[str, Any]] = None,
+                     order_by: Optional[str] = None,
+                     limit: Optional[int] = None,
+                     offset: Optional[int] = None) -> List[Dict]:
+        """Get records matching criteria with sorting and pagination"""
+        query, params = Operations._build_select(table, where, order_by, limit, offset)
+        return await self.core.execute(query, params)
+
+    def iter_select(self,
+                    table: str,
+                    where: Optional[Dict[str, Any]] = None,
+                    order_by: Optional[str] = None,
+                    chunk_size: int = 50000) -> AsyncIterator[pd.DataFrame]:
+        """Stream records matching criteria as DataFrame chunks"""
+        query, params = Operations._build_select(table, where, order_by)
+        return self.core.iter_frames(query, params, chunk_size)
+
+    async def read_range(self,
+                         table: str,
+                         symbol: str,
+                         start: datetime,
+                         end: datetime,
+                         data_type: Optional[str] = None,
+                         granularity: Optional[str] = None,
+                         max_workers: Optional[int] = None,
+                         price_scale: Optional[int] = None) -> pd.DataFrame:
+        """Read one symbol's [start, end] range as concurrent partition-aligned slices"""
+        bounds = None if granularity else await self.partition_bounds(table)
+        granularity = granularity or self.core.config.partition_granularity
+        queries = Operations._range_queries(table, symbol, start, end, data_type,
+                                            granularity, bounds)
+        if not queries:
+            return pd.DataFrame()
+        limit = asyncio.Semaphore(max_workers or self.core.config.pool_size)
+
+        async def fetch(query: str, params: tuple) -> pd.DataFrame:
+            async with limit:
+                return await self.core.fetch_frame(query, params, price_scale)
+
+        frames = await asyncio.gather(*(fetch(query, params) for query, params in queries))
+        return stitch_frames(frames)
+
+    async def partition_bounds(self, table: str) -> Optional[List[date]]:
+        """Cached RANGE partition bounds of table"""
+        fresh, bounds = self.bounds.get(table)
+        if fresh:
+            return bounds
+        return self.bounds.put(table, await self.core.execute(PARTITIONS_QUERY, (table,)))
+
+    async def count(self, table: str, where: Optional[Dict[str, Any]] = None) -> int:
+        """Count records matching criteria"""
+        query, params = Operations._build_select(table, where)
+        query = query.replace("SELECT *", "SELECT COUNT(*) as count", 1)
+        result = await self.core.execute(query, params)
+        return result[0]['count']
+
+    async def exists(self, table: str, where: Dict[str, Any]) -> bool:
+        """Check if records exist matching criteria"""
+        return await self.count(table, where) > 0
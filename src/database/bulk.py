@@ -0,0 +1,226 @@
+# src/database/bulk.py
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .core import Core
+
+# Column order of the market_data table used by every ingestion path
+MARKET_DATA_COLUMNS = [
+    'symbol', 'timestamp', 'data_type', 'open', 'high', 'low', 'close',
+    'volume', 'vwap', 'number_of_trades', 'source'
+]
+
+# Columns of market_data's unique_record key
+MARKET_DATA_KEY = ('symbol', 'timestamp', 'data_type')
+
+# Re-ingested bars widen the stored range and overwrite everything else
+MARKET_DATA_CONFLICT_POLICIES = {'high': 'max', 'low': 'min'}
+
+CONFLICT_POLICIES = {
+    'overwrite': '{col} = VALUES({col})',
+    'max': '{col} = GREATEST({col}, VALUES({col}))',
+    'min': '{col} = LEAST({col}, VALUES({col}))',
+}
+
+# Conservative fallback when the server limit cannot be read
+DEFAULT_MAX_PACKET = 4 * 1024 * 1024
+
+
+@dataclass
+class BulkLoadStats:
+    """Outcome of a bulk load"""
+    rows: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def market_data_frame(data: pd.DataFrame, symbol: Optional[str] = None,
+                      data_type: str = 'STOCK') -> pd.DataFrame:
+    """Normalize a bar DataFrame to market_data column names"""
+    frame = data.reset_index() if 'timestamp' not in data.columns else data.copy()
+    frame = frame.rename(columns={'transactions': 'number_of_trades'})
+    if symbol is not None:
+        frame['symbol'] = symbol
+    if 'data_type' not in frame.columns:
+        frame['data_type'] = data_type
+    return frame[[c for c in MARKET_DATA_COLUMNS if c in frame.columns]]
+
+
+def upsert_clause(columns: Sequence[str], key_columns: Sequence[str],
+                  policies: Optional[Dict[str, str]] = None,
+                  default_policy: str = 'overwrite') -> str:
+    """Build an ON DUPLICATE KEY UPDATE clause from per-column policies"""
+    policies = policies or {}
+    assignments = []
+    for col in columns:
+        if col in key_columns:
+            continue
+        policy = policies.get(col, default_policy)
+        if policy == 'keep':
+            continue
+        if policy not in CONFLICT_POLICIES:
+            raise ValueError(f"Unknown conflict policy for {col}: {policy}")
+        assignments.append(CONFLICT_POLICIES[policy].format(col=col))
+    if not assignments:
+        # Every column is kept; a self-assignment turns duplicates into no-ops
+        assignments.append(f"{key_columns[0]} = {key_columns[0]}")
+    return " ON DUPLICATE KEY UPDATE " + ', '.join(assignments)
+
+
+def frame_to_rows(frame: pd.DataFrame, columns: Sequence[str]) -> List[tuple]:
+    """Convert DataFrame columns to parameter tuples column-wise"""
+    values = []
+    for name in columns:
+        series = frame[name]
+        if series.hasnans or pd.api.types.is_datetime64_any_dtype(series.dtype):
+            values.append(series.astype(object).where(series.notna(), None).tolist())
+        else:
+            values.append(series.tolist())
+    return list(zip(*values))
+
+
+class BulkLoader:
+    """Multi-row INSERT / LOAD DATA writer sized to max_allowed_packet"""
+
+    def __init__(self, core: Optional[Core] = None,
+                 max_packet: Optional[int] = None,
+                 max_batch_rows: int = 10000,
+                 use_infile: bool = False):
+        self.core = core
+        self.max_packet = max_packet
+        self.max_batch_rows = max_batch_rows
+        self.use_infile = use_infile
+        self.logger = logging.getLogger(__name__)
+
+    def load_frame(self, table: str, frame: pd.DataFrame,
+                   columns: Optional[Sequence[str]] = None,
+                   cursor: Any = None,
+                   on_duplicate: str = '') -> BulkLoadStats:
+        """Write a DataFrame to table, committing when no cursor is given"""
+        columns = list(columns or frame.columns)
+        if frame.empty:
+            return BulkLoadStats()
+        if cursor is not None:
+            return self._load(cursor, table, frame, columns, on_duplicate)
+        with self.core.transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                return self._load(cursor, table, frame, columns, on_duplicate)
+            finally:
+                cursor.close()
+
+    def load_rows(self, table: str, columns: Sequence[str],
+                  rows: Iterable[tuple], cursor: Any = None,
+                  on_duplicate: str = '') -> BulkLoadStats:
+        """Write pre-built parameter tuples to table"""
+        rows = list(rows)
+        if not rows:
+            return BulkLoadStats()
+        if cursor is not None:
+            return self._insert_rows(cursor, table, list(columns), rows, on_duplicate)
+        with self.core.transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                return self._insert_rows(cursor, table, list(columns), rows, on_duplicate)
+            finally:
+                cursor.close()
+
+    def _load(self, cursor: Any, table: str, frame: pd.DataFrame,
+              columns: List[str], on_duplicate: str = '') -> BulkLoadStats:
+        # LOAD DATA cannot express per-column conflict handling
+        if self.use_infile and not on_duplicate:
+            return self._load_infile(cursor, table, frame, columns)
+        return self._insert_rows(cursor, table, columns,
+                                 frame_to_rows(frame, columns), on_duplicate)
+
+    def _insert_rows(self, cursor: Any, table: str, columns: List[str],
+                     rows: List[tuple], on_duplicate: str = '') -> BulkLoadStats:
+        start = time.perf_counter()
+        stats = BulkLoadStats()
+        self._packet_limit(cursor)
+
+        for query, params, count in self.statements(table, columns, rows, on_duplicate):
+            cursor.execute(query, params)
+            stats.rows += count
+            stats.batches += 1
+
+        stats.elapsed = time.perf_counter() - start
+        self.log_stats(table, stats)
+        return stats
+
+    def statements(self, table: str, columns: Sequence[str], rows: List[tuple],
+                   on_duplicate: str = '') -> Iterator[Tuple[str, list, int]]:
+        """Yield (query, params, row_count) multi-row INSERTs sized to max_packet"""
+        header = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+        group = '(' + ', '.join(['%s'] * len(columns)) + ')'
+        batch_rows = self._batch_size(rows, len(header) + len(on_duplicate))
+
+        for i in range(0, len(rows), batch_rows):
+            batch = rows[i:i + batch_rows]
+            params = [value for row in batch for value in row]
+            yield header + ', '.join([group] * len(batch)) + on_duplicate, params, len(batch)
+
+    def _load_infile(self, cursor: Any, table: str, frame: pd.DataFrame,
+                     columns: List[str]) -> BulkLoadStats:
+        """Stream the frame through LOAD DATA LOCAL INFILE"""
+        start = time.perf_counter()
+        # The connector only reads local infiles by path, so the CSV rendered
+        # by pandas is spooled to a temporary file for the duration of the load
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False,
+                                         newline='') as f:
+            frame.to_csv(f, columns=columns, index=False, header=False,
+                         na_rep='\\N', date_format='%Y-%m-%d %H:%M:%S')
+            path = f.name
+        try:
+            cursor.execute(
+                f"""
+                LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+                FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+                LINES TERMINATED BY '\\n'
+                ({', '.join(columns)})
+                """,
+                (path,)
+            )
+        finally:
+            os.unlink(path)
+
+        stats = BulkLoadStats(rows=len(frame), batches=1,
+                              elapsed=time.perf_counter() - start)
+        self.log_stats(table, stats)
+        return stats
+
+    def _batch_size(self, rows: List[tuple], header_len: int) -> int:
+        """Rows per statement that keep the packet under max_allowed_packet"""
+        budget = int((self.max_packet or DEFAULT_MAX_PACKET) * 0.9) - header_len
+        sample = rows[:100]
+        # Quoting, separators and escaping add a few bytes per value
+        row_width = sum(len(repr(row)) + 3 * len(row) for row in sample) / len(sample)
+        return max(1, min(self.max_batch_rows, int(budget / (row_width * 1.25))))
+
+    def _packet_limit(self, cursor: Any) -> int:
+        if self.max_packet is None:
+            try:
+                cursor.execute("SELECT @@max_allowed_packet")
+                row = cursor.fetchall()[0]
+                value = next(iter(row.values())) if isinstance(row, dict) else row[0]
+                self.max_packet = int(value)
+            except Exception as e:
+                self.logger.warning(f"Could not read max_allowed_packet: {e}")
+                self.max_packet = DEFAULT_MAX_PACKET
+        return self.max_packet
+
+    def log_stats(self, table: str, stats: BulkLoadStats) -> None:
+        self.logger.info(
+            f"Loaded {stats.rows} rows into {table} in {stats.batches} batches "
+            f"({stats.elapsed:.2f}s, {stats.rows_per_sec:,.0f} rows/s)"
+        )
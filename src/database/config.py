@@ -13,23 +13,66 @@ class Config:
     database: str = None
     pool_size: int = 5
     pool_name: str = 'database_pool'
+    pool_min_size: int = 1
+    pool_timeout: float = 30.0
+    pool_idle_timeout: float = 300.0
+    pool_pre_ping: bool = True
+    allow_local_infile: bool = False
+    statement_cache_size: int = 128
+    partition_granularity: str = 'month'
+    partitions_ahead: int = 3
     
-    def __init__(self):
+    def __init__(self, **overrides):
         load_dotenv()
         self.user = os.getenv('DB_USER')
         self.password = os.getenv('DB_PASSWORD')
         self.database = os.getenv('DB_DATABASE')
         self.host = os.getenv('DB_HOST', self.host)
         self.port = int(os.getenv('DB_PORT', self.port))
+        self.pool_size = int(os.getenv('DB_POOL_SIZE', self.pool_size))
+        self.pool_name = os.getenv('DB_POOL_NAME', self.pool_name)
+        self.pool_min_size = int(os.getenv('DB_POOL_MIN_SIZE', self.pool_min_size))
+        self.pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', self.pool_timeout))
+        self.pool_idle_timeout = float(os.getenv('DB_POOL_IDLE_TIMEOUT', self.pool_idle_timeout))
+        self.pool_pre_ping = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true')
+        self.allow_local_infile = os.getenv('DB_ALLOW_LOCAL_INFILE', '').lower() in ('1', 'true')
+        self.statement_cache_size = int(os.getenv('DB_STATEMENT_CACHE_SIZE', self.statement_cache_size))
+        self.partition_granularity = os.getenv('DB_PARTITION_GRANULARITY', self.partition_granularity)
+        self.partitions_ahead = int(os.getenv('DB_PARTITIONS_AHEAD', self.partitions_ahead))
+        for key, value in overrides.items():
+            if key not in self.__dataclass_fields__:
+                raise ValueError(f"Unknown config option: {key}")
+            setattr(self, key, value)
         self.validate()
     
+    @classmethod
+    def from_mapping(cls, options: Dict[str, Any]) -> 'Config':
+        """Build a Config from an application settings dict, ignoring unrelated keys"""
+        return cls(**{k: v for k, v in (options or {}).items()
+                      if k in cls.__dataclass_fields__})
+
     def validate(self) -> None:
         """Validate required configuration"""
         required = ['user', 'password', 'database']
         missing = [f for f in required if not getattr(self, f)]
         if missing:
             raise ValueError(f"Missing required config: {', '.join(missing)}")
+        if not 0 <= self.pool_min_size <= self.pool_size:
+            raise ValueError(
+                f"Invalid pool size: min={self.pool_min_size}, max={self.pool_size}"
+            )
     
+    def get_pool_params(self) -> Dict[str, Any]:
+        """Get sizing and timeout parameters for the connection pool"""
+        return {
+            'pool_name': self.pool_name,
+            'min_size': self.pool_min_size,
+            'max_size': self.pool_size,
+            'timeout': self.pool_timeout,
+            'idle_timeout': self.pool_idle_timeout,
+            'pre_ping': self.pool_pre_ping
+        }
+
     def get_connection_params(self) -> Dict[str, Any]:
         """Get parameters for connection pool"""
         return {
@@ -37,5 +80,6 @@ class Config:
             'port': self.port,
             'user': self.user,
             'password': self.password,
-            'database': self.database
+            'database': self.database,
+            'allow_local_infile': self.allow_local_infile
         }
\ No newline at end of file
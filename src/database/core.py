@@ -1,10 +1,32 @@
 # src/database/core.py
 import logging
-from typing import Optional, Any, Generator
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, Dict, Generator, Iterator, List, Sequence, Tuple
 import mysql.connector
-from mysql.connector.pooling import MySQLConnectionPool, PooledMySQLConnection
+import numpy as np
+import pandas as pd
 from contextlib import contextmanager
 from .config import Config  # Fix import path
+from .decode import decode_columns, decode_frame
+from .pool import ConnectionPool, PooledConnection
+
+def frames_from_cursor(cursor, chunk_size: int, columnar: bool = False,
+                       price_scale: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames of at most chunk_size rows from an executed cursor
+
+    With columnar=True the cursor must be raw and each chunk is decoded
+    straight into typed NumPy columns.
+    """
+    columns = [desc[0] for desc in cursor.description]
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        if columnar:
+            yield decode_frame(cursor.description, rows, price_scale)
+        else:
+            yield pd.DataFrame.from_records(rows, columns=columns)
 
 class Core:
     def __init__(self, config: Config):
@@ -12,19 +34,18 @@ class Core:
         self.logger = logging.getLogger(__name__)
         self.pool = self._create_connection_pool()
 
-    def _create_connection_pool(self) -> MySQLConnectionPool:
+    def _create_connection_pool(self) -> ConnectionPool:
         try:
-            return MySQLConnectionPool(
-                pool_name="database_pool",
-                pool_size=5,
-                **self.config.get_connection_params()
+            return ConnectionPool(
+                self.config.get_connection_params(),
+                **self.config.get_pool_params()
             )
         except mysql.connector.Error as e:
             self.logger.error(f"Failed to create connection pool: {e}")
             raise
 
     @contextmanager
-    def get_connection(self) -> Generator[PooledMySQLConnection, None, None]:
+    def get_connection(self) -> Generator[PooledConnection, None, None]:
         conn = None
         try:
             conn = self.pool.get_connection()
@@ -51,6 +72,72 @@ class Core:
             finally:
                 cursor.close()
 
+    def fetch_columns(self, query: str, params: Optional[tuple] = None,
+                      price_scale: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Execute query and return typed NumPy columns instead of dict rows"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor(raw=True)
+            try:
+                cursor.execute(query, params or ())
+                return decode_columns(cursor.description, cursor.fetchall(), price_scale)
+            finally:
+                cursor.close()
+
+    def fetch_frame(self, query: str, params: Optional[tuple] = None,
+                    price_scale: Optional[int] = None) -> pd.DataFrame:
+        """Execute query and build a DataFrame from typed columns"""
+        return pd.DataFrame(self.fetch_columns(query, params, price_scale), copy=False)
+
+    def fetch_frames_parallel(self, queries: Sequence[Tuple[str, Optional[tuple]]],
+                              max_workers: Optional[int] = None,
+                              price_scale: Optional[int] = None) -> List[pd.DataFrame]:
+        """Run independent queries concurrently on pooled connections
+
+        Frames come back in the order of queries regardless of which
+        finishes first. Workers default to the pool size so no slice
+        waits on a connection.
+        """
+        workers = min(len(queries), max_workers or self.config.pool_size)
+        if workers <= 1:
+            return [self.fetch_frame(query, params, price_scale) for query, params in queries]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='db-read') as executor:
+            return list(executor.map(
+                lambda qp: self.fetch_frame(qp[0], qp[1], price_scale), queries
+            ))
+
+    @contextmanager
+    def stream(self, query: str, params: Optional[tuple] = None,
+               dictionary: bool = False, raw: bool = False) -> Generator[Any, None, None]:
+        """Execute query on an unbuffered cursor held for the caller"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor(buffered=False, dictionary=dictionary, raw=raw)
+            try:
+                cursor.execute(query, params or ())
+                yield cursor
+            finally:
+                # Rows left unread when the consumer stops early must be
+                # drained before the connection can go back to the pool
+                if conn.unread_result:
+                    conn.consume_results()
+                cursor.close()
+
+    def iter_rows(self, query: str, params: Optional[tuple] = None,
+                  batch_size: int = 1000) -> Iterator[dict]:
+        """Stream result rows as dicts in bounded memory"""
+        with self.stream(query, params, dictionary=True) as cursor:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+    def iter_frames(self, query: str, params: Optional[tuple] = None,
+                    chunk_size: int = 50000, columnar: bool = True,
+                    price_scale: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Stream results as DataFrames of at most chunk_size rows"""
+        with self.stream(query, params, raw=columnar) as cursor:
+            yield from frames_from_cursor(cursor, chunk_size, columnar, price_scale)
+
     def execute_many(self, query: str, params_list: list[tuple]) -> None:
         """Execute batch query with multiple parameter sets"""
         with self.get_connection() as conn:
@@ -62,7 +149,7 @@ class Core:
                 cursor.close()
 
     @contextmanager
-    def transaction(self) -> Generator[PooledMySQLConnection, None, None]:
+    def transaction(self) -> Generator[PooledConnection, None, None]:
         """Transaction context manager"""
         with self.get_connection() as conn:
             try:
@@ -83,10 +170,25 @@ class Core:
             self.logger.error(f"Ping failed: {e}")
             return False
 
+    def pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool occupancy and latency statistics"""
+        return self.pool.get_stats()
+
     def close(self) -> None:
         """Close connection pool"""
         if hasattr(self, 'pool'):
             try:
                 self.pool.close()
             except mysql.connector.Error as e:
-                self.logger.error(f"Error closing pool: {e}")
\ No newline at end of file
+                self.logger.error(f"Error closing pool: {e}")
+
+_shared_cores: Dict[tuple, Core] = {}
+_shared_lock = threading.Lock()
+
+def get_shared_core(config: Config) -> Core:
+    """Get the process-wide Core (and its pool) for a connection target"""
+    key = (config.pool_name, *sorted(config.get_connection_params().items()))
+    with _shared_lock:
+        if key not in _shared_cores:
+            _shared_cores[key] = Core(config)
+        return _shared_cores[key]
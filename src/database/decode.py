@@ -0,0 +1,77 @@
+# src/database/decode.py
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from mysql.connector import FieldType
+
+DECIMAL_TYPES = {FieldType.DECIMAL, FieldType.NEWDECIMAL}
+FLOAT_TYPES = {FieldType.FLOAT, FieldType.DOUBLE}
+INT_TYPES = {
+    FieldType.TINY, FieldType.SHORT, FieldType.INT24,
+    FieldType.LONG, FieldType.LONGLONG, FieldType.YEAR
+}
+DATETIME_TYPES = {FieldType.DATETIME, FieldType.TIMESTAMP, FieldType.DATE}
+
+
+def _to_bytes_array(values: Sequence[Any], null: bytes) -> np.ndarray:
+    """Pack raw column values into a fixed-width bytes array"""
+    if None in values:
+        return np.array([null if v is None else bytes(v) for v in values])
+    # The C extension returns bytes; the pure-Python protocol returns bytearray
+    if isinstance(values[0], bytes):
+        return np.array(values)
+    return np.array(list(map(bytes, values)))
+
+
+def _empty_column(type_code: int, price_scale: Optional[int]) -> np.ndarray:
+    if type_code in DECIMAL_TYPES and price_scale is not None:
+        return np.array([], dtype=np.int64)
+    if type_code in DECIMAL_TYPES or type_code in FLOAT_TYPES:
+        return np.array([], dtype=np.float64)
+    if type_code in INT_TYPES:
+        return np.array([], dtype=np.int64)
+    if type_code in DATETIME_TYPES:
+        return np.array([], dtype='datetime64[ns]')
+    return np.array([], dtype=object)
+
+
+def decode_column(type_code: int, values: Sequence[Any],
+                  price_scale: Optional[int] = None) -> np.ndarray:
+    """Decode one raw (bytes) result column into a typed NumPy array
+
+    DECIMAL columns become float64, or int64 scaled by 10**price_scale when
+    a scale is given. Integer columns holding NULLs fall back to float64
+    with NaN, as do scaled DECIMAL columns.
+    """
+    if type_code in DECIMAL_TYPES or type_code in FLOAT_TYPES:
+        array = _to_bytes_array(values, b'nan').astype(np.float64)
+        if price_scale is not None and type_code in DECIMAL_TYPES \
+                and not np.isnan(array).any():
+            array = np.rint(array * 10 ** price_scale).astype(np.int64)
+        return array
+    if type_code in INT_TYPES:
+        if None in values:
+            return _to_bytes_array(values, b'nan').astype(np.float64)
+        return _to_bytes_array(values, b'').astype(np.int64)
+    if type_code in DATETIME_TYPES:
+        return _to_bytes_array(values, b'NaT').astype('datetime64[ns]')
+    return np.array([None if v is None else bytes(v).decode() for v in values],
+                    dtype=object)
+
+
+def decode_columns(description: Sequence[tuple], rows: List[tuple],
+                   price_scale: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Decode raw cursor rows into a name -> typed column mapping"""
+    if not rows:
+        return {desc[0]: _empty_column(desc[1], price_scale) for desc in description}
+    return {
+        desc[0]: decode_column(desc[1], values, price_scale)
+        for desc, values in zip(description, zip(*rows))
+    }
+
+
+def decode_frame(description: Sequence[tuple], rows: List[tuple],
+                 price_scale: Optional[int] = None) -> pd.DataFrame:
+    """Build a DataFrame straight from typed columns of raw rows"""
+    return pd.DataFrame(decode_columns(description, rows, price_scale), copy=False)
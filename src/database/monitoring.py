@@ -1,5 +1,6 @@
 # src/database/migrations.py
 
+import json
 import logging
 import time
 from datetime import datetime, timedelta
@@ -108,6 +109,26 @@ class Monitoring:
             (name, value, metadata)
         )
 
+    def record_pool_stats(self, stats: Dict) -> None:
+        """Record connection pool occupancy and wait metrics"""
+        metadata = json.dumps({
+            'pool_name': stats['pool_name'],
+            'wait_histogram': stats['wait_histogram']
+        })
+        for name in ('in_use', 'idle', 'waiters', 'timeouts', 'avg_wait',
+                     'max_wait', 'avg_checkout', 'max_checkout'):
+            self.record_metric(f"pool_{name}", stats[name], metadata)
+
+    def record_statement_stats(self, stats: Dict) -> None:
+        """Record statement cache hit rates and estimated parse time saved"""
+        metadata = json.dumps({
+            'table_hits': stats['table_hits'],
+            'table_misses': stats['table_misses']
+        })
+        for name in ('sql_hits', 'sql_misses', 'prepare_hits', 'prepare_misses',
+                     'evictions', 'parse_time_saved'):
+            self.record_metric(f"statements_{name}", stats[name], metadata)
+
     def get_slow_queries(self, 
                         threshold: float = 1.0, 
                         limit: int = 10) -> List[Dict]:
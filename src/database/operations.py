@@ -1,55 +1,122 @@
 # src/database/operations.py
-from typing import Any, List, Dict, Optional
+import time
+from datetime import date, datetime
+from typing import Any, List, Dict, Iterator, Optional, Sequence, Tuple, Union
+import pandas as pd
 from .core import Core
+from .bulk import BulkLoader, BulkLoadStats, upsert_clause
+from .partitions import PARTITIONS_QUERY, partition_bounds, partitions_from_rows, range_slices
+from .statements import StatementCache
+
+def stitch_frames(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate already-ordered slice frames, skipping empty slices"""
+    non_empty = [frame for frame in frames if not frame.empty]
+    if not non_empty:
+        return frames[0] if frames else pd.DataFrame()
+    return pd.concat(non_empty, ignore_index=True)
+
+# Partitions only change on maintenance runs, so bounds are re-read rarely
+BOUNDS_TTL = 3600.0
+
+class BoundsCache:
+    """Per-table partition bounds with a TTL, shared by sync and async reads"""
+
+    def __init__(self, ttl: float = BOUNDS_TTL):
+        self.ttl = ttl
+        self._bounds: Dict[str, Tuple[float, Optional[List[date]]]] = {}
+
+    def get(self, table: str) -> Tuple[bool, Optional[List[date]]]:
+        """(fresh, bounds); bounds None means the table is not partitioned"""
+        cached = self._bounds.get(table)
+        if cached is None or time.monotonic() - cached[0] >= self.ttl:
+            return False, None
+        return True, cached[1]
+
+    def put(self, table: str, rows: Sequence[dict]) -> Optional[List[date]]:
+        bounds = partition_bounds(partitions_from_rows(rows))
+        self._bounds[table] = (time.monotonic(), bounds)
+        return bounds
+
+    def clear(self) -> None:
+        self._bounds.clear()
 
 class Operations:
     def __init__(self, core: Core):
         self.core = core
+        self.bulk = BulkLoader(core, use_infile=core.config.allow_local_infile)
+        self.statements = StatementCache(core.config.statement_cache_size)
+        self.bounds = BoundsCache()
         
     def insert(self, table: str, data: Dict[str, Any]) -> int:
         """Insert single record and return inserted id"""
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join(['%s'] * len(data))
-        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        columns = tuple(data.keys())
+        query = self.statements.sql(('insert', table, columns), lambda: (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})"
+        ))
         
         with self.core.transaction() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, tuple(data.values()))
-            return cursor.lastrowid
+            with self.statements.execute(conn, query, tuple(data.values())) as cursor:
+                return cursor.lastrowid
             
     def insert_many(self, table: str, data: List[Dict[str, Any]]) -> None:
         """Insert multiple records"""
         if not data:
             return
             
-        columns = ', '.join(data[0].keys())
-        placeholders = ', '.join(['%s'] * len(data[0]))
-        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
-        
+        columns = list(data[0].keys())
         values = [tuple(row.values()) for row in data]
-        self.core.execute_many(query, values)
+        self.bulk.load_rows(table, columns, values)
+
+    def bulk_insert(self,
+                    table: str,
+                    data: Union[pd.DataFrame, List[Dict[str, Any]]],
+                    columns: Optional[Sequence[str]] = None) -> BulkLoadStats:
+        """Insert a DataFrame or record list in packet-sized multi-row batches"""
+        if not isinstance(data, pd.DataFrame):
+            data = pd.DataFrame(data)
+        return self.bulk.load_frame(table, data, columns)
+
+    def upsert_many(self,
+                    table: str,
+                    data: Union[pd.DataFrame, List[Dict[str, Any]]],
+                    key_columns: Sequence[str],
+                    policies: Optional[Dict[str, str]] = None,
+                    columns: Optional[Sequence[str]] = None) -> BulkLoadStats:
+        """Batched INSERT ... ON DUPLICATE KEY UPDATE with per-column policies
+
+        Policies map column names to 'keep', 'overwrite', 'max' or 'min';
+        columns without a policy are overwritten.
+        """
+        if not isinstance(data, pd.DataFrame):
+            data = pd.DataFrame(data)
+        columns = list(columns or data.columns)
+        clause = upsert_clause(columns, key_columns, policies)
+        return self.bulk.load_frame(table, data, columns, on_duplicate=clause)
         
     def update(self, table: str, data: Dict[str, Any], where: Dict[str, Any]) -> int:
         """Update records matching criteria"""
-        set_clause = ', '.join(f"{k} = %s" for k in data.keys())
-        where_clause = ' AND '.join(f"{k} = %s" for k in where.keys())
-        query = f"UPDATE {table} SET {set_clause} WHERE {where_clause}"
+        columns, keys = tuple(data.keys()), tuple(where.keys())
+        query = self.statements.sql(('update', table, columns, keys), lambda: (
+            f"UPDATE {table} SET {', '.join(f'{k} = %s' for k in columns)} "
+            f"WHERE {' AND '.join(f'{k} = %s' for k in keys)}"
+        ))
         
         params = (*data.values(), *where.values())
         with self.core.transaction() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            return cursor.rowcount
+            with self.statements.execute(conn, query, params) as cursor:
+                return cursor.rowcount
             
     def delete(self, table: str, where: Dict[str, Any]) -> int:
         """Delete records matching criteria"""
-        where_clause = ' AND '.join(f"{k} = %s" for k in where.keys())
-        query = f"DELETE FROM {table} WHERE {where_clause}"
+        keys = tuple(where.keys())
+        query = self.statements.sql(('delete', table, keys), lambda: (
+            f"DELETE FROM {table} WHERE {' AND '.join(f'{k} = %s' for k in keys)}"
+        ))
         
         with self.core.transaction() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, tuple(where.values()))
-            return cursor.rowcount
+            with self.statements.execute(conn, query, tuple(where.values())) as cursor:
+                return cursor.rowcount
 
     def select_one(self, table: str, where: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
         """Get single record matching criteria"""
@@ -63,35 +130,118 @@ class Operations:
                limit: Optional[int] = None,
                offset: Optional[int] = None) -> List[Dict]:
         """Get records matching criteria with sorting and pagination"""
+        key = ('select', table, tuple(where or ()), order_by, bool(limit), bool(limit and offset))
+        query = self.statements.sql(
+            key, lambda: self._build_select(table, where, order_by, limit, offset)[0]
+        )
+        params = self._select_params(where, limit, offset)
+        return self._fetch_all(query, params)
+
+    def _fetch_all(self, query: str, params: tuple) -> List[Dict]:
+        with self.core.get_connection() as conn:
+            with self.statements.execute(conn, query, params, dictionary=True) as cursor:
+                return cursor.fetchall()
+
+    def iter_select(self,
+                    table: str,
+                    where: Optional[Dict[str, Any]] = None,
+                    order_by: Optional[str] = None,
+                    chunk_size: int = 50000) -> Iterator[pd.DataFrame]:
+        """Stream records matching criteria as DataFrame chunks"""
+        query, params = self._build_select(table, where, order_by)
+        return self.core.iter_frames(query, params, chunk_size)
+
+    def read_range(self,
+                   table: str,
+                   symbol: str,
+                   start: datetime,
+                   end: datetime,
+                   data_type: Optional[str] = None,
+                   granularity: Optional[str] = None,
+                   max_workers: Optional[int] = None,
+                   price_scale: Optional[int] = None) -> pd.DataFrame:
+        """Read one symbol's [start, end] range as parallel partition-aligned slices
+
+        Slices follow the table's real partition bounds unless granularity
+        is given; unpartitioned tables fall back to the configured grid.
+        Each slice is ordered by timestamp and slices are disjoint and
+        ascending, so concatenating them in order needs no final sort.
+        """
+        bounds = None if granularity else self.partition_bounds(table)
+        granularity = granularity or self.core.config.partition_granularity
+        queries = self._range_queries(table, symbol, start, end, data_type, granularity, bounds)
+        if not queries:
+            return pd.DataFrame()
+        frames = self.core.fetch_frames_parallel(queries, max_workers, price_scale)
+        return stitch_frames(frames)
+
+    def partition_bounds(self, table: str) -> Optional[List[date]]:
+        """Cached RANGE partition bounds of table"""
+        fresh, bounds = self.bounds.get(table)
+        if fresh:
+            return bounds
+        return self.bounds.put(table, self.core.execute(PARTITIONS_QUERY, (table,)))
+
+    @staticmethod
+    def _range_queries(table: str, symbol: str, start: datetime, end: datetime,
+                       data_type: Optional[str], granularity: str,
+                       bounds: Optional[Sequence[date]] = None) -> List[Tuple[str, tuple]]:
+        """One (query, params) per slice; only the last slice includes end"""
+        base = f"SELECT * FROM {table} WHERE symbol = %s"
+        params = (symbol,)
+        if data_type:
+            base += " AND data_type = %s"
+            params += (data_type,)
+        slices = range_slices(start, end, granularity, bounds)
+        return [
+            (f"{base} AND timestamp >= %s AND timestamp {'<=' if i == len(slices) - 1 else '<'} %s"
+             " ORDER BY timestamp", params + (lo, hi))
+            for i, (lo, hi) in enumerate(slices)
+        ]
+
+    @staticmethod
+    def _build_select(table: str,
+                      where: Optional[Dict[str, Any]] = None,
+                      order_by: Optional[str] = None,
+                      limit: Optional[int] = None,
+                      offset: Optional[int] = None) -> Tuple[str, tuple]:
         query = f"SELECT * FROM {table}"
-        params = []
 
         if where:
             conditions = ' AND '.join(f"{k} = %s" for k in where.keys())
             query += f" WHERE {conditions}"
-            params.extend(where.values())
 
         if order_by:
             query += f" ORDER BY {order_by}"
 
         if limit:
-            query += f" LIMIT {limit}"
+            query += " LIMIT %s"
             if offset:
-                query += f" OFFSET {offset}"
+                query += " OFFSET %s"
+
+        return query, Operations._select_params(where, limit, offset)
 
-        return self.core.execute(query, tuple(params))
+    @staticmethod
+    def _select_params(where: Optional[Dict[str, Any]] = None,
+                       limit: Optional[int] = None,
+                       offset: Optional[int] = None) -> tuple:
+        params = list(where.values()) if where else []
+        if limit:
+            params.append(limit)
+            if offset:
+                params.append(offset)
+        return tuple(params)
 
     def count(self, table: str, where: Optional[Dict[str, Any]] = None) -> int:
         """Count records matching criteria"""
-        query = f"SELECT COUNT(*) as count FROM {table}"
-        params = []
-
-        if where:
-            conditions = ' AND '.join(f"{k} = %s" for k in where.keys())
-            query += f" WHERE {conditions}"
-            params.extend(where.values())
+        def build() -> str:
+            query = f"SELECT COUNT(*) as count FROM {table}"
+            if where:
+                query += f" WHERE {' AND '.join(f'{k} = %s' for k in where.keys())}"
+            return query
 
-        result = self.core.execute(query, tuple(params))
+        query = self.statements.sql(('count', table, tuple(where or ())), build)
+        result = self._fetch_all(query, self._select_params(where))
         return result[0]['count']
 
     def exists(self, table: str, where: Dict[str, Any]) -> bool:
@@ -0,0 +1,226 @@
+# src/database/partitions.py
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, List, Optional, Sequence, Tuple
+
+from .core import Core
+
+# Hot range read issued by DataManager for stored bars
+MARKET_DATA_RANGE_QUERY = """
+    SELECT * FROM market_data
+    WHERE symbol = %s AND timestamp BETWEEN %s AND %s
+    ORDER BY timestamp
+"""
+
+# A table's RANGE partitions in bound order
+PARTITIONS_QUERY = """
+    SELECT PARTITION_NAME AS name, PARTITION_DESCRIPTION AS bound,
+           TABLE_ROWS AS table_rows
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    ORDER BY PARTITION_ORDINAL_POSITION
+"""
+
+GRANULARITIES = ('month', 'week')
+
+# MySQL TO_DAYS('0001-01-01') is 366 while date(1, 1, 1).toordinal() is 1
+TO_DAYS_OFFSET = 365
+
+
+def to_days(day: date) -> int:
+    """Python equivalent of MySQL TO_DAYS()"""
+    return day.toordinal() + TO_DAYS_OFFSET
+
+
+def from_days(days: int) -> date:
+    """Inverse of MySQL TO_DAYS()"""
+    return date.fromordinal(days - TO_DAYS_OFFSET)
+
+
+def period_start(day: date, granularity: str) -> date:
+    """First day of the month / ISO week containing day"""
+    if granularity == 'month':
+        return day.replace(day=1)
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f"Unknown partition granularity: {granularity}")
+
+
+def next_period(day: date, granularity: str) -> date:
+    """First day of the period following the one starting at day"""
+    if granularity == 'month':
+        return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    return day + timedelta(weeks=1)
+
+
+def range_slices(start: datetime, end: datetime, granularity: str = 'month',
+                 bounds: Optional[Sequence[date]] = None) -> List[Tuple[datetime, datetime]]:
+    """Split [start, end] at partition boundaries into ascending slices
+
+    Cut points come from bounds (e.g. PartitionManager bounds) when given,
+    otherwise from the month / week grid the partitions are created on.
+    Slices are half-open except the last, which keeps end inclusive.
+    """
+    if end < start:
+        return []
+    if bounds is None:
+        cuts = []
+        cut = next_period(period_start(start.date(), granularity), granularity)
+        while datetime.combine(cut, datetime.min.time()) <= end:
+            cuts.append(cut)
+            cut = next_period(cut, granularity)
+    else:
+        cuts = sorted(b for b in bounds if b is not None)
+    points = [datetime.combine(c, datetime.min.time()) for c in cuts]
+    points = [start] + [p for p in points if start < p < end] + [end]
+    return list(zip(points[:-1], points[1:]))
+
+
+@dataclass
+class Partition:
+    """One RANGE partition; bound is None for MAXVALUE"""
+    name: str
+    bound: Optional[date]
+    rows: int = 0
+
+
+def partitions_from_rows(rows: Sequence[dict]) -> List[Partition]:
+    """Partitions from PARTITIONS_QUERY rows; unpartitioned tables give []"""
+    return [
+        Partition(
+            name=row['name'],
+            bound=None if row['bound'] == 'MAXVALUE' else from_days(int(row['bound'])),
+            rows=row['table_rows'] or 0
+        )
+        for row in rows if row['name']
+    ]
+
+
+def partition_bounds(partitions: Sequence[Partition]) -> Optional[List[date]]:
+    """Bounded partition edges for range_slices; None without any"""
+    return [p.bound for p in partitions if p.bound is not None] or None
+
+
+@dataclass
+class PruningReport:
+    """Partitions EXPLAIN says a query touches"""
+    scanned: List[str]
+    total: int
+
+    @property
+    def pruned(self) -> bool:
+        return 0 < len(self.scanned) < self.total
+
+
+class PartitionManager:
+    """Keeps future RANGE (TO_DAYS(timestamp)) partitions ahead of the data
+
+    New data otherwise lands in the MAXVALUE catch-all partition, which
+    grows without bound and defeats pruning. ensure_future_partitions()
+    splits the catch-all so that `ahead` whole periods beyond the current
+    one always have their own partition.
+    """
+
+    def __init__(self, core: Core, table: str = 'market_data',
+                 granularity: str = 'month', ahead: int = 3,
+                 future_partition: str = 'p_future'):
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown partition granularity: {granularity}")
+        self.core = core
+        self.table = table
+        self.granularity = granularity
+        self.ahead = ahead
+        self.future_partition = future_partition
+        self.logger = logging.getLogger(__name__)
+
+    def get_partitions(self) -> List[Partition]:
+        """Current partitions in bound order"""
+        return partitions_from_rows(self.core.execute(PARTITIONS_QUERY, (self.table,)))
+
+    def plan(self, partitions: Sequence[Partition],
+             today: Optional[date] = None) -> List[Partition]:
+        """Partitions to split off the catch-all to stay `ahead` periods ahead"""
+        today = today or date.today()
+        bounds = [p.bound for p in partitions if p.bound is not None]
+        if not bounds:
+            raise ValueError(f"{self.table} has no bounded RANGE partitions")
+        names = {p.name for p in partitions}
+
+        target = period_start(today, self.granularity)
+        for _ in range(self.ahead + 1):
+            target = next_period(target, self.granularity)
+
+        planned = []
+        last = max(bounds)
+        start = period_start(last, self.granularity)
+        while last < target:
+            # Partitions are named after the first day they hold
+            name = self._name(start if start >= last else last)
+            bound = next_period(start, self.granularity)
+            if name in names:
+                raise ValueError(f"Partition {name} already exists in {self.table}")
+            planned.append(Partition(name=name, bound=bound))
+            last = start = bound
+        return planned
+
+    def ensure_future_partitions(self, today: Optional[date] = None) -> List[str]:
+        """Split the catch-all partition ahead of time; returns new partition names"""
+        partitions = self.get_partitions()
+        if not partitions or partitions[-1].bound is not None \
+                or partitions[-1].name != self.future_partition:
+            raise ValueError(
+                f"{self.table} has no {self.future_partition} MAXVALUE partition"
+            )
+        planned = self.plan(partitions, today)
+        if not planned:
+            return []
+        if partitions[-1].rows:
+            self.logger.warning(
+                f"{self.future_partition} holds ~{partitions[-1].rows} rows; "
+                f"splitting will copy them"
+            )
+
+        definitions = ',\n'.join(
+            f"PARTITION {p.name} VALUES LESS THAN ({to_days(p.bound)})" for p in planned
+        )
+        with self.core.transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    f"ALTER TABLE {self.table} REORGANIZE PARTITION {self.future_partition} INTO (\n"
+                    f"{definitions},\n"
+                    f"PARTITION {self.future_partition} VALUES LESS THAN MAXVALUE)"
+                )
+            finally:
+                cursor.close()
+
+        names = [p.name for p in planned]
+        self.logger.info(f"Added partitions {', '.join(names)} to {self.table}")
+        return names
+
+    def explain(self, query: str, params: Optional[tuple] = None) -> PruningReport:
+        """Partitions the optimizer will read for query"""
+        plan = self.core.execute(f"EXPLAIN {query}", params)
+        scanned = []
+        for row in plan:
+            if row.get('table') in (self.table, None) and row.get('partitions'):
+                scanned.extend(row['partitions'].split(','))
+        return PruningReport(scanned=scanned, total=len(self.get_partitions()))
+
+    def verify_pruning(self, symbol: str = 'AAPL',
+                       start: Optional[datetime] = None,
+                       end: Optional[datetime] = None) -> PruningReport:
+        """Check the hot DataManager range read only touches its own partitions"""
+        end = end or datetime.now()
+        start = start or end - timedelta(days=7)
+        report = self.explain(MARKET_DATA_RANGE_QUERY, (symbol, start, end))
+        if not report.pruned:
+            self.logger.warning(
+                f"Range query on {self.table} scans {len(report.scanned)} of "
+                f"{report.total} partitions: {', '.join(report.scanned)}"
+            )
+        return report
+
+    def _name(self, day: date) -> str:
+        return f"p{day:%Y%m}" if self.granularity == 'month' else f"p{day:%Y%m%d}"
@@ -0,0 +1,469 @@
+# src/database/pool.py
+import asyncio
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import mysql.connector
+import mysql.connector.aio
+from mysql.connector.errors import PoolError
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection becomes available within the wait timeout"""
+    pass
+
+
+@dataclass
+class PoolStats:
+    """Running counters for a ConnectionPool"""
+    checkouts: int = 0
+    timeouts: int = 0
+    created: int = 0
+    discarded: int = 0
+    reaped: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    checkout_total: float = 0.0
+    checkout_max: float = 0.0
+    wait_histogram: List[int] = field(default_factory=lambda: [0] * (len(WAIT_BUCKETS) + 1))
+
+    def record_wait(self, seconds: float) -> None:
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+        self.wait_histogram[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+
+    def record_checkout(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.checkout_total += seconds
+        self.checkout_max = max(self.checkout_max, seconds)
+
+
+def _snapshot(pool: Any) -> Dict[str, Any]:
+    """Stats dict shared by the sync and async pools"""
+    stats = pool.stats
+    checkouts = stats.checkouts or 1
+    return {
+        'pool_name': pool.pool_name,
+        'size': pool._size,
+        'in_use': pool._in_use,
+        'idle': len(pool._idle),
+        'waiters': pool._waiters,
+        'min_size': pool.min_size,
+        'max_size': pool.max_size,
+        'checkouts': stats.checkouts,
+        'timeouts': stats.timeouts,
+        'created': stats.created,
+        'discarded': stats.discarded,
+        'reaped': stats.reaped,
+        'avg_wait': stats.wait_total / checkouts,
+        'max_wait': stats.wait_max,
+        'avg_checkout': stats.checkout_total / checkouts,
+        'max_checkout': stats.checkout_max,
+        'wait_histogram': dict(zip(
+            [f"<={b}s" for b in WAIT_BUCKETS] + [f">{WAIT_BUCKETS[-1]}s"],
+            stats.wait_histogram
+        ))
+    }
+
+
+class PooledConnection:
+    """Connection proxy that returns itself to the pool on close()"""
+
+    def __init__(self, pool: 'ConnectionPool', cnx: Any):
+        self._pool = pool
+        self._cnx = cnx
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cnx, name)
+
+    @property
+    def raw_connection(self) -> Any:
+        """Underlying driver connection, stable across checkouts"""
+        return self._cnx
+
+    def __enter__(self) -> 'PooledConnection':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        cnx, self._cnx = self._cnx, None
+        if cnx is not None:
+            self._pool._release(cnx)
+
+
+class ConnectionPool:
+    """Elastic MySQL connection pool with bounded waits
+
+    Keeps between min_size and max_size connections. Checkouts block up to
+    timeout seconds when every connection is busy, connections idle longer
+    than idle_timeout are closed down to min_size, and idle connections are
+    pinged before being handed out when pre_ping is set.
+    """
+
+    def __init__(self,
+                 connect_params: Dict[str, Any],
+                 min_size: int = 1,
+                 max_size: int = 5,
+                 timeout: float = 30.0,
+                 idle_timeout: float = 300.0,
+                 pre_ping: bool = True,
+                 pool_name: str = 'database_pool',
+                 connect: Optional[Callable[..., Any]] = None):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+        self.connect_params = connect_params
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.pre_ping = pre_ping
+        self.pool_name = pool_name
+        self._connect = connect or mysql.connector.connect
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Condition()
+        self._idle: Deque[tuple] = deque()  # (connection, released_at)
+        self._size = 0
+        self._in_use = 0
+        self._waiters = 0
+        self._closed = False
+        self.stats = PoolStats()
+
+        for _ in range(min_size):
+            self._idle.append((self._new_connection(), time.monotonic()))
+
+    def _new_connection(self) -> Any:
+        cnx = self._connect(**self.connect_params)
+        with self._lock:
+            self._size += 1
+            self.stats.created += 1
+        return cnx
+
+    def get_connection(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Check out a connection, waiting up to timeout when exhausted"""
+        start = time.monotonic()
+        deadline = start + (self.timeout if timeout is None else timeout)
+        waited = False
+
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise PoolError(f"Pool {self.pool_name} is closed")
+                if self._idle:
+                    cnx, _ = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._size < self.max_size:
+                    # Reserve the slot before connecting outside the lock
+                    self._size += 1
+                    self._in_use += 1
+                    cnx = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats.timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No connection available in {self.pool_name} "
+                        f"after {time.monotonic() - start:.2f}s"
+                    )
+                waited = True
+                self._waiters += 1
+                try:
+                    self._lock.wait(remaining)
+                finally:
+                    self._waiters -= 1
+            self.stats.record_wait(time.monotonic() - start if waited else 0.0)
+
+        try:
+            if cnx is None:
+                cnx = self._connect(**self.connect_params)
+                with self._lock:
+                    self.stats.created += 1
+            elif self.pre_ping and not self._is_alive(cnx):
+                self._discard(cnx, reserve=True)
+                cnx = self._connect(**self.connect_params)
+                with self._lock:
+                    self.stats.created += 1
+        except Exception:
+            with self._lock:
+                self._size -= 1
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self.stats.record_checkout(time.monotonic() - start)
+        return PooledConnection(self, cnx)
+
+    def _is_alive(self, cnx: Any) -> bool:
+        try:
+            cnx.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, cnx: Any, reserve: bool = False) -> None:
+        """Close a connection; with reserve its pool slot stays taken"""
+        try:
+            cnx.close()
+        except Exception as e:
+            self.logger.debug(f"Error closing discarded connection: {e}")
+        with self._lock:
+            self.stats.discarded += 1
+            if not reserve:
+                self._size -= 1
+
+    def _release(self, cnx: Any) -> None:
+        try:
+            if getattr(cnx, 'unread_result', False):
+                cnx.consume_results()
+            cnx.rollback()
+        except Exception:
+            self._discard(cnx)
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            return
+
+        with self._lock:
+            self._in_use -= 1
+            if self._closed:
+                self._size -= 1
+                cnx.close()
+            else:
+                self._idle.append((cnx, time.monotonic()))
+            self._lock.notify()
+        self.reap_idle()
+
+    def reap_idle(self) -> int:
+        """Close connections idle longer than idle_timeout, keeping min_size"""
+        cutoff = time.monotonic() - self.idle_timeout
+        reaped = []
+        with self._lock:
+            # The oldest releases sit at the left end of the deque
+            while (self._idle and self._idle[0][1] < cutoff
+                   and self._size - len(reaped) > self.min_size):
+                reaped.append(self._idle.popleft()[0])
+            self.stats.reaped += len(reaped)
+        for cnx in reaped:
+            self._discard(cnx)
+        return len(reaped)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of pool occupancy and latency counters"""
+        with self._lock:
+            return _snapshot(self)
+
+    def close(self) -> None:
+        """Close idle connections; busy ones are closed when released"""
+        with self._lock:
+            self._closed = True
+            idle = [cnx for cnx, _ in self._idle]
+            self._idle.clear()
+            self._lock.notify_all()
+        for cnx in idle:
+            self._discard(cnx)
+
+
+class AsyncPooledConnection:
+    """Async connection proxy that returns itself to the pool on close()"""
+
+    def __init__(self, pool: 'AsyncConnectionPool', cnx: Any):
+        self._pool = pool
+        self._cnx = cnx
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cnx, name)
+
+    async def __aenter__(self) -> 'AsyncPooledConnection':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        cnx, self._cnx = self._cnx, None
+        if cnx is not None:
+            await self._pool._release(cnx)
+
+
+class AsyncConnectionPool:
+    """asyncio counterpart of ConnectionPool over mysql.connector.aio
+
+    Sizing, bounded waits, idle reaping and pre-ping behave as in
+    ConnectionPool. Connections are opened lazily because the pool is
+    usually built outside the event loop; open() pre-fills min_size.
+    """
+
+    def __init__(self,
+                 connect_params: Dict[str, Any],
+                 min_size: int = 1,
+                 max_size: int = 5,
+                 timeout: float = 30.0,
+                 idle_timeout: float = 300.0,
+                 pre_ping: bool = True,
+                 pool_name: str = 'database_pool',
+                 connect: Optional[Callable[..., Any]] = None):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+        self.connect_params = connect_params
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.pre_ping = pre_ping
+        self.pool_name = pool_name
+        self._connect = connect or mysql.connector.aio.connect
+        self.logger = logging.getLogger(__name__)
+
+        self._cond = asyncio.Condition()
+        self._idle: Deque[tuple] = deque()  # (connection, released_at)
+        self._size = 0
+        self._in_use = 0
+        self._waiters = 0
+        self._closed = False
+        self.stats = PoolStats()
+
+    async def open(self) -> None:
+        """Open connections up to min_size"""
+        while self._size < self.min_size:
+            self._size += 1
+            try:
+                cnx = await self._connect(**self.connect_params)
+            except Exception:
+                self._size -= 1
+                raise
+            self.stats.created += 1
+            self._idle.append((cnx, time.monotonic()))
+
+    async def get_connection(self, timeout: Optional[float] = None) -> AsyncPooledConnection:
+        """Check out a connection, waiting up to timeout when exhausted"""
+        start = time.monotonic()
+        deadline = start + (self.timeout if timeout is None else timeout)
+        waited = False
+
+        async with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolError(f"Pool {self.pool_name} is closed")
+                if self._idle:
+                    cnx, _ = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._size < self.max_size:
+                    # Reserve the slot before connecting outside the lock
+                    self._size += 1
+                    self._in_use += 1
+                    cnx = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats.timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No connection available in {self.pool_name} "
+                        f"after {time.monotonic() - start:.2f}s"
+                    )
+                waited = True
+                self._waiters += 1
+                try:
+                    await asyncio.wait_for(self._cond.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    self._waiters -= 1
+            self.stats.record_wait(time.monotonic() - start if waited else 0.0)
+
+        try:
+            if cnx is None:
+                cnx = await self._connect(**self.connect_params)
+                self.stats.created += 1
+            elif self.pre_ping and not await self._is_alive(cnx):
+                await self._discard(cnx, reserve=True)
+                cnx = await self._connect(**self.connect_params)
+                self.stats.created += 1
+        except Exception:
+            self._size -= 1
+            self._in_use -= 1
+            await self._notify()
+            raise
+
+        self.stats.record_checkout(time.monotonic() - start)
+        return AsyncPooledConnection(self, cnx)
+
+    async def _is_alive(self, cnx: Any) -> bool:
+        try:
+            await cnx.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    async def _discard(self, cnx: Any, reserve: bool = False) -> None:
+        """Close a connection; with reserve its pool slot stays taken"""
+        try:
+            await cnx.close()
+        except Exception as e:
+            self.logger.debug(f"Error closing discarded connection: {e}")
+        self.stats.discarded += 1
+        if not reserve:
+            self._size -= 1
+
+    async def _notify(self) -> None:
+        async with self._cond:
+            self._cond.notify()
+
+    async def _release(self, cnx: Any) -> None:
+        try:
+            if getattr(cnx, 'unread_result', False):
+                await cnx.consume_results()
+            await cnx.rollback()
+        except Exception:
+            await self._discard(cnx)
+            self._in_use -= 1
+            await self._notify()
+            return
+
+        self._in_use -= 1
+        if self._closed:
+            self._size -= 1
+            await cnx.close()
+        else:
+            self._idle.append((cnx, time.monotonic()))
+        await self._notify()
+        await self.reap_idle()
+
+    async def reap_idle(self) -> int:
+        """Close connections idle longer than idle_timeout, keeping min_size"""
+        cutoff = time.monotonic() - self.idle_timeout
+        reaped = []
+        # The oldest releases sit at the left end of the deque
+        while (self._idle and self._idle[0][1] < cutoff
+               and self._size - len(reaped) > self.min_size):
+            reaped.append(self._idle.popleft()[0])
+        self.stats.reaped += len(reaped)
+        for cnx in reaped:
+            await self._discard(cnx)
+        return len(reaped)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of pool occupancy and latency counters"""
+        return _snapshot(self)
+
+    async def close(self) -> None:
+        """Close idle connections; busy ones are closed when released"""
+        async with self._cond:
+            self._closed = True
+            idle = [cnx for cnx, _ in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        for cnx in idle:
+            await self._discard(cnx)
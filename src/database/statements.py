@@ -0,0 +1,158 @@
+# src/database/statements.py
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generator, Hashable, Optional, Sequence
+
+
+@dataclass
+class StatementStats:
+    """Hit/miss counters for a StatementCache"""
+    sql_hits: int = 0
+    sql_misses: int = 0
+    prepare_hits: int = 0
+    prepare_misses: int = 0
+    evictions: int = 0
+    # Execute latency with and without a server-side prepare round trip
+    prepare_time: float = 0.0
+    reuse_time: float = 0.0
+    table_hits: Counter = field(default_factory=Counter)
+    table_misses: Counter = field(default_factory=Counter)
+
+    @property
+    def parse_time_saved(self) -> float:
+        """Estimated seconds saved by executing already-prepared statements"""
+        if not self.prepare_misses or not self.prepare_hits:
+            return 0.0
+        per_call = (self.prepare_time / self.prepare_misses
+                    - self.reuse_time / self.prepare_hits)
+        return max(0.0, per_call) * self.prepare_hits
+
+
+class StatementCache:
+    """LRU cache of generated SQL and server-side prepared statements
+
+    SQL text is cached by a (operation, table, columns...) key so hot
+    lookups skip string building. Each pooled connection additionally
+    keeps up to max_size prepared cursors keyed by SQL text; the connector
+    only re-prepares when handed a different string, so reusing the cached
+    string object executes the server-side statement directly. A
+    max_size of 0 disables both caches.
+    """
+
+    def __init__(self, max_size: int = 128):
+        self.max_size = max_size
+        self.stats = StatementStats()
+        self._sql: 'OrderedDict[Hashable, str]' = OrderedDict()
+        self._prepared: 'weakref.WeakKeyDictionary[Any, OrderedDict]' = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def sql(self, key: Sequence[Hashable], build: Callable[[], str]) -> str:
+        """Return the SQL for key, building it on a miss"""
+        if not self.enabled:
+            return build()
+        key = tuple(key)
+        with self._lock:
+            query = self._sql.get(key)
+            if query is not None:
+                self._sql.move_to_end(key)
+                self.stats.sql_hits += 1
+                self.stats.table_hits[key[1]] += 1
+                return query
+        query = build()
+        with self._lock:
+            self.stats.sql_misses += 1
+            self.stats.table_misses[key[1]] += 1
+            self._sql[key] = query
+            if len(self._sql) > self.max_size:
+                self._sql.popitem(last=False)
+        return query
+
+    @contextmanager
+    def execute(self, conn: Any, query: str, params: Optional[Sequence] = None,
+                dictionary: bool = False) -> Generator[Any, None, None]:
+        """Execute query on a prepared cursor cached for conn
+
+        The cursor stays open for reuse, so callers must fetch every row
+        before leaving the block.
+        """
+        if not self.enabled:
+            cursor = conn.cursor(dictionary=dictionary)
+            try:
+                cursor.execute(query, params or ())
+                yield cursor
+            finally:
+                cursor.close()
+            return
+
+        cursor, prepared = self._cursor(conn, query, dictionary)
+        start = time.perf_counter()
+        try:
+            cursor.execute(query, params or ())
+        except Exception:
+            self._evict(conn, (query, dictionary))
+            raise
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            if prepared:
+                self.stats.prepare_hits += 1
+                self.stats.reuse_time += elapsed
+            else:
+                self.stats.prepare_misses += 1
+                self.stats.prepare_time += elapsed
+        yield cursor
+
+    def _cursor(self, conn: Any, query: str, dictionary: bool) -> tuple:
+        """Return (cursor, already_prepared) for query on conn"""
+        raw = getattr(conn, 'raw_connection', conn)
+        key = (query, dictionary)
+        with self._lock:
+            cursors = self._prepared.setdefault(raw, OrderedDict())
+            cursor = cursors.get(key)
+            if cursor is not None:
+                cursors.move_to_end(key)
+                return cursor, True
+        cursor = conn.cursor(prepared=True, dictionary=dictionary)
+        with self._lock:
+            cursors[key] = cursor
+            evicted = cursors.popitem(last=False)[1] if len(cursors) > self.max_size else None
+            if evicted is not None:
+                self.stats.evictions += 1
+        if evicted is not None:
+            # Closing a prepared cursor deallocates the server-side statement
+            evicted.close()
+        return cursor, False
+
+    def _evict(self, conn: Any, key: tuple) -> None:
+        raw = getattr(conn, 'raw_connection', conn)
+        with self._lock:
+            cursor = self._prepared.get(raw, {}).pop(key, None)
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of statement cache counters"""
+        with self._lock:
+            stats = self.stats
+            return {
+                'size': len(self._sql),
+                'max_size': self.max_size,
+                'sql_hits': stats.sql_hits,
+                'sql_misses': stats.sql_misses,
+                'prepare_hits': stats.prepare_hits,
+                'prepare_misses': stats.prepare_misses,
+                'evictions': stats.evictions,
+                'parse_time_saved': stats.parse_time_saved,
+                'table_hits': dict(stats.table_hits),
+                'table_misses': dict(stats.table_misses)
+            }
@@ -1,60 +1,115 @@
 # src/database_client.py
 import mysql.connector
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional, Sequence
 import logging
 from datetime import datetime
 import pandas as pd
 
 # If importing from database_config.py (same directory level)
 from .database_config import DatabaseConfig
+from .database.config import Config
+from .cache.events import ChangeEvent, market_data_changes
+from .database.core import Core, get_shared_core
+from .database.bulk import (
+    BulkLoader, BulkLoadStats, MARKET_DATA_KEY, MARKET_DATA_CONFLICT_POLICIES,
+    market_data_frame, upsert_clause
+)
 
 
 class DatabaseClient:
-    def __init__(self, config: Dict[str, Any]):
-        self.config = config
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
         self.logger = logging.getLogger(__name__)
         self.connection = None
         self.cursor = None
+        self.bulk_loader = BulkLoader()
+        self._core = None
+
+    @property
+    def core(self) -> Core:
+        """Pooled Core shared by every client targeting the same database"""
+        if self._core is None:
+            self._core = get_shared_core(Config.from_mapping(self.config))
+        return self._core
 
     def connect(self):
-        """Establish database connection"""
+        """Check out a pooled connection for legacy callers"""
         try:
-            self.connection = mysql.connector.connect(**self.connection_params)
+            self.connection = self.core.pool.get_connection()
             self.cursor = self.connection.cursor()
         except mysql.connector.Error as e:
             raise Exception(f"Database connection failed: {e}")
 
     def disconnect(self):
-        """Close database connection"""
+        """Return the checked out connection to the pool"""
         if self.cursor:
             self.cursor.close()
+            self.cursor = None
         if self.connection:
             self.connection.close()
+            self.connection = None
 
-    def fetch_data(self) -> pd.DataFrame:
+    def fetch_data(self, chunk_size: int = 50000) -> pd.DataFrame:
         """Fetch data from database with error handling"""
+        frames = list(self.iter_frames("SELECT * FROM market_data", chunk_size=chunk_size))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def iter_frames(self, query: str, params: tuple = None,
+                    chunk_size: int = 50000, columnar: bool = True,
+                    price_scale: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Stream query results as DataFrame chunks over an unbuffered cursor"""
         try:
-            self.connect()
-            self.cursor.execute(
-                "SELECT * FROM market_data"
-            )  # Replace with your table name
-            columns = [desc[0] for desc in self.cursor.description]
-            data = self.cursor.fetchall()
-            return pd.DataFrame(data, columns=columns)
+            yield from self.core.iter_frames(query, params, chunk_size, columnar, price_scale)
         except Exception as e:
             raise Exception(f"Error fetching data: {e}")
-        finally:
-            self.disconnect()
+
+    def export_data(self, path: str, query: str = "SELECT * FROM market_data",
+                    params: tuple = None, chunk_size: int = 50000) -> int:
+        """Export query results to CSV chunk by chunk, returning the row count"""
+        rows = 0
+        for i, frame in enumerate(self.iter_frames(query, params, chunk_size)):
+            frame.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+            rows += len(frame)
+        self.logger.info(f"Exported {rows} rows to {path}")
+        return rows
 
     def execute_query(self, query: str, params: tuple = None) -> None:
         """Execute database query with error handling"""
         try:
-            self.connect()
-            self.cursor.execute(query, params)
-            self.connection.commit()
+            with self.core.transaction() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(query, params)
+                finally:
+                    cursor.close()
         except Exception as e:
-            if self.connection:
-                self.connection.rollback()
             raise Exception(f"Query execution failed: {e}")
-        finally:
-            self.disconnect()
+
+    def bulk_insert(self, table: str, data: pd.DataFrame,
+                    columns: Optional[Sequence[str]] = None,
+                    on_duplicate: str = '') -> BulkLoadStats:
+        """Insert DataFrame in multi-row batches over one connection"""
+        try:
+            with self.core.transaction() as conn:
+                cursor = conn.cursor()
+                try:
+                    return self.bulk_loader.load_frame(table, data, columns, cursor=cursor,
+                                                       on_duplicate=on_duplicate)
+                finally:
+                    cursor.close()
+        except Exception as e:
+            raise Exception(f"Bulk insert failed: {e}")
+
+    def store_market_data(self, symbol: str, data: pd.DataFrame,
+                          data_type: str = 'STOCK',
+                          timeframe: Optional[str] = None) -> BulkLoadStats:
+        """Upsert OHLCV bars for symbol into market_data
+
+        Publishes a ChangeEvent so caches patch (when timeframe is given)
+        or invalidate the written range.
+        """
+        frame = market_data_frame(data, symbol, data_type)
+        clause = upsert_clause(frame.columns, MARKET_DATA_KEY, MARKET_DATA_CONFLICT_POLICIES)
+        stats = self.bulk_insert('market_data', frame, on_duplicate=clause)
+        market_data_changes.publish(ChangeEvent.from_frame(symbol, frame, timeframe))
+        return stats
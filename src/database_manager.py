@@ -71,13 +71,16 @@ import hashlib
 import json
 from datetime import datetime, timedelta
 import subprocess
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import List, Dict, Any, Optional, Callable
 from pathlib import Path
 import argparse
 import time
 from functools import wraps
 
+from .database.config import Config
+from .database.core import Core, get_shared_core
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,  # Default to INFO level; can be configured externally
@@ -95,6 +98,13 @@ class DBConfig:
     port: int = 3306
 
 
+@dataclass
+class SchemaConfig:
+    version: str = "1.0.0"
+    migrations_dir: str = "db/migrations"
+    backup_dir: str = "db/backups"
+
+
 @dataclass
 class TradeData:
     user_id: int
@@ -149,23 +159,31 @@ class DatabaseManager:
         self.schema_config = SchemaConfig()
         self.connection = None
         self.cursor = None
+        self._core = None
 
-    def _load_config(self) -> Dict[str, Any]:
+    def _load_config(self) -> DBConfig:
         """Load database configuration from environment"""
-        config = {
-            'host': os.getenv('DB_HOST', 'localhost'),
-            'user': os.getenv('DB_USER', 'trading_user'),
-            'password': os.getenv('DB_PASSWORD', ''),
-            'database': os.getenv('DB_DATABASE', 'trading_data'),
-            'port': int(os.getenv('DB_PORT', 3306))
-        }
-        self.logger.info(f"Loaded config for database: {config['database']}")
+        config = DBConfig(
+            host=os.getenv('DB_HOST', 'localhost'),
+            user=os.getenv('DB_USER', 'trading_user'),
+            password=os.getenv('DB_PASSWORD', ''),
+            database=os.getenv('DB_DATABASE', 'trading_data'),
+            port=int(os.getenv('DB_PORT', 3306))
+        )
+        self.logger.info(f"Loaded config for database: {config.database}")
         return config
 
+    @property
+    def core(self) -> Core:
+        """Pooled Core shared by every manager targeting the same database"""
+        if self._core is None:
+            self._core = get_shared_core(Config(**asdict(self.db_config)))
+        return self._core
+
     def get_connection(self):
-        """Get a new database connection"""
+        """Check out a pooled connection; returned to the pool on exit"""
         try:
-            return mysql.connector.connect(**self.db_config)
+            return self.core.get_connection()
         except mysql.connector.Error as err:
             self.logger.error(f"Failed to get connection: {err}")
             raise
@@ -173,7 +191,7 @@ class DatabaseManager:
     def connect(self) -> None:
         """Establish database connection"""
         try:
-            self.connection = mysql.connector.connect(**self.db_config)
+            self.connection = self.core.pool.get_connection()
             self.cursor = self.connection.cursor(dictionary=True)
             self.logger.info("Database connection established")
         except mysql.connector.Error as err:
@@ -184,9 +202,10 @@ class DatabaseManager:
         """Close database connection"""
         if self.cursor:
             self.cursor.close()
-        if self.connection and self.connection.is_connected():
+        if self.connection:
             self.connection.close()
-            self.logger.info("Database connection closed")
+            self.connection = None
+            self.logger.info("Database connection returned to pool")
 
     def __enter__(self):
         """Context manager enter"""
@@ -226,10 +245,10 @@ class DatabaseManager:
                 with open(backup_file, 'w') as outfile:
                     subprocess.run([
                         'mysqldump',
-                        f"--host={self.db_config['host']}",
-                        f"--user={self.db_config['user']}",
-                        f"--password={self.db_config['password']}",
-                        self.db_config['database']
+                        f"--host={self.db_config.host}",
+                        f"--user={self.db_config.user}",
+                        f"--password={self.db_config.password}",
+                        self.db_config.database
                     ], stdout=outfile, stderr=subprocess.PIPE, check=True)
                 pbar.update(100)
 
@@ -273,7 +292,7 @@ class DatabaseManager:
             return False
 
         try:
-            with mysql.connector.connect(**self.db_config) as conn:
+            with self.get_connection() as conn:
                 with conn.cursor() as cursor:
                     self.drop_all_tables(cursor)
                     success = self.apply_schema(cursor)
@@ -623,7 +642,7 @@ class DatabaseManager:
     def verify_schema(self) -> bool:
         """Verify database schema matches expected structure"""
         try:
-            with mysql.connector.connect(**self.db_config) as conn:
+            with self.get_connection() as conn:
                 with conn.cursor() as cursor:
                     # Check schema version
                     version = self.get_current_schema_version(cursor)
@@ -647,166 +666,10 @@ class DatabaseManager:
             logger.error(f"Schema verification failed: {e}")
             return False
 
-
-def parse_args():
-    """Parse command line arguments"""
-    parser = argparse.ArgumentParser(
-        description="Database Schema Management Tool",
-        formatter_class=argparse.RawTextHelpFormatter
-    )
-    
-    parser.add_argument(
-        '--format',
-        action='store_true',
-        help='Drop all tables and recreate schema'
-    )
-    
-    parser.add_argument(
-        '--force',
-        action='store_true',
-        help='Skip confirmation prompt when formatting'
-    )
-    
-    parser.add_argument(
-        '--backup',
-        action='store_true',
-        help='Create backup before formatting'
-    )
-    
-    parser.add_argument(
-        '--populate',
-        action='store_true',
-        help='Add test data after formatting'
-    )
-    
-    parser.add_argument(
-        '--version',
-        action='version',
-        version=f'Schema Version: {DatabaseManager.SCHEMA_VERSION}'
-    )
-    
-    return parser.parse_args()
-
-def main():
-    """Main entry point for CLI"""
-    args = parse_args()
-    manager = DatabaseManager()
-    success = True
-    
-    try:
-        # Create backup if requested
-        if args.backup:
-            if not manager.backup_database():
-                return 1
-        
-        # Format database if requested
-        if args.format:
-            if not manager.format_database(
-                force=args.force,
-                populate=args.populate
-            ):
-                return 1
-        
-        # Apply any pending migrations
-        if not args.format:
-            if not manager.apply_migrations():
-                return 1
-                
-        return 0
-        
-    except Exception as e:
-        logging.error(f"Error: {e}")
-        return 1
-
-if __name__ == "__main__":
-    sys.exit(main())
-
-import mysql.connector
-import logging
-import os
-from datetime import datetime
-from pathlib import Path
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
-import json
-import sys
-from dotenv import load_dotenv
-
-@dataclass
-class SchemaConfig:
-    version: str = "1.0.0"
-    migrations_dir: str = "db/migrations"
-    backup_dir: str = "db/backups"
-
-class DatabaseManager:
-    def __init__(self):
-        """Initialize DatabaseManager with config and logging"""
-        load_dotenv()
-        self.logger = logging.getLogger(__name__)
-        self.db_config = self._load_config()
-        self.schema_config = SchemaConfig()
-        self.connection = None
-        self.cursor = None
-
-    def _load_config(self) -> Dict[str, Any]:
-        """Load database configuration from environment"""
-        config = {
-            'host': os.getenv('DB_HOST', 'localhost'),
-            'user': os.getenv('DB_USER', 'trading_user'),
-            'password': os.getenv('DB_PASSWORD', ''),
-            'database': os.getenv('DB_DATABASE', 'trading_data'),
-            'port': int(os.getenv('DB_PORT', 3306))
-        }
-        self.logger.info(f"Loaded config for database: {config['database']}")
-        return config
-
-    def connect(self) -> None:
-        """Establish database connection"""
-        try:
-            self.connection = mysql.connector.connect(**self.db_config)
-            self.cursor = self.connection.cursor(dictionary=True)
-            self.logger.info("Database connection established")
-        except mysql.connector.Error as err:
-            self.logger.error(f"Connection failed: {err}")
-            raise
-
-    def disconnect(self) -> None:
-        """Close database connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            self.logger.info("Database connection closed")
-
-    def __enter__(self):
-        """Context manager enter"""
-        self.connect()
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit"""
-        self.disconnect()
-        if exc_type:
-            self.logger.error(f"Error during database operation: {exc_val}")
-            return False
-        return True
-
-    def reconnect(self, max_retries: int = 3, delay: float = 1.0) -> None:
-        """Attempt to reconnect with retries"""
-        for attempt in range(max_retries):
-            try:
-                self.disconnect()
-                self.connect()
-                return
-            except mysql.connector.Error as err:
-                self.logger.warning(f"Reconnect attempt {attempt + 1} failed: {err}")
-                time.sleep(delay)
-        raise mysql.connector.Error("Max reconnection attempts reached")
-
     def initialize_schema(self) -> bool:
         """Initialize database schema"""
         try:
-            with mysql.connector.connect(**self.db_config) as conn:
+            with self.get_connection() as conn:
                 with conn.cursor() as cursor:
                     # Create version tracking table
                     cursor.execute("""
@@ -843,7 +706,7 @@ class DatabaseManager:
     def get_current_version(self) -> str:
         """Get current schema version"""
         try:
-            with mysql.connector.connect(**self.db_config) as conn:
+            with self.get_connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute("""
                         SELECT version FROM schema_versions 
@@ -860,7 +723,7 @@ class DatabaseManager:
         migrations_dir = Path(self.schema_config.migrations_dir)
         
         try:
-            with mysql.connector.connect(**self.db_config) as conn:
+            with self.get_connection() as conn:
                 with conn.cursor() as cursor:
                     for migration in sorted(migrations_dir.glob("V*__*.sql")):
                         version = migration.name.split('__')[0][1:].replace('_', '.')
@@ -878,19 +741,76 @@ class DatabaseManager:
             self.logger.error(f"Migration failed: {err}")
             return False
 
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Database Schema Management Tool",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    
+    parser.add_argument(
+        '--format',
+        action='store_true',
+        help='Drop all tables and recreate schema'
+    )
+    
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Skip confirmation prompt when formatting'
+    )
+    
+    parser.add_argument(
+        '--backup',
+        action='store_true',
+        help='Create backup before formatting'
+    )
+    
+    parser.add_argument(
+        '--populate',
+        action='store_true',
+        help='Add test data after formatting'
+    )
+    
+    parser.add_argument(
+        '--version',
+        action='version',
+        version=f'Schema Version: {DatabaseManager.SCHEMA_VERSION}'
+    )
+    
+    return parser.parse_args()
+
 def main():
+    """Main entry point for CLI"""
+    args = parse_args()
     manager = DatabaseManager()
     success = True
-
-    if "--backup" in sys.argv:
-        success = manager.backup_database()
-
-    if success and "--format" in sys.argv:
-        success = manager.initialize_schema()
-    elif success:
-        success = manager.apply_migrations()
-
-    sys.exit(0 if success else 1)
+    
+    try:
+        # Create backup if requested
+        if args.backup:
+            if not manager.backup_database():
+                return 1
+        
+        # Format database if requested
+        if args.format:
+            if not manager.format_database(
+                force=args.force,
+                populate=args.populate
+            ):
+                return 1
+        
+        # Apply any pending migrations
+        if not args.format:
+            if not manager.apply_migrations():
+                return 1
+                
+        return 0
+        
+    except Exception as e:
+        logging.error(f"Error: {e}")
+        return 1
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,274 @@
+# src/fetch_modules/backfill.py
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, List, Optional, Sequence, Set, Tuple, Union
+
+import pandas as pd
+
+from ..cache.events import ChangeEvent, market_data_changes
+from ..database.bulk import (
+    BulkLoader, MARKET_DATA_CONFLICT_POLICIES, MARKET_DATA_KEY, market_data_frame, upsert_clause
+)
+from ..database.core import Core
+from .base.rate_limiter import Priority, fetch_priority
+
+# Most results Polygon returns for one aggregates request
+PAGE_LIMIT = 50000
+
+TIMESPANS = {'m': 'minute', 'h': 'hour', 'd': 'day'}
+
+# Bars per calendar day at multiplier 1, counting extended hours (04:00-20:00 ET)
+BARS_PER_DAY = {'minute': 960, 'hour': 16, 'day': 1}
+
+PROGRESS_TABLE = 'backfill_progress'
+
+
+def parse_timeframe(timeframe: str) -> Tuple[int, str]:
+    """'5m' -> (5, 'minute'); also accepts 'h' and 'd'"""
+    match = re.fullmatch(r'(\d*)([mhd])', timeframe)
+    if match is None:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return int(match.group(1) or 1), TIMESPANS[match.group(2)]
+
+
+def as_date(value: Union[date, datetime, str]) -> date:
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value.date() if isinstance(value, datetime) else value
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """One request's worth of bars: symbol over [start, end] inclusive"""
+    symbol: str
+    timeframe: str
+    start: date
+    end: date
+
+    @property
+    def key(self) -> Tuple[str, str, date]:
+        return (self.symbol, self.timeframe, self.start)
+
+
+def plan_chunks(symbol: str, timeframe: str, start: Union[date, datetime, str],
+                end: Union[date, datetime, str], page_limit: int = PAGE_LIMIT) -> List[Chunk]:
+    """Split a range into chunks whose bars fit in one page
+
+    Chunks span calendar days, so weekends and holidays only make a
+    chunk smaller than the limit, never larger. Polygon's limit counts
+    base aggregates (minutes of a 5m bar), so the multiplier is ignored.
+    """
+    _, timespan = parse_timeframe(timeframe)
+    days = max(1, page_limit // BARS_PER_DAY[timespan])
+    first, last = as_date(start), as_date(end)
+    chunks = []
+    while first <= last:
+        chunk_end = min(last, first + timedelta(days=days - 1))
+        chunks.append(Chunk(symbol, timeframe, first, chunk_end))
+        first = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def default_job_id(symbols: Sequence[str], timeframe: str,
+                   start: Union[date, datetime, str], end: Union[date, datetime, str]) -> str:
+    """Stable id for a backfill spec, so rerunning it resumes the same job"""
+    digest = hashlib.sha1(','.join(sorted(symbols)).encode()).hexdigest()[:8]
+    return f"{timeframe}-{as_date(start):%Y%m%d}-{as_date(end):%Y%m%d}-{digest}"
+
+
+class BackfillProgress:
+    """Per-chunk checkpoints in the backfill_progress table
+
+    Each chunk row moves pending -> running -> done (or failed). A chunk is
+    only marked done in the transaction that writes its bars, so a crash
+    can never record a chunk whose data was lost.
+    """
+
+    def __init__(self, core: Union[Core, Callable[[], Core]]):
+        self._core = core
+
+    @property
+    def core(self) -> Core:
+        if not isinstance(self._core, Core):
+            self._core = self._core()
+        return self._core
+
+    def register(self, job_id: str, chunks: Sequence[Chunk]) -> None:
+        """Record the job's chunks, keeping the state of known ones"""
+        self.core.execute_many(
+            f"""
+            INSERT INTO {PROGRESS_TABLE}
+                (job_id, symbol, timeframe, chunk_start, chunk_end, status)
+            VALUES (%s, %s, %s, %s, %s, 'pending')
+            ON DUPLICATE KEY UPDATE chunk_end = chunk_end
+            """,
+            [(job_id, c.symbol, c.timeframe, c.start, c.end) for c in chunks]
+        )
+
+    def completed(self, job_id: str) -> Set[Tuple[str, str, date]]:
+        """Keys of the job's chunks already written"""
+        rows = self.core.execute(
+            f"""
+            SELECT symbol, timeframe, chunk_start
+            FROM {PROGRESS_TABLE}
+            WHERE job_id = %s AND status = 'done'
+            """,
+            (job_id,)
+        )
+        return {(row['symbol'], row['timeframe'], as_date(row['chunk_start'])) for row in rows}
+
+    def _update(self, assignments: str, params: tuple, job_id: str, chunk: Chunk) -> None:
+        with self.core.transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    f"""
+                    UPDATE {PROGRESS_TABLE} SET {assignments}
+                    WHERE job_id = %s AND symbol = %s AND timeframe = %s AND chunk_start = %s
+                    """,
+                    params + (job_id, chunk.symbol, chunk.timeframe, chunk.start)
+                )
+            finally:
+                cursor.close()
+
+    def mark_running(self, job_id: str, chunk: Chunk) -> None:
+        self._update("status = 'running', attempts = attempts + 1", (), job_id, chunk)
+
+    def mark_failed(self, job_id: str, chunk: Chunk, error: str) -> None:
+        self._update("status = 'failed', error = %s", (error[:1000],), job_id, chunk)
+
+    def mark_done(self, cursor: Any, job_id: str, chunk: Chunk, rows: int) -> None:
+        """Checkpoint a chunk on the cursor that wrote its bars"""
+        cursor.execute(
+            f"""
+            UPDATE {PROGRESS_TABLE}
+            SET status = 'done', rows_loaded = %s, error = NULL
+            WHERE job_id = %s AND symbol = %s AND timeframe = %s AND chunk_start = %s
+            """,
+            (rows, job_id, chunk.symbol, chunk.timeframe, chunk.start)
+        )
+
+
+@dataclass
+class BackfillReport:
+    """Outcome of one BackfillEngine.run"""
+    job_id: str
+    total: int
+    skipped: int = 0
+    done: int = 0
+    failed: int = 0
+    rows: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return self.skipped + self.done == self.total
+
+
+class BackfillEngine:
+    """Chunked, resumable historical backfill into market_data
+
+    A (symbols, timeframe, range) job is split into chunks sized to the
+    API page limit and fetched by `concurrency` workers through the async
+    client at backfill priority, so the shared rate limiter serves
+    interactive requests first. Each chunk's bars are upserted and its
+    checkpoint set in one transaction; rerunning a job skips finished
+    chunks and retries failed or interrupted ones.
+    """
+
+    def __init__(self, client: Any, core: Union[Core, Callable[[], Core]],
+                 concurrency: int = 4, page_limit: int = PAGE_LIMIT,
+                 data_type: str = 'STOCK',
+                 progress: Optional[BackfillProgress] = None,
+                 bulk_loader: Optional[BulkLoader] = None):
+        self.client = client
+        self._core = core
+        self.concurrency = concurrency
+        self.page_limit = page_limit
+        self.data_type = data_type
+        self.progress = progress or BackfillProgress(lambda: self.core)
+        self.bulk_loader = bulk_loader or BulkLoader()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def core(self) -> Core:
+        if not isinstance(self._core, Core):
+            self._core = self._core()
+        return self._core
+
+    async def run(self, symbols: Sequence[str], timeframe: str,
+                  start: Union[date, datetime, str], end: Union[date, datetime, str],
+                  job_id: Optional[str] = None) -> BackfillReport:
+        job_id = job_id or default_job_id(symbols, timeframe, start, end)
+        chunks = [chunk for symbol in symbols
+                  for chunk in plan_chunks(symbol, timeframe, start, end, self.page_limit)]
+        report = BackfillReport(job_id, total=len(chunks))
+        t0 = time.monotonic()
+
+        await asyncio.to_thread(self.progress.register, job_id, chunks)
+        finished = await asyncio.to_thread(self.progress.completed, job_id)
+        queue: asyncio.Queue = asyncio.Queue()
+        for chunk in chunks:
+            if chunk.key in finished:
+                report.skipped += 1
+            else:
+                queue.put_nowait(chunk)
+        if report.skipped:
+            self.logger.info(f"Backfill {job_id}: resuming, {report.skipped} chunk(s) already done")
+
+        async def worker() -> None:
+            while not queue.empty():
+                chunk = queue.get_nowait()
+                try:
+                    rows = await self._backfill_chunk(job_id, chunk)
+                    report.rows += rows
+                    report.done += 1
+                except Exception as e:
+                    report.failed += 1
+                    self.logger.warning(
+                        f"Backfill {job_id}: {chunk.symbol} {chunk.start}..{chunk.end} failed: {e}"
+                    )
+                    try:
+                        await asyncio.to_thread(self.progress.mark_failed, job_id, chunk, str(e))
+                    except Exception as mark_error:
+                        self.logger.error(f"Could not record failed chunk: {mark_error}")
+
+        with fetch_priority(Priority.BACKFILL):
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, queue.qsize()))))
+
+        report.elapsed = time.monotonic() - t0
+        self.logger.info(
+            f"Backfill {job_id}: {report.done} chunk(s) loaded ({report.rows} rows), "
+            f"{report.skipped} skipped, {report.failed} failed in {report.elapsed:.1f}s"
+        )
+        return report
+
+    async def _backfill_chunk(self, job_id: str, chunk: Chunk) -> int:
+        await asyncio.to_thread(self.progress.mark_running, job_id, chunk)
+        multiplier, timespan = parse_timeframe(chunk.timeframe)
+        bars = await self.client.get_market_data(chunk.symbol, chunk.start, chunk.end,
+                                                 timespan=timespan, multiplier=multiplier)
+        frame = market_data_frame(bars, chunk.symbol, self.data_type) if not bars.empty else bars
+        await asyncio.to_thread(self._store, job_id, chunk, frame)
+        market_data_changes.publish(ChangeEvent.from_frame(chunk.symbol, frame, chunk.timeframe))
+        return len(frame)
+
+    def _store(self, job_id: str, chunk: Chunk, frame: pd.DataFrame) -> None:
+        """Upsert a chunk's bars and checkpoint it in one transaction"""
+        with self.core.transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                if not frame.empty:
+                    clause = upsert_clause(frame.columns, MARKET_DATA_KEY,
+                                           MARKET_DATA_CONFLICT_POLICIES)
+                    self.bulk_loader.load_frame('market_data', frame, cursor=cursor,
+                                                on_duplicate=clause)
+                self.progress.mark_done(cursor, job_id, chunk, len(frame))
+            finally:
+                cursor.close()
@@ -13,7 +13,8 @@ class DataSourceBase(ABC):
         self,
         symbol: str,
         start_date: datetime,
-        end_date: datetime
+        end_date: datetime,
+        timeframe: str = '1d'
     ) -> pd.DataFrame:
         """Fetch market data for a symbol
         
@@ -21,6 +22,7 @@ class DataSourceBase(ABC):
             symbol: Stock symbol
             start_date: Start date
             end_date: End date
+            timeframe: Bar size, e.g. '1m', '1h' or '1d'
             
         Returns:
             DataFrame with OHLCV data
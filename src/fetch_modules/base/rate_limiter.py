@@ -0,0 +1,269 @@
+# src/fetch_modules/base/rate_limiter.py
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Wait used for a 429 that carries no Retry-After header
+DEFAULT_RETRY_AFTER = 1.0
+
+
+class Priority(IntEnum):
+    """Lower values are served first"""
+    INTERACTIVE = 0
+    BACKFILL = 1
+
+
+# Priority of fetches made from the current task and the tasks it spawns
+current_priority: ContextVar[Priority] = ContextVar('fetch_priority',
+                                                    default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def fetch_priority(level: Priority):
+    """Run the enclosed fetches at the given priority"""
+    token = current_priority.set(level)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds to wait after a 429 response error, None for other errors"""
+    if getattr(exc, 'status', None) != 429:
+        return None
+    headers = getattr(exc, 'headers', None) or {}
+    value = headers.get('Retry-After')
+    if value is None:
+        return DEFAULT_RETRY_AFTER
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Continuously refilled bucket of request tokens
+
+    A small burst keeps the request rate flat at `rate` instead of
+    alternating between bursts and stalls. block() empties the bucket
+    until a Retry-After deadline, so requests resume at the steady rate
+    rather than in a burst that would trip the limit again.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        start = max(self.updated, self.blocked_until)
+        if now > start:
+            self.tokens = min(self.burst, self.tokens + (now - start) * self.rate)
+        self.updated = max(self.updated, now)
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available; 0 if one is now"""
+        if now < self.blocked_until:
+            return self.blocked_until - now + 1.0 / self.rate
+        self._refill(now)
+        return 0.0 if self.tokens >= 1.0 else (1.0 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1.0
+
+    def block(self, seconds: float, now: float) -> None:
+        self._refill(now)
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0.0
+
+
+@dataclass
+class RateLimiterStats:
+    """Counters for a RateLimiter"""
+    acquired: int = 0
+    interactive: int = 0
+    backfill: int = 0
+    throttled: int = 0
+    retries: int = 0
+    wait_seconds: float = 0.0
+
+
+class RateLimiter:
+    """Token buckets per source and endpoint class plus an in-flight cap
+
+    limits maps "source" (shared by all of its endpoints) or
+    "source:endpoint" to (requests per second, burst); a request needs a
+    token from each bucket that applies. Unconfigured sources get a bucket
+    of default_rate. At most max_in_flight requests run at once. Waiters
+    are served by priority, then arrival, among those whose buckets have a
+    token, so interactive requests overtake queued backfill work. A 429
+    blocks the bucket for its Retry-After and the request is retried, so
+    every caller backs off together instead of each on its own timer.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 max_in_flight: int = 10, default_rate: float = 10.0,
+                 default_burst: float = 1.0):
+        self.limits = dict(limits or {})
+        self.max_in_flight = max_in_flight
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.stats = RateLimiterStats()
+        self.logger = logging.getLogger(__name__)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._waiting: Dict[Tuple[int, int], List[TokenBucket]] = {}
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bucket(self, name: str, rate: float, burst: float) -> TokenBucket:
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            bucket = self._buckets[name] = TokenBucket(rate, burst)
+        return bucket
+
+    def buckets(self, source: str, endpoint: str) -> List[TokenBucket]:
+        """Buckets a request to source/endpoint draws from"""
+        found = [self._bucket(name, *self.limits[name])
+                 for name in (f"{source}:{endpoint}", source) if name in self.limits]
+        return found or [self._bucket(source, self.default_rate, self.default_burst)]
+
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            # Process-wide limiters outlive the loops of scripts and tests
+            self._cond, self._loop = asyncio.Condition(), loop
+            self._waiting.clear()
+            self._in_flight = 0
+        return self._cond
+
+    def _turn(self, me: Tuple[int, int], now: float) -> Optional[float]:
+        """0 if me may go now, else how long to wait (None: until notified)"""
+        if self._in_flight >= self.max_in_flight:
+            return None
+        ready = [w for w, buckets in self._waiting.items()
+                 if all(b.wait_time(now) == 0 for b in buckets)]
+        if ready and min(ready) == me:
+            return 0.0
+        if me in ready:
+            return None
+        return max(b.wait_time(now) for b in self._waiting[me])
+
+    async def _acquire(self, buckets: List[TokenBucket], priority: Priority) -> None:
+        cond = self._condition()
+        me = (int(priority), next(self._seq))
+        t0 = time.monotonic()
+        self._waiting[me] = buckets
+        try:
+            async with cond:
+                while True:
+                    now = time.monotonic()
+                    delay = self._turn(me, now)
+                    if delay == 0:
+                        for bucket in buckets:
+                            bucket.take(now)
+                        self._in_flight += 1
+                        break
+                    try:
+                        await asyncio.wait_for(cond.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                # Others may be ready behind this one
+                cond.notify_all()
+        finally:
+            self._waiting.pop(me, None)
+        self.stats.acquired += 1
+        self.stats.wait_seconds += time.monotonic() - t0
+        if priority == Priority.INTERACTIVE:
+            self.stats.interactive += 1
+        else:
+            self.stats.backfill += 1
+
+    async def _release(self) -> None:
+        cond = self._condition()
+        async with cond:
+            self._in_flight -= 1
+            cond.notify_all()
+
+    @asynccontextmanager
+    async def slot(self, source: str, endpoint: str, priority: Optional[Priority] = None):
+        """Hold one request's token and in-flight slot"""
+        await self._acquire(self.buckets(source, endpoint),
+                            current_priority.get() if priority is None else priority)
+        try:
+            yield
+        finally:
+            await self._release()
+
+    def throttle(self, source: str, endpoint: str, seconds: float) -> None:
+        """Stop issuing requests to source/endpoint for seconds"""
+        now = time.monotonic()
+        for bucket in self.buckets(source, endpoint):
+            bucket.block(seconds, now)
+        self.stats.throttled += 1
+        self.logger.warning(f"{source}:{endpoint} rate limited; pausing {seconds:.1f}s")
+
+    async def call(self, source: str, endpoint: str, request: Callable[[], Awaitable[Any]],
+                   retries: int = 3, priority: Optional[Priority] = None) -> Any:
+        """Run request() under the limiter, waiting out and retrying 429s"""
+        attempt = 0
+        while True:
+            async with self.slot(source, endpoint, priority):
+                try:
+                    return await request()
+                except Exception as e:
+                    wait = retry_after(e)
+                    if wait is None or attempt >= retries:
+                        raise
+                    # Block before releasing the slot so no waiter slips in
+                    self.throttle(source, endpoint, wait)
+            attempt += 1
+            self.stats.retries += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of limiter counters"""
+        return {
+            'in_flight': self._in_flight,
+            'waiting': len(self._waiting),
+            'acquired': self.stats.acquired,
+            'interactive': self.stats.interactive,
+            'backfill': self.stats.backfill,
+            'throttled': self.stats.throttled,
+            'retries': self.stats.retries,
+            'avg_wait': self.stats.wait_seconds / self.stats.acquired if self.stats.acquired else 0.0
+        }
+
+
+_shared: Optional[RateLimiter] = None
+
+
+def shared_limiter() -> RateLimiter:
+    """Process-wide limiter, sized from POLYGON_* environment settings"""
+    global _shared
+    if _shared is None:
+        _shared = RateLimiter(
+            limits={'polygon': (float(os.getenv('POLYGON_RATE_LIMIT', '10')),
+                                float(os.getenv('POLYGON_BURST', '1')))},
+            max_in_flight=int(os.getenv('POLYGON_MAX_IN_FLIGHT', '10'))
+        )
+    return _shared
@@ -0,0 +1,240 @@
+# src/fetch_modules/incremental.py
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import pandas as pd
+
+from ..cache.events import ChangeEvent
+from ..cache.sessions import TradingCalendar
+from ..database.core import Core
+from .base.rate_limiter import Priority, fetch_priority
+
+WatermarkKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class Gap:
+    """Sessions [start, end] missing from stored bars of symbol"""
+    symbol: str
+    data_type: str
+    start: date
+    end: date
+
+
+def missing_sessions(calendar: TradingCalendar, present: Set[date],
+                     start: Any, end: Any) -> List[Tuple[date, date]]:
+    """Runs of consecutive sessions in [start, end] absent from present"""
+    runs: List[Tuple[date, date]] = []
+    for day in calendar.sessions(start, end):
+        if day in present:
+            continue
+        if runs and calendar.next_session(runs[-1][1]) == day:
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+class Watermarks:
+    """Latest stored bar per (symbol, data_type), cached in memory
+
+    Marks are read with one grouped MAX(timestamp) query over
+    idx_symbol_time for the symbols not yet known, then advanced from
+    market_data change events, so steady-state syncs never ask the
+    database where they left off. Writes without data (deletes and
+    invalidations) forget the symbol's marks so they are re-read.
+    """
+
+    def __init__(self, core: Union[Core, Callable[[], Core]]):
+        self._core = core
+        self._marks: Dict[WatermarkKey, datetime] = {}
+        # Symbols whose marks are loaded, including those with no rows
+        self._loaded: Set[str] = set()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def core(self) -> Core:
+        if not isinstance(self._core, Core):
+            self._core = self._core()
+        return self._core
+
+    def load(self, symbols: Sequence[str], since: Optional[datetime] = None) -> int:
+        """Read marks of unloaded symbols; only rows from since on are scanned"""
+        missing = sorted(set(symbols) - self._loaded)
+        if not missing:
+            return 0
+        rows = self.core.execute(
+            f"""
+            SELECT symbol, data_type, MAX(timestamp) AS last_ts
+            FROM market_data FORCE INDEX (idx_symbol_time)
+            WHERE symbol IN ({', '.join(['%s'] * len(missing))})
+            {'AND timestamp >= %s' if since is not None else ''}
+            GROUP BY symbol, data_type
+            """,
+            tuple(missing) + ((since,) if since is not None else ())
+        )
+        for row in rows:
+            self._marks[(row['symbol'], row['data_type'])] = pd.Timestamp(row['last_ts']).to_pydatetime()
+        self._loaded.update(missing)
+        return len(rows)
+
+    def get(self, symbol: str, data_type: str = 'STOCK') -> Optional[datetime]:
+        return self._marks.get((symbol, data_type))
+
+    def advance(self, symbol: str, data_type: str, timestamp: datetime) -> None:
+        key = (symbol, data_type)
+        if key not in self._marks or timestamp > self._marks[key]:
+            self._marks[key] = timestamp
+
+    def forget(self, symbol: str) -> None:
+        self._loaded.discard(symbol)
+        for key in [k for k in self._marks if k[0] == symbol]:
+            del self._marks[key]
+
+    def on_change(self, event: ChangeEvent) -> None:
+        """Follow market_data writes published on the change bus"""
+        if event.table != 'market_data':
+            return
+        frame = event.data
+        if frame is None or 'data_type' not in frame.columns:
+            self.forget(event.symbol)
+            return
+        stamps = frame['timestamp'] if 'timestamp' in frame.columns else frame.index.to_series()
+        latest = pd.to_datetime(stamps).groupby(frame['data_type'].to_numpy()).max()
+        for data_type, timestamp in latest.items():
+            self.advance(event.symbol, data_type, timestamp.to_pydatetime())
+
+
+@dataclass
+class SyncReport:
+    """Outcome of one IncrementalSync.sync run"""
+    fetched: Dict[str, int] = field(default_factory=dict)
+    gaps: List[Gap] = field(default_factory=list)
+
+
+class IncrementalSync:
+    """Fetch only bars after each symbol's watermark
+
+    A sync re-fetches from the watermark's day onward (the last stored bar
+    may be a partial live bar) instead of the whole configured range, and
+    stores the result, which advances the watermark through the change
+    bus. Sessions before the watermark are checked against the trading
+    calendar with one grouped query; missing runs are queued as Gaps and
+    refilled in the background at backfill priority, so they never delay
+    the incremental fetch. refill(gap) returns the rows it loaded and
+    raises if it could not finish; a gap that cleanly loads none is not
+    queued again.
+    """
+
+    def __init__(self, fetch: Callable[[str, datetime, datetime], Awaitable[pd.DataFrame]],
+                 store: Callable[[str, pd.DataFrame], Awaitable[Any]],
+                 watermarks: Watermarks,
+                 refill: Optional[Callable[[Gap], Awaitable[Any]]] = None,
+                 calendar: Optional[TradingCalendar] = None,
+                 check_gaps: bool = True):
+        self.fetch = fetch
+        self.store = store
+        self.watermarks = watermarks
+        self.refill = refill
+        self.calendar = calendar or TradingCalendar()
+        self.check_gaps = check_gaps
+        self.logger = logging.getLogger(__name__)
+        self.refills: asyncio.Queue = asyncio.Queue()
+        # Gaps queued or being refilled, so repeated syncs do not duplicate them
+        self._queued: Set[Gap] = set()
+        # Gaps the source had no bars for (holidays missing from the calendar, halts)
+        self._settled: Set[Gap] = set()
+        self._refiller: Optional[asyncio.Task] = None
+
+    async def sync(self, symbols: Sequence[str], start: datetime, end: datetime,
+                   data_type: str = 'STOCK') -> SyncReport:
+        report = SyncReport()
+        await asyncio.to_thread(self.watermarks.load, symbols, start)
+
+        for symbol in symbols:
+            mark = self.watermarks.get(symbol, data_type)
+            since = max(start, datetime.combine(mark.date(), time.min)) if mark else start
+            if since > end:
+                report.fetched[symbol] = 0
+                continue
+            data = await self.fetch(symbol, since, end)
+            if data is None or data.empty:
+                report.fetched[symbol] = 0
+                continue
+            await self.store(symbol, data)
+            # Also advanced by the store's change event, if it publishes one
+            stamps = data['timestamp'] if 'timestamp' in data.columns else data.index
+            self.watermarks.advance(symbol, data_type, pd.Timestamp(max(stamps)).to_pydatetime())
+            report.fetched[symbol] = len(data)
+
+        if self.check_gaps:
+            report.gaps = await asyncio.to_thread(self.find_gaps, symbols, start, data_type)
+            self.enqueue(report.gaps)
+        return report
+
+    def find_gaps(self, symbols: Sequence[str], start: datetime,
+                  data_type: str = 'STOCK') -> List[Gap]:
+        """Sessions from start up to each watermark that have no stored bars"""
+        bounds = {s: self.watermarks.get(s, data_type) for s in symbols}
+        bounds = {s: mark for s, mark in bounds.items() if mark is not None and mark >= start}
+        if not bounds:
+            return []
+        rows = self.watermarks.core.execute(
+            f"""
+            SELECT symbol, DATE(timestamp) AS day
+            FROM market_data FORCE INDEX (idx_symbol_time)
+            WHERE symbol IN ({', '.join(['%s'] * len(bounds))})
+              AND data_type = %s AND timestamp >= %s AND timestamp <= %s
+            GROUP BY symbol, day
+            """,
+            tuple(bounds) + (data_type, start, max(bounds.values()))
+        )
+        present: Dict[str, Set[date]] = {s: set() for s in bounds}
+        for row in rows:
+            present[row['symbol']].add(pd.Timestamp(row['day']).date())
+        return [
+            Gap(symbol, data_type, first, last)
+            for symbol, mark in bounds.items()
+            for first, last in missing_sessions(self.calendar, present[symbol], start, mark)
+        ]
+
+    def enqueue(self, gaps: Sequence[Gap]) -> int:
+        """Queue gaps for refill and make sure the refiller is running"""
+        new = [gap for gap in gaps if gap not in self._queued and gap not in self._settled]
+        for gap in new:
+            self._queued.add(gap)
+            self.refills.put_nowait(gap)
+        if new:
+            self.logger.info(f"Queued {len(new)} gap(s) for refill")
+            if self.refill is not None and (self._refiller is None or self._refiller.done()):
+                self._refiller = asyncio.create_task(self._drain())
+        return len(new)
+
+    async def _drain(self) -> None:
+        with fetch_priority(Priority.BACKFILL):
+            while not self.refills.empty():
+                gap = self.refills.get_nowait()
+                try:
+                    if await self.refill(gap) == 0:
+                        self._settled.add(gap)
+                except Exception as e:
+                    self.logger.warning(
+                        f"Refill of {gap.symbol} {gap.start}..{gap.end} failed: {e}"
+                    )
+                finally:
+                    # A failed gap is found again, and retried, by the next sync
+                    self._queued.discard(gap)
+
+    async def stop(self) -> None:
+        """Cancel pending refills"""
+        if self._refiller is not None:
+            self._refiller.cancel()
+            try:
+                await self._refiller
+            except asyncio.CancelledError:
+                pass
+            self._refiller = None
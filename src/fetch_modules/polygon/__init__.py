@@ -1,4 +1,5 @@
 from .polygon_data_source import PolygonDataSource
 from .polygon_client import PolygonClient
+from .grouped_daily import GroupedDailyIngest, GroupedDailyReport
 
-__all__ = ['PolygonDataSource', 'PolygonClient']
\ No newline at end of file
+__all__ = ['PolygonDataSource', 'PolygonClient', 'GroupedDailyIngest', 'GroupedDailyReport']
\ No newline at end of file
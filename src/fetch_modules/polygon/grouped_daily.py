@@ -0,0 +1,125 @@
+# src/fetch_modules/polygon/grouped_daily.py
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, Optional, Union
+
+import pandas as pd
+
+from ...cache.events import ChangeEvent, market_data_changes
+from ...cache.sessions import TradingCalendar
+from ...database.bulk import (
+    BulkLoader, MARKET_DATA_CONFLICT_POLICIES, MARKET_DATA_KEY, market_data_frame, upsert_clause
+)
+from ...database.core import Core
+from ..base.rate_limiter import Priority, fetch_priority
+from .polygon_client import PolygonClient, grouped_frame
+
+
+@dataclass
+class GroupedDailyReport:
+    """Outcome of one GroupedDailyIngest.backfill"""
+    requests: int = 0
+    rows: int = 0
+    # Sessions whose request or write failed, with the error
+    failed: Dict[date, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+class GroupedDailyIngest:
+    """Daily bars for the whole market from one request per session
+
+    Polygon's grouped daily endpoint returns every ticker's bar for a
+    date, so refreshing N days of an ~8,000 symbol universe takes N
+    requests instead of one per symbol per range. Each response is fanned
+    out to one market_data row per ticker (optionally limited to
+    `symbols`) and bulk-upserted in one transaction; the session's change
+    events are published as one batch to keep caches and sync watermarks
+    current. Sessions come from
+    the trading calendar, so weekends cost no requests.
+    """
+
+    def __init__(self, client: PolygonClient, core: Union[Core, Callable[[], Core]],
+                 symbols: Optional[Iterable[str]] = None,
+                 calendar: Optional[TradingCalendar] = None,
+                 concurrency: int = 4, data_type: str = 'STOCK',
+                 bulk_loader: Optional[BulkLoader] = None):
+        self.client = client
+        self._core = core
+        self.symbols = set(symbols) if symbols is not None else None
+        self.calendar = calendar or TradingCalendar()
+        self.concurrency = concurrency
+        self.data_type = data_type
+        self.bulk_loader = bulk_loader or BulkLoader()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def core(self) -> Core:
+        if not isinstance(self._core, Core):
+            self._core = self._core()
+        return self._core
+
+    def to_rows(self, results: list) -> pd.DataFrame:
+        """market_data rows of one grouped response"""
+        frame = grouped_frame(results)
+        if frame.empty:
+            return frame
+        if self.symbols is not None:
+            frame = frame[frame['symbol'].isin(self.symbols)]
+        return market_data_frame(frame, data_type=self.data_type)
+
+    async def ingest_day(self, day: Union[date, datetime, str]) -> int:
+        """Fetch and store one session's bars; returns rows written"""
+        day = pd.Timestamp(day).date()
+        results = await self.client.get_grouped_daily(day.isoformat())
+        frame = self.to_rows(results)
+        if frame.empty:
+            self.logger.info(f"Grouped daily {day}: no bars")
+            return 0
+        await asyncio.to_thread(self._store, frame)
+        # One batch per session, so caches invalidate once instead of per symbol
+        market_data_changes.publish_many(
+            ChangeEvent.from_frame(symbol, rows, '1d')
+            for symbol, rows in frame.groupby('symbol', sort=False)
+        )
+        return len(frame)
+
+    def _store(self, frame: pd.DataFrame) -> None:
+        clause = upsert_clause(frame.columns, MARKET_DATA_KEY, MARKET_DATA_CONFLICT_POLICIES)
+        with self.core.transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                self.bulk_loader.load_frame('market_data', frame, cursor=cursor,
+                                            on_duplicate=clause)
+            finally:
+                cursor.close()
+
+    async def backfill(self, start: Union[date, datetime, str],
+                       end: Union[date, datetime, str]) -> GroupedDailyReport:
+        """Ingest every session in [start, end], one request per session"""
+        sessions = self.calendar.sessions(start, end)
+        report = GroupedDailyReport(requests=len(sessions))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        t0 = time.monotonic()
+
+        async def ingest(day: date) -> None:
+            async with semaphore:
+                try:
+                    rows = await self.ingest_day(day)
+                    report.rows += rows
+                except Exception as e:
+                    report.failed[day] = str(e)
+                    self.logger.warning(f"Grouped daily {day} failed: {e}")
+
+        with fetch_priority(Priority.BACKFILL):
+            await asyncio.gather(*(ingest(day) for day in sessions))
+
+        report.elapsed = time.monotonic() - t0
+        self.logger.info(
+            f"Grouped daily {start}..{end}: {report.rows} rows from {report.requests} "
+            f"requests, {len(report.failed)} failed in {report.elapsed:.1f}s"
+        )
+        return report
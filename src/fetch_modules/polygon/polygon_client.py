@@ -1,33 +1,205 @@
 import aiohttp
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+import pandas as pd
 from polygon import RESTClient
 from dotenv import load_dotenv
 import os
 
-# Update relative imports to match fetch_modules structure
-from ..base.base_data_source_ import DataSourceBase
-from ...models import MarketData
+from ..base.rate_limiter import RateLimiter, shared_limiter
 
-class PolygonClient(DataSourceBase):
-    """Low-level client for Polygon.io API"""
-    
-    def __init__(self, api_key: str, base_url: str = "https://api.polygon.io/v2"):
-        self.api_key = api_key
-        self.base_url = base_url
-        self.session = None
+# Polygon aggregate fields -> market_data columns
+AGG_COLUMNS = {
+    't': 'timestamp', 'o': 'open', 'h': 'high', 'l': 'low', 'c': 'close',
+    'v': 'volume', 'vw': 'vwap', 'n': 'transactions'
+}
+
+
+# Grouped daily results name the ticker in 'T'
+GROUPED_COLUMNS = {'T': 'symbol', **AGG_COLUMNS}
+
+# Daily aggregates are stamped at midnight of the session in this zone
+MARKET_TIMEZONE = 'America/New_York'
+
+
+def endpoint_class(url: str) -> str:
+    """Rate limit class of a Polygon URL: aggs, reference or other"""
+    if '/aggs/' in url:
+        return 'aggs'
+    if '/reference/' in url:
+        return 'reference'
+    return 'other'
+
+
+def aggs_frame(results: List[Dict[str, Any]], symbol: Optional[str] = None) -> pd.DataFrame:
+    """Aggregate results as a timestamp-indexed OHLCV frame"""
+    if not results:
+        return pd.DataFrame()
+    frame = pd.DataFrame.from_records(results, columns=list(AGG_COLUMNS))
+    frame = frame.rename(columns=AGG_COLUMNS)
+    # Bar start times arrive as Unix milliseconds (UTC)
+    frame['timestamp'] = pd.to_datetime(frame['timestamp'], unit='ms')
+    if symbol is not None:
+        frame.insert(1, 'symbol', symbol)
+    return frame.set_index('timestamp')
+
+
+def session_start(stamps: pd.Series) -> pd.Series:
+    """Naive UTC session start (midnight New York) of UTC timestamps"""
+    local = stamps.dt.tz_localize('UTC').dt.tz_convert(MARKET_TIMEZONE)
+    return local.dt.normalize().dt.tz_convert('UTC').dt.tz_localize(None)
+
+
+def grouped_frame(results: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Grouped daily results as one row per ticker, timestamp as a column"""
+    if not results:
+        return pd.DataFrame()
+    frame = pd.DataFrame.from_records(results, columns=list(GROUPED_COLUMNS))
+    frame = frame.rename(columns=GROUPED_COLUMNS)
+    # Grouped bars carry the session close; restamp them like daily aggs so
+    # both paths write the same unique_record key
+    frame['timestamp'] = session_start(pd.to_datetime(frame['timestamp'], unit='ms'))
+    return frame
+
+
+class PolygonClient:
+    """Async client for the Polygon.io REST API
+
+    All requests share one aiohttp.ClientSession, created on first use in
+    the running loop, so connections are kept alive and reused across
+    concurrent fetches. The connector caps open connections overall and
+    per host (aiohttp sends one request at a time per connection, so the
+    per-host cap bounds in-flight requests to Polygon) and caches DNS
+    lookups for dns_ttl seconds. Pass session to share one across clients.
+    Call close() (or use `async with`) to release the connections.
+
+    Every request goes through a RateLimiter (the process-wide one unless
+    given), which paces requests per endpoint class, bounds how many are
+    in flight and waits out 429 Retry-After before retrying.
+    """
+
+    def __init__(self, api_key: Optional[str] = None,
+                 base_url: str = "https://api.polygon.io",
+                 limit: int = 100, limit_per_host: int = 20,
+                 dns_ttl: int = 300, keepalive_timeout: float = 30.0,
+                 timeout: float = 30.0,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 limiter: Optional[RateLimiter] = None):
         self.logger = logging.getLogger(__name__)
-        
+
         if not api_key:
             load_dotenv()
             api_key = os.getenv("POLYGON_API_KEY")
-            
+
         if not api_key:
             raise ValueError("Polygon API key not found")
-            
-        self.client = RESTClient(api_key)
+
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.session = session
+        self._owns_session = session is None
+        self.limiter = limiter or shared_limiter()
+        self._session_lock: Optional[asyncio.Lock] = None
+        self._rest: Optional[RESTClient] = None
 
     def get_client(self) -> RESTClient:
-        """Get the underlying RESTClient instance"""
-        return self.client
\ No newline at end of file
+        """Synchronous RESTClient for scripts that do not run an event loop"""
+        if self._rest is None:
+            self._rest = RESTClient(self.api_key)
+        return self._rest
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is not None and not self.session.closed:
+            return self.session
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        async with self._session_lock:
+            if self.session is None or self.session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=self.dns_ttl,
+                    keepalive_timeout=self.keepalive_timeout
+                )
+                self.session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    headers={'Authorization': f"Bearer {self.api_key}"},
+                    raise_for_status=True
+                )
+                self._owns_session = True
+        return self.session
+
+    async def close(self) -> None:
+        """Close the session if this client created it"""
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self) -> 'PolygonClient':
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        session = await self._get_session()
+        if not url.startswith('http'):
+            url = f"{self.base_url}{url}"
+
+        async def request() -> Dict[str, Any]:
+            async with session.get(url, params=params) as response:
+                return await response.json()
+
+        return await self.limiter.call('polygon', endpoint_class(url), request)
+
+    async def _get_paged(self, path: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """results of every page, following next_url"""
+        body = await self._get(path, params)
+        results = list(body.get('results') or [])
+        while body.get('next_url'):
+            body = await self._get(body['next_url'])
+            results.extend(body.get('results') or [])
+        return results
+
+    async def get_aggs(self, symbol: str, multiplier: int, timespan: str,
+                       start: str, end: str, adjusted: bool = True,
+                       limit: int = 50000) -> List[Dict[str, Any]]:
+        """Raw aggregate bars for symbol between start and end (YYYY-MM-DD)"""
+        return await self._get_paged(
+            f"/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/{start}/{end}",
+            {'adjusted': str(adjusted).lower(), 'sort': 'asc', 'limit': limit}
+        )
+
+    async def get_market_data(self, symbol: str, start_date: datetime, end_date: datetime,
+                              timespan: str = 'day', multiplier: int = 1) -> pd.DataFrame:
+        """Aggregate bars as a timestamp-indexed OHLCV frame"""
+        results = await self.get_aggs(symbol, multiplier, timespan,
+                                      start_date.strftime('%Y-%m-%d'),
+                                      end_date.strftime('%Y-%m-%d'))
+        return aggs_frame(results, symbol)
+
+    async def get_grouped_daily(self, day: str, adjusted: bool = True,
+                                include_otc: bool = False) -> List[Dict[str, Any]]:
+        """Daily bars of every US stock ticker for one date (YYYY-MM-DD)"""
+        body = await self._get(
+            f"/v2/aggs/grouped/locale/us/market/stocks/{day}",
+            {'adjusted': str(adjusted).lower(), 'include_otc': str(include_otc).lower()}
+        )
+        return body.get('results') or []
+
+    async def get_ticker_details(self, symbol: str) -> Dict[str, Any]:
+        body = await self._get(f"/v3/reference/tickers/{symbol}")
+        return body.get('results') or {}
+
+    async def get_ticker_news(self, symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
+        body = await self._get('/v2/reference/news', {'ticker': symbol, 'limit': limit})
+        return body.get('results') or []
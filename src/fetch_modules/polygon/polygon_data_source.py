@@ -4,49 +4,38 @@ from datetime import datetime
 import pandas as pd
 
 # Update relative imports
+from ..backfill import parse_timeframe
 from ..base.base_data_source_ import DataSourceBase
-from ...models import MarketData
 from .polygon_client import PolygonClient
 
 class PolygonDataSource(DataSourceBase):
     """High-level interface for Polygon.io data"""
 
-    def __init__(self, api_key: Optional[str] = None):
-        self.client = PolygonClient(api_key)
+    def __init__(self, api_key: Optional[str] = None,
+                 client: Optional[PolygonClient] = None):
+        self.client = client or PolygonClient(api_key)
         self.logger = logging.getLogger(__name__)
 
+    async def close(self) -> None:
+        await self.client.close()
+
     async def fetch_data(
         self,
         symbol: str,
         start_date: datetime,
-        end_date: datetime
+        end_date: datetime,
+        timeframe: str = '1d'
     ) -> pd.DataFrame:
         """Fetch market data for a symbol"""
         try:
-            start_str = start_date.strftime('%Y-%m-%d')
-            end_str = end_date.strftime('%Y-%m-%d')
-            
-            aggs = self.client.get_aggs(symbol, 1, "day", start_str, end_str)
-            
-            if not aggs:
+            # Backfill only plans minute to daily bars; weekly ones are fetched whole
+            multiplier, timespan = (1, 'week') if timeframe == '1w' else parse_timeframe(timeframe)
+            df = await self.client.get_market_data(symbol, start_date, end_date,
+                                                   timespan=timespan, multiplier=multiplier)
+            if df.empty:
                 self.logger.warning(f"No data returned for {symbol}")
-                return pd.DataFrame()
-                
-            data = [{
-                'timestamp': pd.Timestamp(agg.timestamp),
-                'symbol': symbol,
-                'open': agg.open,
-                'high': agg.high,
-                'low': agg.low,
-                'close': agg.close,
-                'volume': agg.volume,
-                'vwap': agg.vwap
-            } for agg in aggs]
-            
-            df = pd.DataFrame(data)
-            if not df.empty:
-                df.set_index('timestamp', inplace=True)
-            return df
+                return df
+            return df.drop(columns='transactions')
         except Exception as e:
             self.logger.error(f"Error fetching data for {symbol}: {e}")
             raise
@@ -54,12 +43,12 @@ class PolygonDataSource(DataSourceBase):
     async def fetch_fundamentals(self, symbol: str) -> Dict[str, Any]:
         """Fetch fundamental data for a symbol"""
         try:
-            details = self.client.get_ticker_details(symbol)
+            details = await self.client.get_ticker_details(symbol)
             return {
-                "market_cap": getattr(details, 'market_cap', None),
-                "description": getattr(details, 'description', ''),
-                "sector": getattr(details, 'sector', ''),
-                "industry": getattr(details, 'industry', '')
+                "market_cap": details.get('market_cap'),
+                "description": details.get('description', ''),
+                "sector": details.get('sector', ''),
+                "industry": details.get('industry', details.get('sic_description', ''))
             }
         except Exception as e:
             self.logger.error(f"Error fetching fundamentals for {symbol}: {e}")
@@ -68,15 +57,15 @@ class PolygonDataSource(DataSourceBase):
     async def fetch_news(self, symbol: str, limit: int = 10) -> pd.DataFrame:
         """Fetch news data for a symbol"""
         try:
-            news_items = self.client.get_ticker_news(symbol, limit=limit)
+            news_items = await self.client.get_ticker_news(symbol, limit=limit)
             if not news_items:
                 return pd.DataFrame()
                 
             data = [{
-                'timestamp': pd.Timestamp(item.published_utc),
-                'title': getattr(item, 'title', ''),
-                'url': getattr(item, 'article_url', ''),
-                'source': getattr(item.publisher, 'name', '') if hasattr(item, 'publisher') else ''
+                'timestamp': pd.Timestamp(item['published_utc']),
+                'title': item.get('title', ''),
+                'url': item.get('article_url', ''),
+                'source': (item.get('publisher') or {}).get('name', '')
             } for item in news_items]
             
             df = pd.DataFrame(data)
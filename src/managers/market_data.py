@@ -1,5 +1,7 @@
 # src/core/data/managers/market_data.py
+import asyncio
 import logging
+import os
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 import pandas as pd
@@ -7,28 +9,103 @@ import pandas as pd
 # Update relative imports
 from ..models import MarketData
 from ..fetch_modules.polygon.polygon_data_source import PolygonDataSource
-from ..fetch_modules.base.base_data_source import BaseDataSource
-from ..cache.memory_cache import MemoryCache
+from ..fetch_modules.base.base_data_source_ import DataSourceBase
+from ..fetch_modules.base.rate_limiter import retry_after
+from ..cache.async_memo import AsyncMemo
+from ..cache.disk_cache import DiskCache
+from ..cache.events import ChangeEvent, market_data_changes
+from ..cache.memory_cache import MarketDataValidator
+from ..cache.query_cache import QueryCache, TieredCache
+from ..cache.range_cache import RangeCache
+from ..cache.refresh import BackgroundRefresher
+from ..cache.sharded_cache import ShardedCache
+from ..cache.ttl_policy import TTLPolicy
+from ..cache.warmup import (
+    AccessLog, CacheWarmer, FileAccessStore, MetricsAccessStore, WarmupProgress, WarmupTarget
+)
 from ..database_client import DatabaseClient
 
+def span_overlaps(key: str, event: ChangeEvent) -> bool:
+    """Whether a SYMBOL:timeframe:start:end cache key overlaps a change"""
+    try:
+        _, _, first, last = key.split(':')
+        return event.overlaps(first, last)
+    except ValueError:
+        # Keys without a span may hold any range
+        return True
+
 class MarketDataManager:
     """Manages market data operations and caching"""
     
     def __init__(
         self,
         data_source: Optional[DataSourceBase] = None,
-        cache_ttl: int = 3600
+        cache_ttl: int = 3600,
+        cache_dir: Optional[str] = None,
+        max_refreshes: int = 4,
+        live_ttl: float = 60.0,
+        ttl_policy: Optional[TTLPolicy] = None,
+        db_client: Optional[DatabaseClient] = None,
+        shared: Optional[QueryCache] = None,
+        access_log: Optional[AccessLog] = None,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        batch_size: int = 10,
+        cache_shards: int = 16,
+        cache_max_bytes: int = 512 * 1024 * 1024
     ):
         self.data_source = data_source or PolygonDataSource()
-        self.cache = MemoryCache(ttl_seconds=cache_ttl)
-        self.db_client = DatabaseClient()
+        self.validator = MarketDataValidator()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.batch_size = batch_size
+        # Closed sessions are cached indefinitely, the live session for live_ttl
+        self.ttl_policy = ttl_policy or TTLPolicy(live_ttl=live_ttl)
+        # Striped so concurrent requests do not serialize on one lock
+        self.cache = ShardedCache(shards=cache_shards, ttl_seconds=cache_ttl,
+                                  max_bytes=cache_max_bytes, ttl_for=self.ttl_policy.key_ttl)
+        cache_dir = cache_dir or os.getenv('MARKET_DATA_CACHE_DIR')
+        # Expired ranges are served at once and revalidated in the background
+        self.ranges = RangeCache(
+            store=DiskCache(cache_dir) if cache_dir else None,
+            ttl=cache_ttl,
+            refresher=BackgroundRefresher(max_concurrency=max_refreshes),
+            policy=self.ttl_policy
+        )
+        # Results live in self.ranges; this only collapses concurrent misses
+        self._fetch = AsyncMemo(self._fetch_with_retry, ttl=0)
+        self.db_client = db_client or DatabaseClient()
+        # Gap fetches are shared with other workers through query_cache
+        self.shared = TieredCache(
+            self.cache, shared or QueryCache(lambda: self.db_client.core)
+        )
+        # Writes to market_data patch or invalidate the ranges they touch
+        market_data_changes.subscribe(self._on_change, self._on_changes)
+        access_file = os.getenv('MARKET_DATA_ACCESS_LOG')
+        self.access_log = access_log or AccessLog(
+            FileAccessStore(access_file) if access_file
+            else MetricsAccessStore(lambda: self.db_client.core)
+        )
         self.logger = logging.getLogger(__name__)
 
+    def _on_change(self, event: ChangeEvent) -> None:
+        """Bring every cache tier in line with a market_data write"""
+        self.ranges.apply(event)
+        self.cache.remove_where(event.symbol, lambda key: span_overlaps(key, event))
+        self.shared.l2.on_change(event)
+
+    def _on_changes(self, events: List[ChangeEvent]) -> None:
+        """Batch form of _on_change with one shared-tier invalidation"""
+        for event in events:
+            self.ranges.apply(event)
+            self.cache.remove_where(
+                event.symbol, lambda key, event=event: span_overlaps(key, event)
+            )
+        self.shared.l2.on_changes(events)
+
     async def get_market_data(self, symbol: str, start_date: datetime, 
                             end_date: datetime, timeframe: str = "1d") -> pd.DataFrame:
-        """Get validated market data with caching"""
-        cache_key = f"{symbol}:{start_date}:{end_date}:{timeframe}"
-        
+        """Get validated market data, fetching only sessions not yet cached"""
         try:
             # Validate inputs
             if not symbol:
@@ -36,38 +113,26 @@ class MarketDataManager:
             if end_date < start_date:
                 raise ValueError("End date must be after start date")
             await self.validate_timeframe(timeframe)
-            
-            # Check cache
-            if cached := await self.cache.get(cache_key):
-                self.logger.debug(f"Cache hit for {symbol}")
-                return cached
+            self.access_log.record(WarmupTarget(symbol, timeframe, start_date, end_date))
 
             # Start performance tracking
             start_time = datetime.now()
-            
-            # Fetch with retry
-            data = await self._fetch_with_retry(
-                symbol=symbol,
-                start_date=start_date,
-                end_date=end_date,
-                timeframe=timeframe
+            fetches = self.ranges.stats.gap_fetches
+
+            data = await self.ranges.get(
+                symbol, timeframe, start_date, end_date, self._fetch_gap
             )
-            
-            # Validate fetched data
-            is_valid, validation_errors = self.validator.validate(data)
-            if not is_valid:
-                raise ValueError(f"Invalid market data for {symbol}: {validation_errors}")
 
-            # Update cache with valid data
-            await self.cache.set(cache_key, data)
-            
             # Log performance metrics
             elapsed = (datetime.now() - start_time).total_seconds()
-            self.logger.info(
-                f"Fetched {len(data)} records for {symbol} "
-                f"({elapsed:.2f}s)"
-            )
-            
+            if self.ranges.stats.gap_fetches == fetches:
+                self.logger.debug(f"Cache hit for {symbol}")
+            else:
+                self.logger.info(
+                    f"Served {len(data)} records for {symbol} "
+                    f"({elapsed:.2f}s)"
+                )
+
             return data
 
         except ValueError as e:
@@ -107,13 +172,62 @@ class MarketDataManager:
             
         return results
 
+    async def get_stored_data(self, symbol: str, start_date: datetime,
+                              end_date: datetime) -> pd.DataFrame:
+        """Read stored bars for a range as typed columns"""
+        def read() -> pd.DataFrame:
+            frames = list(self.db_client.iter_frames(
+                """
+                SELECT timestamp, open, high, low, close, volume, vwap
+                FROM market_data
+                WHERE symbol = %s AND timestamp BETWEEN %s AND %s
+                ORDER BY timestamp
+                """,
+                (symbol, start_date, end_date)
+            ))
+            if not frames:
+                return pd.DataFrame()
+            return pd.concat(frames, ignore_index=True).set_index('timestamp')
+
+        return await asyncio.to_thread(read)
+
+    async def _fetch_gap(self, symbol: str, start_date: datetime,
+                         end_date: datetime, timeframe: str) -> pd.DataFrame:
+        """Fetch and validate one uncovered span, reading through L1/L2 first"""
+        async def fetch() -> pd.DataFrame:
+            data = await self._fetch(
+                symbol=symbol,
+                start_date=start_date,
+                end_date=end_date,
+                timeframe=timeframe
+            )
+            # Spans with no bars (e.g. unlisted holidays) come back empty
+            if data is not None and not data.empty:
+                is_valid, validation_errors = self.validator.validate(data)
+                if not is_valid:
+                    raise ValueError(f"Invalid market data for {symbol}: {validation_errors}")
+            return data
+
+        key = f"{symbol}:{timeframe}:{start_date:%Y-%m-%d}:{end_date:%Y-%m-%d}"
+        return await self.shared.get_or_fetch(
+            key, fetch, ttl=self.ttl_policy.ttl_for(end_date), endpoint='aggs',
+            parameters={'symbol': symbol, 'timeframe': timeframe,
+                        'start': start_date, 'end': end_date}
+        )
+
     async def _fetch_with_retry(self, symbol: str, start_date: datetime,
                               end_date: datetime, timeframe: str, 
                               attempt: int = 0) -> pd.DataFrame:
-        """Fetch data with exponential backoff retry"""
+        """Fetch data with exponential backoff retry
+
+        429s are not retried here: the rate limiter has already waited out
+        Retry-After for every caller, so another local cycle only adds load.
+        """
         try:
-            return await self.source.fetch_data(symbol, start_date, end_date, timeframe)
+            return await self.data_source.fetch_data(symbol, start_date, end_date, timeframe)
         except Exception as e:
+            if retry_after(e) is not None:
+                raise
             if attempt >= self.max_retries:
                 raise RuntimeError(
                     f"Failed to fetch {symbol} after {attempt} attempts"
@@ -129,16 +243,29 @@ class MarketDataManager:
                 symbol, start_date, end_date, timeframe, attempt + 1
             )
 
+    async def warm(self, top_n: int = 100, concurrency: int = 4, rate: float = 5.0,
+                   max_seconds: Optional[float] = 60.0) -> WarmupProgress:
+        """Preload the most requested ranges, e.g. before serving traffic"""
+        # Straight to the range cache so warmup does not count as access
+        async def load(target: WarmupTarget) -> None:
+            await self.ranges.get(target.symbol, target.kind, target.start, target.end,
+                                  self._fetch_gap)
+
+        warmer = CacheWarmer(self.access_log, load, top_n=top_n, concurrency=concurrency,
+                             rate=rate, max_seconds=max_seconds)
+        return await warmer.run()
+
     async def refresh_symbol(self, symbol: str) -> None:
         """Force refresh data for a symbol"""
         pattern = f"{symbol}:*"
         await self.cache.remove_pattern(pattern)
+        self.ranges.invalidate(symbol)
         self.logger.info(f"Cleared cache for {symbol}")
 
     async def get_cached_symbols(self) -> List[str]:
         """Get list of currently cached symbols"""
         keys = await self.cache.get_all_keys()
-        return list(set(key.split(':')[0] for key in keys))
+        return list(set(key.split(':')[0] for key in keys) | set(self.ranges.symbols()))
 
     async def monitor_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
@@ -146,9 +273,14 @@ class MarketDataManager:
             'size': await self.cache.size(),
             'hits': await self.cache.get_hits(),
             'misses': await self.cache.get_misses(),
+            'evictions': self.cache.evictions,
             'symbols': len(await self.get_cached_symbols()),
             'memory_usage': await self.cache.get_memory_usage(),
-            'last_cleanup': await self.cache.get_last_cleanup_time()
+            'last_cleanup': await self.cache.get_last_cleanup_time(),
+            'ranges': self.ranges.get_stats(),
+            'refresh': self.ranges.refresher.get_stats(),
+            'disk': self.ranges.store.get_stats() if self.ranges.store else None,
+            'shared': self.shared.l2.get_stats()
         }
         self.logger.debug(f"Cache stats: {stats}")
         return stats
@@ -172,24 +304,44 @@ class MarketDataManager:
 
     async def health_check(self) -> Dict[str, Any]:
         """Check health of data manager components"""
+        source_healthy = getattr(self.data_source, 'is_healthy', None)
         status = {
             'cache': await self.cache.is_healthy(),
-            'source': await self.source.is_healthy(),
+            'source': await source_healthy() if source_healthy else True,
             'last_error': None,
             'uptime': datetime.now() - self._start_time,
             'total_requests': self._request_count
         }
         return status
 
-    async def __aenter__(self):
-        """Setup resources"""
+    async def start(self) -> None:
+        """Start the cache sweeps and periodic access log flushing"""
         self._start_time = datetime.now()
         self._request_count = 0
         await self.cache.connect()
+        await self.shared.l2.start()
+        await self.access_log.start()
+
+    async def close(self) -> None:
+        """Stop background work, flush the disk tier and release the source"""
+        await self.cache.disconnect()
+        await self.access_log.stop()
+        await self.shared.l2.stop()
+        await self.ranges.refresher.stop()
+        # Releases the Polygon client's pooled connections
+        close = getattr(self.data_source, 'close', None)
+        if close is not None:
+            await close()
+        if self.ranges.store is not None:
+            self.ranges.store.flush()
+
+    async def __aenter__(self):
+        """Setup resources"""
+        await self.start()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Cleanup resources"""
-        await self.cache.disconnect()
+        await self.close()
         if exc_val:
-            self.logger.error(f"Error during cleanup: {exc_val}")
\ No newline at end of file
+            self.logger.error(f"Error during cleanup: {exc_val}")
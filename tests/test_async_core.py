@@ -0,0 +1,166 @@
+# tests/test_async_core.py
+
+import asyncio
+import os
+import time
+import pytest
+import pandas as pd
+from unittest.mock import AsyncMock, MagicMock, patch
+from mysql.connector import FieldType
+from src.database.async_core import AsyncCore
+from src.database.async_operations import AsyncOperations
+from src.database.bulk import MARKET_DATA_KEY, MARKET_DATA_CONFLICT_POLICIES
+from src.database.config import Config
+from src.database.pool import AsyncConnectionPool, PoolTimeoutError
+
+ROWS = [
+    (b'AAPL', b'100.0000', b'1000'),
+    (b'AAPL', b'101.0000', b'2000'),
+    (b'AAPL', b'102.0000', b'3000')
+]
+
+def make_cursor(latency: float = 0.0):
+    """Create async cursor returning ROWS in fetchmany chunks"""
+    cursor = MagicMock()
+    cursor.description = [
+        ('symbol', FieldType.VAR_STRING),
+        ('close', FieldType.NEWDECIMAL),
+        ('volume', FieldType.LONGLONG)
+    ]
+    remaining = list(ROWS)
+
+    async def execute(query, params=None):
+        await asyncio.sleep(latency)
+
+    async def fetchmany(size):
+        batch = remaining[:size]
+        del remaining[:size]
+        return batch
+
+    cursor.execute = AsyncMock(side_effect=execute)
+    cursor.fetchmany = AsyncMock(side_effect=fetchmany)
+    cursor.fetchall = AsyncMock(return_value=[(64 * 1024 * 1024,)])
+    cursor.close = AsyncMock()
+    return cursor
+
+def make_connection(latency: float = 0.0):
+    """Create async connection mock with a fresh cursor per call"""
+    cnx = MagicMock()
+    cnx.unread_result = False
+    cnx.cursors = []
+
+    async def cursor(**kwargs):
+        cnx.cursors.append(make_cursor(latency))
+        return cnx.cursors[-1]
+
+    cnx.cursor = AsyncMock(side_effect=cursor)
+    for name in ('commit', 'rollback', 'close', 'ping', 'consume_results'):
+        setattr(cnx, name, AsyncMock())
+    return cnx
+
+@pytest.fixture
+def connect():
+    """Async connect factory returning mock connections"""
+    async def factory(**params):
+        return make_connection(latency=0.05)
+    return AsyncMock(side_effect=factory)
+
+@pytest.fixture
+def core(connect):
+    """Create AsyncCore over mock aio connections"""
+    with patch.dict(os.environ, {
+        'DB_USER': 'test_user',
+        'DB_PASSWORD': 'test_pass',
+        'DB_DATABASE': 'test_db'
+    }), patch('src.database.pool.mysql.connector.aio.connect', connect):
+        yield AsyncCore(Config(pool_size=5))
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_overlap(core, connect):
+    """Test concurrent queries run side by side on separate connections"""
+    start = time.perf_counter()
+    await asyncio.gather(*(core.execute("SELECT 1") for _ in range(5)))
+    elapsed = time.perf_counter() - start
+
+    # Five 50ms queries serialised would take 250ms
+    assert elapsed < 0.2
+    assert connect.call_count == 5
+    assert core.pool_stats()['in_use'] == 0
+
+@pytest.mark.asyncio
+async def test_iter_frames_streams_chunks(core):
+    """Test async streaming over an unbuffered raw cursor"""
+    frames = [f async for f in core.iter_frames("SELECT * FROM market_data", chunk_size=2)]
+
+    assert [len(f) for f in frames] == [2, 1]
+    assert frames[0]['close'].dtype == 'float64'
+    cnx = core.pool._idle[0][0]
+    cnx.cursor.assert_called_once_with(buffered=False, dictionary=False, raw=True)
+
+@pytest.mark.asyncio
+async def test_early_stop_drains_connection(core):
+    """Test abandoning an async stream drains unread rows before release"""
+    await core.open()
+    cnx = core.pool._idle[0][0]
+    cnx.unread_result = True
+
+    frames = core.iter_frames("SELECT * FROM market_data", chunk_size=1)
+    await frames.__anext__()
+    await frames.aclose()
+
+    cnx.consume_results.assert_awaited()
+    assert core.pool_stats()['in_use'] == 0
+
+@pytest.mark.asyncio
+async def test_transaction_rolls_back(core):
+    """Test failures inside an async transaction roll back"""
+    with pytest.raises(ValueError):
+        async with core.transaction() as conn:
+            cnx = conn._cnx
+            raise ValueError("boom")
+
+    cnx.commit.assert_not_awaited()
+    cnx.rollback.assert_awaited()
+
+@pytest.mark.asyncio
+async def test_upsert_many_batches(core):
+    """Test AsyncOperations.upsert_many sends batched upserts"""
+    frame = pd.DataFrame({
+        'symbol': ['AAPL'] * 3,
+        'timestamp': pd.date_range('2024-01-02', periods=3, freq='D'),
+        'data_type': ['STOCK'] * 3,
+        'high': [1.0, 2.0, 3.0],
+        'low': [0.5, 1.5, 2.5]
+    })
+    ops = AsyncOperations(core)
+    stats = await ops.upsert_many('market_data', frame, MARKET_DATA_KEY,
+                                  MARKET_DATA_CONFLICT_POLICIES)
+
+    cnx = core.pool._idle[0][0]
+    queries = [c.args[0] for c in cnx.cursors[0].execute.call_args_list]
+    assert queries[0] == "SELECT @@max_allowed_packet"
+    assert 'high = GREATEST(high, VALUES(high))' in queries[1]
+    assert stats.rows == 3 and stats.batches == 1
+    cnx.commit.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_async_pool_timeout():
+    """Test checkout gives up after the bounded wait"""
+    async def factory(**params):
+        return make_connection()
+    pool = AsyncConnectionPool({}, min_size=0, max_size=1, connect=factory)
+    held = await pool.get_connection()
+
+    with pytest.raises(PoolTimeoutError):
+        await pool.get_connection(timeout=0.05)
+
+    waiter = asyncio.create_task(pool.get_connection(timeout=1))
+    await asyncio.sleep(0.01)
+    assert pool.get_stats()['waiters'] == 1
+    await held.close()
+    conn = await waiter
+
+    assert pool.get_stats()['timeouts'] == 1
+    assert pool.get_stats()['size'] == 1
+    await conn.close()
+    await pool.close()
@@ -0,0 +1,127 @@
+# tests/test_async_memo.py
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from src.cache.async_memo import AsyncMemo, async_memoize
+
+class Upstream:
+    """Counts calls to a slow coroutine"""
+
+    def __init__(self, delay: float = 0.01):
+        self.calls = 0
+        self.delay = delay
+
+    async def fetch(self, symbol: str, fail: bool = False):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if fail:
+            raise ConnectionError(symbol)
+        return f"{symbol}-{self.calls}"
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_fetch():
+    """Test concurrent misses for one key run the function once"""
+    upstream = Upstream()
+    memo = AsyncMemo(upstream.fetch)
+
+    results = await asyncio.gather(*(memo('AAPL') for _ in range(20)))
+
+    assert upstream.calls == 1
+    assert set(results) == {'AAPL-1'}
+    stats = memo.get_stats()
+    assert stats['misses'] == 1
+    assert stats['joins'] == 19
+    assert stats['inflight'] == 0
+
+@pytest.mark.asyncio
+async def test_results_expire_after_ttl():
+    """Test cached results are reused until their ttl passes"""
+    upstream = Upstream(delay=0)
+    memo = AsyncMemo(upstream.fetch, ttl=10)
+
+    with patch('src.cache.async_memo.time.monotonic', return_value=100.0):
+        assert await memo('AAPL') == 'AAPL-1'
+        assert await memo('AAPL') == 'AAPL-1'
+    with patch('src.cache.async_memo.time.monotonic', return_value=111.0):
+        assert await memo('AAPL') == 'AAPL-2'
+    assert memo.get_stats()['hits'] == 1
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    """Test the least recently used key is evicted past maxsize"""
+    upstream = Upstream(delay=0)
+    memo = AsyncMemo(upstream.fetch, maxsize=2)
+
+    await memo('AAPL')
+    await memo('MSFT')
+    await memo('AAPL')
+    await memo('GOOG')
+
+    assert memo.get_stats()['evictions'] == 1
+    assert memo.invalidate('AAPL')
+    assert not memo.invalidate('MSFT')
+
+@pytest.mark.asyncio
+async def test_errors_not_cached():
+    """Test a failure reaches every waiter and the next call retries"""
+    upstream = Upstream()
+    memo = AsyncMemo(upstream.fetch)
+
+    results = await asyncio.gather(memo('AAPL', fail=True), memo('AAPL', fail=True),
+                                   return_exceptions=True)
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert upstream.calls == 1
+
+    assert await memo('AAPL') == 'AAPL-2'
+    assert memo.get_stats()['errors'] == 1
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_keeps_shared_fetch():
+    """Test cancelling one waiter does not cancel the fetch others await"""
+    upstream = Upstream(delay=0.05)
+    memo = AsyncMemo(upstream.fetch)
+
+    first = asyncio.ensure_future(memo('AAPL'))
+    second = asyncio.ensure_future(memo('AAPL'))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == 'AAPL-1'
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert upstream.calls == 1
+
+@pytest.mark.asyncio
+async def test_zero_ttl_only_deduplicates():
+    """Test ttl=0 collapses concurrent calls without caching results"""
+    upstream = Upstream()
+    memo = AsyncMemo(upstream.fetch, ttl=0)
+
+    await asyncio.gather(memo('AAPL'), memo('AAPL'))
+    await memo('AAPL')
+
+    assert upstream.calls == 2
+    assert memo.get_stats()['size'] == 0
+
+@pytest.mark.asyncio
+async def test_decorator_per_instance():
+    """Test decorated methods keep a separate memo per instance"""
+    class Source:
+        def __init__(self):
+            self.calls = 0
+
+        @async_memoize(maxsize=10, ttl=60)
+        async def fetch_data(self, symbol):
+            self.calls += 1
+            return symbol
+
+    a, b = Source(), Source()
+    await asyncio.gather(a.fetch_data('AAPL'), a.fetch_data('AAPL'), b.fetch_data('AAPL'))
+    await a.fetch_data('AAPL')
+
+    assert (a.calls, b.calls) == (1, 1)
+    assert a.fetch_data is a.fetch_data
+    a.fetch_data.clear()
+    await a.fetch_data('AAPL')
+    assert a.calls == 2
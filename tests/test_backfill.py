@@ -0,0 +1,114 @@
+# tests/test_backfill.py
+
+import asyncio
+import pytest
+import pandas as pd
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+from src.database.bulk import BulkLoader
+from src.database.core import Core
+from src.fetch_modules.backfill import (
+    BackfillEngine, Chunk, PAGE_LIMIT, default_job_id, parse_timeframe, plan_chunks
+)
+from src.fetch_modules.base.rate_limiter import Priority, current_priority
+
+class FakeClient:
+    """Async client stand-in returning one daily bar per requested day"""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+        self.running = 0
+        self.peak = 0
+        self.priorities = set()
+
+    async def get_market_data(self, symbol, start, end, timespan='day', multiplier=1):
+        self.calls.append((symbol, start, end, timespan, multiplier))
+        self.priorities.add(current_priority.get())
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.running -= 1
+        if (symbol, start) in self.fail:
+            raise ConnectionError('upstream reset')
+        days = pd.date_range(start, end, freq='D')
+        return pd.DataFrame({'symbol': symbol, 'open': 10.0, 'high': 11.0, 'low': 9.0,
+                             'close': 10.5, 'volume': 100, 'vwap': 10.2, 'transactions': 3},
+                            index=pd.Index(days, name='timestamp'))
+
+def mock_core(done=()):
+    core = MagicMock(spec=Core)
+    core.execute.return_value = [
+        {'symbol': s, 'timeframe': tf, 'chunk_start': start} for s, tf, start in done
+    ]
+    return core
+
+def executed(core):
+    cursor = core.transaction.return_value.__enter__.return_value.cursor.return_value
+    return [(call.args + (None,))[:2] for call in cursor.execute.call_args_list]
+
+def test_chunks_sized_to_page_limit():
+    """Test chunks hold at most one page of bars and tile the range"""
+    chunks = plan_chunks('AAPL', '1m', '2024-01-01', '2024-12-31')
+    assert (chunks[0].end - chunks[0].start).days + 1 == PAGE_LIMIT // 960
+    assert chunks[0].start == date(2024, 1, 1) and chunks[-1].end == date(2024, 12, 31)
+    assert all(b.start == a.end + timedelta(days=1) for a, b in zip(chunks, chunks[1:]))
+
+    # The page limit counts base minutes, so 5m chunks are no longer than 1m ones
+    assert plan_chunks('AAPL', '5m', '2024-01-01', '2024-12-31') == [
+        Chunk('AAPL', '5m', chunk.start, chunk.end) for chunk in chunks
+    ]
+    assert len(plan_chunks('AAPL', '1d', '2000-01-01', '2024-12-31')) == 1
+    assert parse_timeframe('15m') == (15, 'minute')
+    with pytest.raises(ValueError):
+        parse_timeframe('1w')
+
+@pytest.mark.asyncio
+async def test_chunks_fetched_concurrently_at_backfill_priority():
+    """Test workers fetch chunks in parallel, below interactive traffic"""
+    client = FakeClient()
+    core = mock_core()
+    engine = BackfillEngine(client, core, concurrency=3, page_limit=10)
+
+    report = await engine.run(['AAPL', 'MSFT'], '1d', '2024-01-01', '2024-01-30')
+
+    assert (report.total, report.done, report.failed) == (6, 6, 0)
+    assert report.rows == 60 and report.complete
+    assert client.peak == 3
+    assert client.priorities == {Priority.BACKFILL}
+    assert current_priority.get() == Priority.INTERACTIVE
+
+@pytest.mark.asyncio
+async def test_bars_and_checkpoint_written_in_one_transaction():
+    """Test each chunk's upsert and done marker share a transaction"""
+    core = mock_core()
+    engine = BackfillEngine(FakeClient(), core, page_limit=10,
+                            bulk_loader=BulkLoader(max_packet=1 << 20))
+
+    await engine.run(['AAPL'], '1d', '2024-01-01', '2024-01-10', job_id='job-1')
+
+    statements = [sql for sql, _ in executed(core) if "'running'" not in sql]
+    insert = next(i for i, sql in enumerate(statements) if 'INSERT INTO market_data' in sql)
+    assert 'ON DUPLICATE KEY UPDATE' in statements[insert]
+    assert "status = 'done'" in statements[insert + 1]
+    register_sql, rows = core.execute_many.call_args.args
+    assert 'INSERT INTO backfill_progress' in register_sql
+    assert rows == [('job-1', 'AAPL', '1d', date(2024, 1, 1), date(2024, 1, 10))]
+
+@pytest.mark.asyncio
+async def test_resume_skips_done_chunks_and_records_failures():
+    """Test a rerun fetches only unfinished chunks and a failure is checkpointed"""
+    client = FakeClient(fail={('AAPL', date(2024, 1, 21))})
+    core = mock_core(done=[('AAPL', '1d', date(2024, 1, 1))])
+    engine = BackfillEngine(client, core, page_limit=10)
+
+    report = await engine.run(['AAPL'], '1d', '2024-01-01', '2024-01-30')
+
+    assert [call[1] for call in client.calls] == [date(2024, 1, 11), date(2024, 1, 21)]
+    assert (report.skipped, report.done, report.failed) == (1, 1, 1)
+    assert not report.complete
+    failed = [params for sql, params in executed(core) if "status = 'failed'" in sql]
+    assert failed == [('upstream reset', report.job_id, 'AAPL', '1d', date(2024, 1, 21))]
+    assert report.job_id == default_job_id(['AAPL'], '1d', '2024-01-01', '2024-01-30')
@@ -0,0 +1,168 @@
+# tests/test_bulk_loader.py
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+from src.database.bulk import (
+    BulkLoader, MARKET_DATA_KEY, MARKET_DATA_CONFLICT_POLICIES,
+    frame_to_rows, market_data_frame, upsert_clause
+)
+from src.database.operations import Operations
+
+@pytest.fixture
+def bars():
+    """Create a small OHLCV frame"""
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-02 09:30', periods=5, freq='min'),
+        'open': [100.0, 101.0, 102.0, 103.0, 104.0],
+        'high': [101.0, 102.0, 103.0, 104.0, 105.0],
+        'low': [99.0, 100.0, 101.0, 102.0, 103.0],
+        'close': [100.5, 101.5, 102.5, 103.5, 104.5],
+        'volume': [1000, 2000, 3000, 4000, 5000],
+        'vwap': [100.2, np.nan, 102.2, 103.2, 104.2]
+    })
+
+@pytest.fixture
+def mock_cursor():
+    """Create mock cursor reporting a max_allowed_packet"""
+    cursor = MagicMock()
+    cursor.fetchall.return_value = [(64 * 1024 * 1024,)]
+    return cursor
+
+def test_frame_to_rows_native_types(bars):
+    """Test column-wise conversion to driver-friendly values"""
+    rows = frame_to_rows(bars, ['timestamp', 'volume', 'vwap'])
+
+    assert len(rows) == 5
+    assert rows[0][0] == pd.Timestamp('2024-01-02 09:30')
+    assert type(rows[0][1]) is int
+    assert type(rows[0][2]) is float
+    assert rows[1][2] is None
+
+def test_single_statement_for_small_frame(bars, mock_cursor):
+    """Test that a small frame is sent as one multi-row INSERT"""
+    loader = BulkLoader()
+    stats = loader.load_frame('market_data', bars, cursor=mock_cursor)
+
+    inserts = [c for c in mock_cursor.execute.call_args_list
+               if c.args[0].startswith('INSERT')]
+    assert len(inserts) == 1
+    query, params = inserts[0].args
+    assert query.count('(%s, %s, %s, %s, %s, %s, %s)') == 5
+    assert len(params) == 35
+    assert stats.rows == 5
+    assert stats.batches == 1
+
+def test_batches_sized_to_packet_limit(bars, mock_cursor):
+    """Test that a small max_allowed_packet splits the load"""
+    loader = BulkLoader(max_packet=600)
+    stats = loader.load_frame('market_data', bars, cursor=mock_cursor)
+
+    assert stats.batches > 1
+    assert stats.rows == 5
+    mock_cursor.execute.assert_called()
+    for call in mock_cursor.execute.call_args_list:
+        assert call.args[0].startswith('INSERT')
+
+def test_max_packet_read_once(bars, mock_cursor):
+    """Test server packet limit is queried once and reused"""
+    loader = BulkLoader()
+    loader.load_frame('market_data', bars, cursor=mock_cursor)
+    loader.load_frame('market_data', bars, cursor=mock_cursor)
+
+    queries = [c.args[0] for c in mock_cursor.execute.call_args_list]
+    assert queries.count("SELECT @@max_allowed_packet") == 1
+    assert loader.max_packet == 64 * 1024 * 1024
+
+def test_empty_frame_is_noop(mock_cursor):
+    """Test nothing is sent for an empty frame"""
+    stats = BulkLoader().load_frame('market_data', pd.DataFrame(), cursor=mock_cursor)
+
+    assert stats.rows == 0
+    mock_cursor.execute.assert_not_called()
+
+def test_infile_mode(bars, mock_cursor):
+    """Test LOAD DATA LOCAL INFILE path"""
+    loader = BulkLoader(use_infile=True)
+    stats = loader.load_frame('market_data', bars, cursor=mock_cursor)
+
+    query = mock_cursor.execute.call_args.args[0]
+    assert 'LOAD DATA LOCAL INFILE' in query
+    assert stats.rows == 5
+
+def test_market_data_frame_normalizes_columns(bars):
+    """Test bar frames are mapped onto market_data columns"""
+    source = bars.set_index('timestamp').assign(transactions=10)
+    frame = market_data_frame(source, 'AAPL')
+
+    assert list(frame.columns) == [
+        'symbol', 'timestamp', 'data_type', 'open', 'high', 'low', 'close',
+        'volume', 'vwap', 'number_of_trades'
+    ]
+    assert (frame['symbol'] == 'AAPL').all()
+    assert (frame['data_type'] == 'STOCK').all()
+
+@pytest.fixture
+def mock_core(mock_cursor):
+    """Create mock core whose transaction yields the mock cursor"""
+    core = MagicMock()
+    core.config.allow_local_infile = False
+    conn = MagicMock()
+    conn.cursor.return_value = mock_cursor
+    core.transaction.return_value.__enter__.return_value = conn
+    return core
+
+def test_operations_bulk_insert_uses_transaction(bars, mock_core, mock_cursor):
+    """Test Operations.bulk_insert commits through the core transaction"""
+    stats = Operations(mock_core).bulk_insert('market_data', bars)
+
+    mock_core.transaction.assert_called_once()
+    mock_cursor.close.assert_called_once()
+    assert stats.rows == 5
+
+def test_upsert_clause_policies():
+    """Test conflict policies map to ON DUPLICATE KEY UPDATE assignments"""
+    clause = upsert_clause(
+        ['symbol', 'timestamp', 'data_type', 'open', 'high', 'low', 'close', 'source'],
+        MARKET_DATA_KEY,
+        {**MARKET_DATA_CONFLICT_POLICIES, 'source': 'keep'}
+    )
+
+    assert clause == (
+        " ON DUPLICATE KEY UPDATE open = VALUES(open), "
+        "high = GREATEST(high, VALUES(high)), low = LEAST(low, VALUES(low)), "
+        "close = VALUES(close)"
+    )
+
+def test_upsert_clause_all_keep():
+    """Test that keeping every column still yields valid SQL"""
+    clause = upsert_clause(['symbol', 'open'], ['symbol'], {'open': 'keep'})
+    assert clause == " ON DUPLICATE KEY UPDATE symbol = symbol"
+
+def test_upsert_clause_unknown_policy():
+    """Test unknown policies are rejected"""
+    with pytest.raises(ValueError):
+        upsert_clause(['symbol', 'open'], ['symbol'], {'open': 'sum'})
+
+def test_upsert_many_one_statement_per_batch(bars, mock_core, mock_cursor):
+    """Test upsert_many sends batched upserts"""
+    frame = bars.assign(symbol='AAPL', data_type='STOCK')
+    stats = Operations(mock_core).upsert_many(
+        'market_data', frame, MARKET_DATA_KEY, MARKET_DATA_CONFLICT_POLICIES
+    )
+
+    inserts = [c.args[0] for c in mock_cursor.execute.call_args_list
+               if c.args[0].startswith('INSERT')]
+    assert len(inserts) == stats.batches == 1
+    assert inserts[0].endswith("vwap = VALUES(vwap)")
+    assert 'high = GREATEST(high, VALUES(high))' in inserts[0]
+    assert stats.rows == 5
+
+def test_upsert_bypasses_infile(bars, mock_cursor):
+    """Test upserts fall back to INSERT when LOAD DATA is enabled"""
+    loader = BulkLoader(use_infile=True)
+    clause = upsert_clause(list(bars.columns), ['timestamp'])
+    loader.load_frame('market_data', bars, cursor=mock_cursor, on_duplicate=clause)
+
+    assert mock_cursor.execute.call_args.args[0].startswith('INSERT')
@@ -0,0 +1,185 @@
+# tests/test_change_events.py
+
+import gc
+import pytest
+import pandas as pd
+from datetime import datetime
+from unittest.mock import MagicMock
+from src.cache.disk_cache import DiskCache
+from src.cache.events import ChangeBus, ChangeEvent
+from src.cache.memory_cache import MemoryCache
+from src.cache.query_cache import QueryCache
+from src.cache.range_cache import RangeCache
+from src.database.core import Core
+
+class Source:
+    """Daily bars with close 1.0 that count fetched spans"""
+
+    def __init__(self):
+        self.spans = []
+
+    async def fetch(self, symbol, start, end, timeframe):
+        self.spans.append((start, end))
+        days = pd.bdate_range(start, end, name='timestamp')
+        return pd.DataFrame({'close': 1.0, 'volume': 100}, index=days)
+
+def written(start, end, close=2.0) -> pd.DataFrame:
+    """Bars as a writer stores them, with timestamp as a column"""
+    days = pd.bdate_range(start, end)
+    return pd.DataFrame({'timestamp': days, 'symbol': 'AAPL',
+                         'close': close, 'volume': 200})
+
+class Listener:
+    def __init__(self):
+        self.events = []
+
+    def on_change(self, event):
+        self.events.append(event)
+
+    def on_changes(self, events):
+        self.events.append(list(events))
+
+def test_bus_holds_methods_weakly_and_isolates_failures():
+    """Test dead subscribers are pruned and a failing handler does not block others"""
+    bus = ChangeBus()
+    listener = Listener()
+    bus.subscribe(listener.on_change)
+
+    def broken(event):
+        raise RuntimeError('boom')
+    bus.subscribe(broken)
+
+    event = ChangeEvent('AAPL', datetime(2024, 1, 8), datetime(2024, 1, 9))
+    assert bus.publish(event) == 1
+    assert listener.events == [event]
+
+    del listener
+    gc.collect()
+    assert bus.publish(event) == 0
+    assert bus.publish(None) == 0
+
+def test_batches_reach_batch_handlers_once():
+    """Test publish_many calls batch handlers once and others per event"""
+    bus = ChangeBus()
+    batched, single = Listener(), Listener()
+    bus.subscribe(batched.on_change, batched.on_changes)
+    bus.subscribe(single.on_change)
+
+    events = [ChangeEvent(symbol, datetime(2024, 1, 8), datetime(2024, 1, 8))
+              for symbol in ('AAPL', 'MSFT', 'NVDA')]
+    assert bus.publish_many(events + [None]) == 2
+    assert batched.events == [events]
+    assert single.events == events
+    assert bus.publish_many([]) == 0
+
+def test_event_from_frame():
+    """Test events span the written timestamps"""
+    event = ChangeEvent.from_frame('AAPL', written('2024-01-08', '2024-01-12'), '1d')
+
+    assert (event.start, event.end) == (datetime(2024, 1, 8), datetime(2024, 1, 12))
+    assert event.overlaps('2024-01-12', '2024-01-20')
+    assert not event.overlaps('2024-01-13', '2024-01-20')
+    assert ChangeEvent.from_frame('AAPL', pd.DataFrame()) is None
+
+@pytest.mark.asyncio
+async def test_written_bars_patched_in_place():
+    """Test bars written for a cached series replace cached bars without refetch"""
+    source = Source()
+    cache = RangeCache()
+    await cache.get('AAPL', '1d', datetime(2024, 1, 8), datetime(2024, 1, 19), source.fetch)
+
+    event = ChangeEvent.from_frame('AAPL', written('2024-01-11', '2024-01-12'), '1d')
+    assert cache.apply(event) == 1
+
+    data = await cache.get('AAPL', '1d', datetime(2024, 1, 8), datetime(2024, 1, 19), source.fetch)
+    assert len(source.spans) == 1
+    assert data['close'].tolist() == [1.0] * 3 + [2.0] * 2 + [1.0] * 5
+    assert list(data.columns) == ['close', 'volume']
+    assert cache.get_stats()['patched'] == 1
+
+@pytest.mark.asyncio
+async def test_change_without_bars_invalidates_only_its_range():
+    """Test a change with no bars refetches just the changed sessions"""
+    source = Source()
+    cache = RangeCache()
+    await cache.get('AAPL', '1d', datetime(2024, 1, 8), datetime(2024, 1, 19), source.fetch)
+    await cache.get('AAPL', '1h', datetime(2024, 1, 8), datetime(2024, 1, 19), source.fetch)
+
+    cache.apply(ChangeEvent('AAPL', datetime(2024, 1, 10), datetime(2024, 1, 11), '1d'))
+
+    assert cache.coverage('AAPL', '1d') == [
+        (datetime(2024, 1, 8).date(), datetime(2024, 1, 9).date()),
+        (datetime(2024, 1, 12).date(), datetime(2024, 1, 19).date())
+    ]
+    assert len(cache.coverage('AAPL', '1h')) == 1
+
+    await cache.get('AAPL', '1d', datetime(2024, 1, 8), datetime(2024, 1, 19), source.fetch)
+    assert source.spans[-1] == (datetime(2024, 1, 10), datetime(2024, 1, 11, 23, 59, 59, 999999))
+
+@pytest.mark.asyncio
+async def test_stored_segments_rewritten_after_change(tmp_path):
+    """Test the disk tier drops a changed series and rewrites it from memory"""
+    source = Source()
+    cache = RangeCache(store=DiskCache(str(tmp_path)))
+    await cache.get('AAPL', '1d', datetime(2024, 1, 8), datetime(2024, 1, 12), source.fetch)
+
+    cache.apply(ChangeEvent.from_frame('AAPL', written('2024-01-10', '2024-01-10'), '1d'))
+    assert cache.store.series('AAPL', '1d') == []
+
+    await cache.get('AAPL', '1d', datetime(2024, 1, 8), datetime(2024, 1, 12), source.fetch)
+    warm = RangeCache(store=DiskCache(str(tmp_path)))
+    data = await warm.get('AAPL', '1d', datetime(2024, 1, 8), datetime(2024, 1, 12), source.fetch)
+    assert data['close'].tolist() == [1.0, 1.0, 2.0, 1.0, 1.0]
+    assert len(source.spans) == 1
+
+@pytest.mark.asyncio
+async def test_memory_and_shared_tiers_invalidated():
+    """Test overlapping L1 keys are removed and L2 rows deleted by range"""
+    l1 = MemoryCache()
+    await l1.set('AAPL:1d:2024-01-01:2024-01-09', 1)
+    await l1.set('AAPL:1d:2024-01-15:2024-01-19', 2)
+    await l1.set('MSFT:1d:2024-01-01:2024-01-09', 3)
+    event = ChangeEvent('AAPL', datetime(2024, 1, 8), datetime(2024, 1, 10))
+
+    removed = l1.remove_where('AAPL', lambda key: event.overlaps(*key.split(':')[2:]))
+    assert removed == 1
+    assert sorted(await l1.get_all_keys()) == [
+        'AAPL:1d:2024-01-15:2024-01-19', 'MSFT:1d:2024-01-01:2024-01-09'
+    ]
+
+    core = MagicMock(spec=Core)
+    cursor = core.transaction.return_value.__enter__.return_value.cursor.return_value
+    cursor.rowcount = 2
+    l2 = QueryCache(core)
+    l2.on_change(event)
+    await l2.stop()
+
+    sql, params = cursor.execute.call_args.args
+    assert sql.split() == [
+        'DELETE', 'FROM', 'query_cache', 'WHERE', 'symbol', '=', '%s', 'AND',
+        'range_start', '<=', '%s', 'AND', 'range_end', '>=', '%s'
+    ]
+    assert params == ('AAPL', event.end, event.start)
+    assert l2.get_stats()['invalidated'] == 2
+
+@pytest.mark.asyncio
+async def test_shared_tier_invalidates_batches_in_one_statement():
+    """Test a batch of same-range changes becomes one DELETE ... IN"""
+    core = MagicMock(spec=Core)
+    cursor = core.transaction.return_value.__enter__.return_value.cursor.return_value
+    cursor.rowcount = 3
+    l2 = QueryCache(core, invalidate_batch=2)
+    day = datetime(2024, 1, 8)
+    events = [ChangeEvent(symbol, day, day) for symbol in ('MSFT', 'AAPL', 'NVDA')]
+    events.append(ChangeEvent('AAPL', datetime(2024, 1, 9), datetime(2024, 1, 9)))
+    l2.on_changes(events)
+    await l2.stop()
+
+    assert core.transaction.call_count == 1
+    statements = [call.args for call in cursor.execute.call_args_list]
+    assert [params for _, params in statements] == [
+        ('AAPL', 'MSFT', day, day), ('NVDA', day, day),
+        ('AAPL', datetime(2024, 1, 9), datetime(2024, 1, 9))
+    ]
+    assert 'symbol IN (%s, %s)' in statements[0][0]
+    assert l2.get_stats()['invalidated'] == 9
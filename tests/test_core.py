@@ -0,0 +1,121 @@
+# tests/test_core.py
+
+import os
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock, patch
+from mysql.connector import FieldType
+from src.database.config import Config
+from src.database.core import Core
+from src.database.operations import Operations
+
+ROWS = [
+    (b'AAPL', b'100.0000', b'1000'),
+    (b'AAPL', b'101.0000', b'2000'),
+    (b'AAPL', b'102.0000', b'3000')
+]
+
+@pytest.fixture
+def config():
+    """Create config from test environment"""
+    with patch.dict(os.environ, {
+        'DB_USER': 'test_user',
+        'DB_PASSWORD': 'test_pass',
+        'DB_DATABASE': 'test_db'
+    }):
+        return Config()
+
+@pytest.fixture
+def mock_cursor():
+    """Create unbuffered-style cursor returning ROWS in fetchmany chunks"""
+    cursor = MagicMock()
+    cursor.description = [
+        ('symbol', FieldType.VAR_STRING),
+        ('close', FieldType.NEWDECIMAL),
+        ('volume', FieldType.LONGLONG)
+    ]
+    remaining = list(ROWS)
+
+    def fetchmany(size):
+        batch = remaining[:size]
+        del remaining[:size]
+        return batch
+
+    cursor.fetchmany.side_effect = fetchmany
+    return cursor
+
+@pytest.fixture
+def mock_connection(mock_cursor):
+    """Create pooled connection mock"""
+    conn = MagicMock()
+    conn.cursor.return_value = mock_cursor
+    conn.unread_result = False
+    return conn
+
+@pytest.fixture
+def core(config, mock_connection):
+    """Create Core over a mocked connection pool"""
+    with patch('src.database.core.ConnectionPool') as pool_cls:
+        pool_cls.return_value.get_connection.return_value = mock_connection
+        yield Core(config)
+
+def test_pool_uses_config(config):
+    """Test pool sizing comes from Config instead of hardcoded values"""
+    config.pool_size = 12
+    config.pool_name = 'api_pool'
+    with patch('src.database.core.ConnectionPool') as pool_cls:
+        Core(config)
+
+    kwargs = pool_cls.call_args.kwargs
+    assert kwargs['max_size'] == 12
+    assert kwargs['pool_name'] == 'api_pool'
+    assert kwargs['min_size'] == config.pool_min_size
+
+def test_iter_frames_chunks(core, mock_connection):
+    """Test results are streamed in bounded chunks"""
+    frames = list(core.iter_frames("SELECT * FROM market_data", chunk_size=2))
+
+    assert [len(f) for f in frames] == [2, 1]
+    assert list(frames[0].columns) == ['symbol', 'close', 'volume']
+    assert frames[0]['close'].dtype == 'float64'
+    assert frames[0]['volume'].dtype == 'int64'
+    mock_connection.cursor.assert_called_once_with(buffered=False, dictionary=False, raw=True)
+    mock_connection.close.assert_called_once()
+
+def test_iter_rows_yields_each_row(core, mock_connection, mock_cursor):
+    """Test row iteration uses a dictionary cursor"""
+    rows = list(core.iter_rows("SELECT * FROM market_data", batch_size=2))
+
+    assert rows == ROWS
+    mock_connection.cursor.assert_called_once_with(buffered=False, dictionary=True, raw=False)
+    mock_cursor.close.assert_called_once()
+
+def test_early_stop_drains_connection(core, mock_connection):
+    """Test abandoning a stream drains unread rows before release"""
+    mock_connection.unread_result = True
+    frames = core.iter_frames("SELECT * FROM market_data", chunk_size=1)
+    next(frames)
+    frames.close()
+
+    mock_connection.consume_results.assert_called_once()
+    mock_connection.close.assert_called_once()
+
+def test_iter_select_builds_query(core, mock_cursor):
+    """Test Operations.iter_select streams a filtered select"""
+    ops = Operations(core)
+    frame = pd.concat(ops.iter_select('market_data', {'symbol': 'AAPL'},
+                                      order_by='timestamp', chunk_size=2))
+
+    mock_cursor.execute.assert_called_once_with(
+        "SELECT * FROM market_data WHERE symbol = %s ORDER BY timestamp", ('AAPL',)
+    )
+    assert len(frame) == 3
+
+def test_fetch_frame_uses_raw_cursor(core, mock_connection, mock_cursor):
+    """Test fetch_frame decodes raw rows into scaled integer prices"""
+    mock_cursor.fetchall.return_value = ROWS
+    frame = core.fetch_frame("SELECT * FROM market_data", price_scale=4)
+
+    mock_connection.cursor.assert_called_once_with(raw=True)
+    assert frame['close'].tolist() == [1000000, 1010000, 1020000]
+    assert frame['symbol'].tolist() == ['AAPL'] * 3
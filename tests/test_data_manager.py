@@ -1,12 +1,19 @@
 # tests/test_data_manager.py
 
+import asyncio
+import json
 import pytest
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import pandas as pd
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 # Update relative imports from src directory
-from src.data_manager import DataManager
+from src.data_manager import DataManager, DataSource
+from src.database.core import Core
+from src.database.partitions import to_days
+from src.database_client import DatabaseClient
+from src.fetch_modules.backfill import BackfillReport
+from src.fetch_modules.incremental import Gap
 from src.models import MarketData, MarketDataRequest
 from src.fetch_modules.mock.mock_api import MockAPIClient
 from src.exceptions import DataValidationError
@@ -36,4 +43,131 @@ async def test_get_market_data():
     
     assert isinstance(result, dict)
     assert "data" in result
-    assert isinstance(result["data"], pd.DataFrame)
\ No newline at end of file
+    assert isinstance(result["data"], pd.DataFrame)
+def polygon_bars(symbol, start_date, end_date, timespan='day', multiplier=1):
+    """Aggregates as PolygonClient.get_market_data returns them"""
+    days = pd.bdate_range(start_date.date(), end_date.date(), name='timestamp')
+    return pd.DataFrame({'symbol': symbol, 'open': 100.0, 'high': 101.0, 'low': 99.0,
+                         'close': 100.5, 'volume': 1000, 'vwap': 100.2,
+                         'transactions': 10}, index=days)
+
+@pytest.fixture
+def configured(tmp_path, monkeypatch):
+    """DataManager factory with a disk tier under tmp_path and no live database"""
+    config = tmp_path / 'data_config.json'
+    monkeypatch.setenv('POLYGON_API_KEY', 'test-key')
+    core = MagicMock(spec=Core)
+    core.execute.return_value = []
+    monkeypatch.setattr(DatabaseClient, 'core', property(lambda self: core))
+
+    def create(fetched, **cache):
+        config.write_text(json.dumps({
+            'database': {},
+            'cache': {'disk_dir': str(tmp_path / 'cache'), **cache}
+        }))
+        manager = DataManager(str(config))
+
+        async def get_market_data(*args, **kwargs):
+            fetched.append(args[:3])
+            return polygon_bars(*args, **kwargs)
+        manager.polygon_client.get_market_data = get_market_data
+        return manager
+    return create
+
+@pytest.mark.asyncio
+async def test_polygon_requests_use_range_and_disk_tiers(configured):
+    """Test API market data requests fill the range cache and survive a restart"""
+    fetched = []
+    manager = configured(fetched)
+    request = {'type': 'market_data', 'symbol': 'AAPL', 'source': 'polygon',
+               'start_date': '2024-01-08', 'end_date': '2024-01-12'}
+    result = await manager.process_request(request)
+    await manager.close()
+
+    assert result['status'] == 'success' and len(result['data']) == 5
+    assert manager.market_data.ranges.coverage('AAPL', '1d') == [
+        (date(2024, 1, 8), date(2024, 1, 12))
+    ]
+    assert len(manager.market_data.ranges.store.series('AAPL', '1d')) == 1
+
+    # A new process reads the stored segment instead of calling Polygon
+    restarted = configured(fetched)
+    result = await restarted.process_request({**request, 'start_date': '2024-01-09'})
+    await restarted.close()
+    assert len(result['data']) == 4
+    assert len(fetched) == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_polygon_requests_spread_over_shards(configured):
+    """Test concurrent symbols fill the striped L1 configured for DataManager"""
+    fetched = []
+    manager = configured(fetched, shards=4)
+    symbols = [f"SYM{i}" for i in range(32)]
+    results = await asyncio.gather(*(
+        manager.process_request({'type': 'market_data', 'symbol': symbol, 'source': 'polygon',
+                                 'start_date': '2024-01-08', 'end_date': '2024-01-12'})
+        for symbol in symbols
+    ))
+    stats = manager.market_data.cache.get_stats()
+    await manager.close()
+
+    assert all(len(result['data']) == 5 for result in results)
+    assert len(fetched) == len(symbols)
+    assert stats['shards'] == 4 and stats['size'] == len(symbols)
+    assert all(size > 0 for size in stats['shard_sizes'])
+
+def test_recency_ttl_only_for_polygon_reads(configured):
+    """Test closed ranges stay cached for Polygon but expire for stored data"""
+    manager = configured([], ttl_seconds=120)
+    closed = (datetime(2024, 1, 8), datetime(2024, 1, 12))
+
+    assert manager._memo_ttl('AAPL', *closed, DataSource.POLYGON) == float('inf')
+    assert manager._memo_ttl('AAPL', *closed, DataSource.DATABASE) == 120
+    assert manager._memo_ttl('AAPL', *closed, DataSource.MOCK) == 120
+
+@pytest.mark.asyncio
+async def test_partitions_maintained_at_start_and_periodically(configured):
+    """Test p_future is split when maintenance starts and again each interval"""
+    manager = configured([])
+    core = manager.db_client.core
+    core.config = MagicMock(partition_granularity='month', partitions_ahead=2)
+    core.execute.return_value = [
+        {'name': 'p3', 'bound': str(to_days(date.today().replace(day=1))), 'table_rows': 10},
+        {'name': 'p_future', 'bound': 'MAXVALUE', 'table_rows': 0}
+    ]
+    cursor = core.transaction.return_value.__enter__.return_value.cursor.return_value
+    manager.maintenance_interval = 0.01
+
+    await manager.start_maintenance()
+    assert cursor.execute.call_count == 1
+    assert 'REORGANIZE PARTITION p_future' in cursor.execute.call_args.args[0]
+
+    await asyncio.sleep(0.05)
+    await manager.close()
+    assert cursor.execute.call_count > 1
+    assert manager._maintainer is None
+
+    # A table without the catch-all is logged, not raised
+    core.execute.return_value = []
+    assert await manager.maintain_partitions() == []
+
+@pytest.mark.asyncio
+async def test_failed_gap_refill_is_not_settled(configured):
+    """Test a refill whose chunks failed is retried while a clean empty one settles"""
+    manager = configured([])
+    gap = Gap('AAPL', 'STOCK', date(2024, 1, 9), date(2024, 1, 9))
+    manager.backfill.run = AsyncMock(return_value=BackfillReport('job', total=1, failed=1))
+
+    with pytest.raises(RuntimeError):
+        await manager._refill_gap(gap)
+    assert manager.incremental.enqueue([gap]) == 1
+    await manager.incremental._refiller
+    assert manager.incremental.enqueue([gap]) == 1
+    await manager.incremental._refiller
+
+    manager.backfill.run.return_value = BackfillReport('job', total=1, done=1)
+    assert await manager._refill_gap(gap) == 0
+    assert manager.incremental.enqueue([gap]) == 1
+    await manager.incremental._refiller
+    assert manager.incremental.enqueue([gap]) == 0
+    await manager.close()
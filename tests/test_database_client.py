@@ -0,0 +1,135 @@
+# tests/test_database_client.py
+
+import os
+import threading
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock, Mock, patch
+from src.database import core as core_module
+from src.database_client import DatabaseClient
+from src.database_manager import DatabaseManager
+
+ENV = {
+    'DB_HOST': 'localhost',
+    'DB_USER': 'test_user',
+    'DB_PASSWORD': 'test_pass',
+    'DB_DATABASE': 'test_db'
+}
+
+@pytest.fixture
+def connect():
+    """Patch the driver connect used by the pool with mock connections"""
+    def factory(**params):
+        cnx = MagicMock()
+        cnx.unread_result = False
+        cursor = cnx.cursor.return_value
+        cursor.__enter__.return_value = cursor
+        cursor.fetchone.return_value = ('1.0.0',)
+        return cnx
+    with patch.dict(os.environ, ENV), \
+            patch.dict(core_module._shared_cores, clear=True), \
+            patch('src.database.pool.mysql.connector.connect', Mock(side_effect=factory)) as mock:
+        yield mock
+
+def test_clients_share_one_pool(connect):
+    """Test clients for the same database reuse a single Core"""
+    a = DatabaseClient()
+    b = DatabaseClient({'pool_size': 5, 'cache_ttl': 60})
+
+    assert a.core is b.core
+    assert connect.call_count == 1
+
+def test_execute_query_reuses_connection(connect):
+    """Test repeated queries check out pooled connections instead of reconnecting"""
+    client = DatabaseClient()
+    for _ in range(10):
+        client.execute_query("DELETE FROM market_data WHERE symbol = %s", ('AAPL',))
+
+    assert connect.call_count == 1
+    cnx = client.core.pool._idle[0][0]
+    assert cnx.commit.call_count == 10
+    assert client.core.pool_stats()['in_use'] == 0
+
+def test_bulk_insert_commits_through_pool(connect):
+    """Test bulk inserts run in a pooled transaction"""
+    client = DatabaseClient()
+    frame = pd.DataFrame({'symbol': ['AAPL'], 'close': [100.0]})
+    client.bulk_loader.max_packet = 1024 * 1024
+
+    stats = client.bulk_insert('market_data', frame)
+
+    assert stats.rows == 1
+    cnx = client.core.pool._idle[0][0]
+    cnx.commit.assert_called_once()
+
+def test_legacy_connect_returns_to_pool(connect):
+    """Test connect/disconnect check out and return a pooled connection"""
+    client = DatabaseClient()
+    client.connect()
+    assert client.core.pool_stats()['in_use'] == 1
+
+    client.disconnect()
+    assert client.connection is None
+    assert client.core.pool_stats()['in_use'] == 0
+
+def test_manager_queries_use_pool(connect):
+    """Test DatabaseManager shares the pool instead of connecting per query"""
+    manager = DatabaseManager()
+
+    for _ in range(5):
+        assert manager.get_current_version() == '1.0.0'
+
+    assert connect.call_count == 1
+    assert manager.core is DatabaseClient().core
+    assert manager.core.pool_stats()['checkouts'] == 5
+
+def test_manager_entry_points_share_pool_across_threads(connect):
+    """Test DatabaseManager query methods run on pooled connections from many threads"""
+    manager = DatabaseManager()
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(5):
+                manager.execute_query("SELECT * FROM market_data WHERE symbol = %s", ('AAPL',))
+                manager.execute_with_retry("UPDATE market_data SET volume = 0")
+                manager.execute_many("INSERT INTO market_data (symbol) VALUES (%s)", [('AAPL',)])
+                manager.get_historical_data('market_data', {'symbol': 'AAPL'})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = manager.core.pool_stats()
+    assert not errors
+    assert connect.call_count <= manager.core.config.pool_size
+    assert stats['checkouts'] == 8 * 5 * 4
+    assert stats['in_use'] == 0
+
+def test_threaded_queries_bounded_by_pool_size(connect):
+    """Test concurrent callers never open more connections than the pool allows"""
+    client = DatabaseClient({'pool_size': 3})
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(20):
+                client.execute_query("UPDATE market_data SET volume = 0")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = client.core.pool_stats()
+    assert not errors
+    assert connect.call_count <= 3
+    assert stats['checkouts'] == 160
+    assert stats['in_use'] == 0
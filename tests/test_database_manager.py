@@ -5,18 +5,20 @@ import mysql.connector
 from unittest.mock import Mock, patch, MagicMock
 import os
 from datetime import datetime
+from src.database import core as core_module
 from src.database_manager import DatabaseManager, DBConfig, TradeData
 
 @pytest.fixture
 def db_manager():
     """Create DatabaseManager instance with test config"""
+    # Each test gets its own pool, so patched connections do not leak
     with patch.dict(os.environ, {
         'DB_HOST': 'localhost',
         'DB_USER': 'test_user',
         'DB_PASSWORD': 'test_pass',
         'DB_DATABASE': 'test_db'
-    }):
-        return DatabaseManager()
+    }), patch.dict(core_module._shared_cores, clear=True):
+        yield DatabaseManager()
 
 @pytest.fixture
 def mock_cursor():
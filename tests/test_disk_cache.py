@@ -0,0 +1,112 @@
+# tests/test_disk_cache.py
+
+import os
+import time
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import date, datetime
+from src.cache.disk_cache import DiskCache, INDEX_FILE, LOCK_FILE, STALE_TMP_SECONDS
+from src.cache.range_cache import RangeCache
+
+def bars(start: str, end: str) -> pd.DataFrame:
+    """Create weekday bars with mixed column types"""
+    days = pd.bdate_range(start, end, name='timestamp')
+    return pd.DataFrame({
+        'symbol': 'AAPL',
+        'close': np.linspace(100, 200, len(days)),
+        'volume': np.arange(len(days), dtype='int64'),
+        'updated_at': days.tz_localize('UTC')
+    }, index=days)
+
+def test_round_trip_is_memory_mapped(tmp_path):
+    """Test stored segments come back equal and backed by mapped files"""
+    cache = DiskCache(str(tmp_path))
+    frame = bars('2024-01-01', '2024-03-29')
+    seg = cache.put('AAPL', '1d', date(2024, 1, 1), date(2024, 3, 29), frame)
+    loaded = cache.load(seg)
+
+    pd.testing.assert_frame_equal(loaded, frame, check_freq=False)
+    values = loaded['close'].to_numpy()
+    assert not values.flags.owndata and not values.flags.writeable
+
+def test_index_survives_restart(tmp_path):
+    """Test a new instance sees segments written by a previous one"""
+    DiskCache(str(tmp_path)).put('AAPL', '1d', date(2024, 1, 1), date(2024, 1, 31),
+                                 bars('2024-01-01', '2024-01-31'))
+    os.makedirs(tmp_path / '.stale.tmp')
+    aged = time.time() - STALE_TMP_SECONDS - 1
+    os.utime(tmp_path / '.stale.tmp', (aged, aged))
+
+    cache = DiskCache(str(tmp_path))
+    [seg] = cache.series('AAPL', '1d')
+    assert seg.span == (date(2024, 1, 1), date(2024, 1, 31))
+    assert len(cache.load(seg)) == 23
+    assert not (tmp_path / '.stale.tmp').exists()
+
+def test_overlapping_put_replaces(tmp_path):
+    """Test a wider segment replaces the stored ones it overlaps"""
+    cache = DiskCache(str(tmp_path))
+    cache.put('AAPL', '1d', date(2024, 1, 1), date(2024, 1, 31), bars('2024-01-01', '2024-01-31'))
+    cache.put('AAPL', '1d', date(2024, 1, 1), date(2024, 2, 29), bars('2024-01-01', '2024-02-29'))
+
+    assert [s.span for s in cache.series('AAPL', '1d')] == [(date(2024, 1, 1), date(2024, 2, 29))]
+    assert sorted(os.listdir(tmp_path)) == sorted([INDEX_FILE, LOCK_FILE,
+                                                   cache.series('AAPL', '1d')[0].name])
+
+def test_lru_eviction_by_size(tmp_path):
+    """Test least recently used segments are evicted past max_bytes"""
+    probe = DiskCache(str(tmp_path / 'probe'))
+    size = probe.put('X', '1d', date(2024, 1, 1), date(2024, 1, 31),
+                     bars('2024-01-01', '2024-01-31')).bytes
+
+    cache = DiskCache(str(tmp_path / 'cache'), max_bytes=size * 2)
+    for symbol in ['AAPL', 'MSFT']:
+        cache.put(symbol, '1d', date(2024, 1, 1), date(2024, 1, 31), bars('2024-01-01', '2024-01-31'))
+    cache.load(cache.series('AAPL', '1d')[0])
+    cache.put('GOOG', '1d', date(2024, 1, 1), date(2024, 1, 31), bars('2024-01-01', '2024-01-31'))
+
+    assert cache.series('MSFT', '1d') == []
+    assert cache.get_stats()['evictions'] == 1
+    assert cache.get_stats()['bytes'] <= size * 2
+
+def test_shared_directory_keeps_other_writers_segments(tmp_path):
+    """Test processes sharing a directory merge the index and spare live writes"""
+    a = DiskCache(str(tmp_path))
+    b = DiskCache(str(tmp_path))
+    a.put('AAPL', '1d', date(2024, 1, 1), date(2024, 1, 31), bars('2024-01-01', '2024-01-31'))
+    b.put('MSFT', '1d', date(2024, 1, 1), date(2024, 1, 31), bars('2024-01-01', '2024-01-31'))
+
+    # Each write kept the other's segment; a sees b's without restarting
+    assert len(a.series('MSFT', '1d')) == 1 and len(b.series('AAPL', '1d')) == 1
+
+    # A worker starting up leaves another's in-progress write alone
+    os.makedirs(tmp_path / '.NVDA_1d.tmp')
+    c = DiskCache(str(tmp_path))
+    assert (tmp_path / '.NVDA_1d.tmp').exists()
+    assert sorted(c.timeframes('AAPL') + c.timeframes('MSFT')) == ['1d', '1d']
+    assert len(c.load(c.series('AAPL', '1d')[0])) == 23
+
+    assert a.remove('MSFT') == 1
+    assert b.series('MSFT', '1d') == [] and len(b.series('AAPL', '1d')) == 1
+
+@pytest.mark.asyncio
+async def test_range_cache_warm_from_disk(tmp_path):
+    """Test a restarted RangeCache serves stored ranges without fetching"""
+    calls = []
+
+    async def fetch(symbol, start, end, timeframe):
+        calls.append((start, end))
+        return bars(start, end)
+
+    first = RangeCache(store=DiskCache(str(tmp_path)))
+    expected = await first.get('AAPL', '1d', datetime(2024, 1, 1), datetime(2024, 6, 28), fetch)
+
+    restarted = RangeCache(store=DiskCache(str(tmp_path)))
+    data = await restarted.get('AAPL', '1d', datetime(2024, 2, 1), datetime(2024, 3, 29), fetch)
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(data, expected.loc["2024-02-01":"2024-03-29"], check_freq=False)
+
+    assert restarted.invalidate('AAPL') == 1
+    assert DiskCache(str(tmp_path)).series('AAPL', '1d') == []
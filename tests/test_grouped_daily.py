@@ -0,0 +1,134 @@
+# tests/test_grouped_daily.py
+
+import pytest
+import pytest_asyncio
+import pandas as pd
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from datetime import date
+from unittest.mock import MagicMock
+from src.cache.events import market_data_changes
+from src.database.bulk import BulkLoader, MARKET_DATA_KEY, market_data_frame
+from src.database.core import Core
+from src.fetch_modules.base.rate_limiter import RateLimiter
+from src.fetch_modules.polygon import GroupedDailyIngest, PolygonClient
+from src.fetch_modules.polygon.polygon_client import aggs_frame
+
+# Grouped daily responses as recorded from /v2/aggs/grouped/locale/us/market/stocks
+RECORDED = {
+    '2024-01-02': {
+        'queryCount': 3, 'resultsCount': 3, 'adjusted': True, 'status': 'OK',
+        'results': [
+            {'T': 'AAPL', 'v': 82488674, 'vw': 185.9465, 'o': 187.15, 'c': 185.64,
+             'h': 188.44, 'l': 183.885, 't': 1704229200000, 'n': 1008871},
+            {'T': 'MSFT', 'v': 25258620, 'vw': 370.5514, 'o': 373.86, 'c': 370.87,
+             'h': 375.9, 'l': 366.77, 't': 1704229200000, 'n': 337375},
+            {'T': 'ZVZZT', 'v': 1520, 'vw': 10.01, 'o': 10.0, 'c': 10.02,
+             'h': 10.03, 'l': 9.99, 't': 1704229200000},
+        ]
+    },
+    '2024-01-03': {
+        'queryCount': 2, 'resultsCount': 2, 'adjusted': True, 'status': 'OK',
+        'results': [
+            {'T': 'AAPL', 'v': 58414460, 'vw': 184.3226, 'o': 184.22, 'c': 184.25,
+             'h': 185.88, 'l': 183.43, 't': 1704315600000, 'n': 656853},
+            {'T': 'MSFT', 'v': 23083465, 'vw': 369.6103, 'o': 369.01, 'c': 370.6,
+             'h': 373.26, 'l': 368.51, 't': 1704315600000, 'n': 303289},
+        ]
+    },
+    # Dates without trading return a valid response without results
+    '2024-01-04': {'queryCount': 0, 'resultsCount': 0, 'adjusted': True, 'status': 'OK'},
+}
+
+@pytest_asyncio.fixture
+async def server():
+    """Replay RECORDED; unknown dates fail like an upstream outage"""
+    requested = []
+
+    async def grouped(request):
+        day = request.match_info['date']
+        requested.append(day)
+        if day not in RECORDED:
+            raise web.HTTPInternalServerError()
+        return web.json_response(RECORDED[day])
+
+    app = web.Application()
+    app.router.add_get('/v2/aggs/grouped/locale/us/market/stocks/{date}', grouped)
+    server = TestServer(app)
+    await server.start_server()
+    server.requested = requested
+    yield server
+    await server.close()
+
+def client_for(server) -> PolygonClient:
+    return PolygonClient('test-key', base_url=str(server.make_url('')),
+                         limiter=RateLimiter(default_rate=1000.0, default_burst=100.0))
+
+def written(core):
+    cursor = core.transaction.return_value.__enter__.return_value.cursor.return_value
+    return [call.args for call in cursor.execute.call_args_list]
+
+@pytest.mark.asyncio
+async def test_response_fanned_out_to_market_data_rows(server):
+    """Test one response becomes one market_data row per ticker"""
+    async with client_for(server) as client:
+        ingest = GroupedDailyIngest(client, MagicMock(spec=Core), symbols={'AAPL', 'ZVZZT'})
+        frame = ingest.to_rows(await client.get_grouped_daily('2024-01-02'))
+
+    assert list(frame.columns) == ['symbol', 'timestamp', 'data_type', 'open', 'high', 'low',
+                                   'close', 'volume', 'vwap', 'number_of_trades']
+    assert frame['symbol'].tolist() == ['AAPL', 'ZVZZT']
+    assert (frame['data_type'] == 'STOCK').all()
+    # Restamped from the 16:00 ET close to the session's midnight ET
+    assert str(frame['timestamp'].iloc[0]) == '2024-01-02 05:00:00'
+    assert frame['number_of_trades'].isna().tolist() == [False, True]
+    assert server.requested == ['2024-01-02']
+
+@pytest.mark.asyncio
+async def test_backfill_makes_one_request_per_session(server):
+    """Test N sessions cost N requests and each day is one bulk upsert"""
+    core = MagicMock(spec=Core)
+    events = []
+
+    batches = []
+
+    def handler(event):
+        events.append(event)
+    unsubscribe = market_data_changes.subscribe(handler)
+    unsubscribe_batches = market_data_changes.subscribe(handler, batches.append)
+    try:
+        async with client_for(server) as client:
+            ingest = GroupedDailyIngest(client, core, bulk_loader=BulkLoader(max_packet=1 << 20))
+            # Sat 6th and Sun 7th are skipped; the 5th was not recorded
+            report = await ingest.backfill('2024-01-02', '2024-01-07')
+    finally:
+        unsubscribe()
+        unsubscribe_batches()
+
+    assert sorted(server.requested) == ['2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05']
+    assert report.requests == 4 and report.rows == 5
+    assert list(report.failed) == [date(2024, 1, 5)]
+
+    inserts = [(sql, params) for sql, *params in written(core) if 'INSERT INTO market_data' in sql]
+    assert len(inserts) == 2
+    assert all('ON DUPLICATE KEY UPDATE' in sql for sql, _ in inserts)
+    assert sorted(len(params[0]) // 10 for _, params in inserts) == [2, 3]
+    assert sorted(e.symbol for e in events) == ['AAPL', 'AAPL', 'MSFT', 'MSFT', 'ZVZZT']
+    assert {e.timeframe for e in events} == {'1d'}
+    # Batch subscribers hear about each session once
+    assert sorted(len(batch) for batch in batches) == [2, 3]
+
+def test_grouped_and_per_ticker_rows_share_a_key():
+    """Test a session ingested through both paths upserts one market_data row"""
+    ingest = GroupedDailyIngest(MagicMock(spec=PolygonClient), MagicMock(spec=Core),
+                                symbols={'AAPL'})
+    grouped = ingest.to_rows(RECORDED['2024-01-02']['results'])
+    # /v2/aggs/ticker/AAPL/range/1/day/2024-01-02/2024-01-02 stamps the session start
+    per_ticker = market_data_frame(aggs_frame([
+        {'v': 82488674, 'vw': 185.9465, 'o': 187.15, 'c': 185.64, 'h': 188.44,
+         'l': 183.885, 't': 1704171600000, 'n': 1008871}
+    ], 'AAPL'))
+
+    both = pd.concat([grouped, per_ticker], ignore_index=True)
+    assert len(both) == 2
+    assert len(both.drop_duplicates(subset=list(MARKET_DATA_KEY))) == 1
@@ -0,0 +1,119 @@
+# tests/test_incremental_sync.py
+
+import pytest
+import pandas as pd
+from datetime import date, datetime
+from unittest.mock import MagicMock
+from src.cache.events import ChangeEvent
+from src.database.bulk import market_data_frame
+from src.database.core import Core
+from src.fetch_modules.base.rate_limiter import Priority, current_priority
+from src.fetch_modules.incremental import Gap, IncrementalSync, Watermarks, missing_sessions
+from src.cache.sessions import TradingCalendar
+
+START = datetime(2024, 1, 2)
+END = datetime(2024, 1, 31)
+
+def bars(symbol, days):
+    index = pd.DatetimeIndex(pd.to_datetime(days), name='timestamp')
+    return pd.DataFrame({'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 10},
+                        index=index)
+
+def core_with(marks, days=()):
+    """Core answering the watermark query with marks and the gap query with days"""
+    core = MagicMock(spec=Core)
+
+    def execute(sql, params):
+        if 'MAX(timestamp)' in sql:
+            return [{'symbol': s, 'data_type': 'STOCK', 'last_ts': ts}
+                    for s, ts in marks.items() if s in params]
+        return [{'symbol': s, 'day': d} for s, d in days]
+    core.execute.side_effect = execute
+    return core
+
+def test_watermarks_loaded_once_and_follow_writes():
+    """Test one grouped query per new symbol set, then change events only"""
+    core = core_with({'AAPL': datetime(2024, 1, 10, 16)})
+    marks = Watermarks(core)
+
+    assert marks.load(['AAPL', 'MSFT'], START) == 1
+    marks.load(['AAPL', 'MSFT'], START)
+    assert core.execute.call_count == 1
+    sql, params = core.execute.call_args.args
+    assert 'GROUP BY symbol, data_type' in sql and 'idx_symbol_time' in sql
+    assert params == ('AAPL', 'MSFT', START)
+    assert marks.get('MSFT') is None
+
+    frame = market_data_frame(bars('AAPL', ['2024-01-11', '2024-01-12']), 'AAPL')
+    marks.on_change(ChangeEvent.from_frame('AAPL', frame))
+    assert marks.get('AAPL') == datetime(2024, 1, 12)
+
+    marks.on_change(ChangeEvent('AAPL', START, END))
+    assert marks.get('AAPL') is None
+    marks.load(['AAPL'])
+    assert core.execute.call_count == 2
+
+def test_missing_sessions_coalesced_on_trading_grid():
+    """Test weekends are not gaps and adjacent missing sessions merge"""
+    calendar = TradingCalendar(holidays=[date(2024, 1, 15)])
+    present = {date(2024, 1, d) for d in (2, 3, 4, 10, 11, 12, 17)}
+
+    runs = missing_sessions(calendar, present, START, datetime(2024, 1, 17))
+
+    # 5th-9th merge across the weekend; the 15th is a holiday, not a gap
+    assert runs == [(date(2024, 1, 5), date(2024, 1, 9)), (date(2024, 1, 16), date(2024, 1, 16))]
+
+@pytest.mark.asyncio
+async def test_sync_fetches_only_after_watermark():
+    """Test known symbols fetch from their last bar's day, new ones from start"""
+    core = core_with({'AAPL': datetime(2024, 1, 26)})
+    fetched, stored = [], []
+
+    async def fetch(symbol, start, end):
+        fetched.append((symbol, start, end))
+        return bars(symbol, ['2024-01-26', '2024-01-29'])
+
+    async def store(symbol, data):
+        stored.append((symbol, len(data)))
+
+    sync = IncrementalSync(fetch, store, Watermarks(core), check_gaps=False)
+    report = await sync.sync(['AAPL', 'MSFT'], START, END)
+
+    assert fetched == [('AAPL', datetime(2024, 1, 26), END), ('MSFT', START, END)]
+    assert stored == [('AAPL', 2), ('MSFT', 2)]
+    assert report.fetched == {'AAPL': 2, 'MSFT': 2}
+    assert sync.watermarks.get('MSFT') == datetime(2024, 1, 29)
+
+@pytest.mark.asyncio
+async def test_gaps_queued_and_refilled_at_backfill_priority():
+    """Test internal holes become refills that are not re-queued once settled"""
+    stored_days = [d for d in pd.bdate_range('2024-01-02', '2024-01-12').date
+                   if d not in (date(2024, 1, 5), date(2024, 1, 9))]
+    core = core_with({'AAPL': datetime(2024, 1, 12)}, [('AAPL', d) for d in stored_days])
+    refilled, priorities = [], set()
+
+    async def fetch(symbol, start, end):
+        return pd.DataFrame()
+
+    async def store(symbol, data):
+        pass
+
+    async def refill(gap):
+        refilled.append(gap)
+        priorities.add(current_priority.get())
+        # The 5th loads bars; the source has nothing for the 9th
+        return 1 if gap.start == date(2024, 1, 5) else 0
+
+    sync = IncrementalSync(fetch, store, Watermarks(core), refill=refill)
+    report = await sync.sync(['AAPL'], START, END)
+    await sync._refiller
+
+    expected = [Gap('AAPL', 'STOCK', date(2024, 1, 5), date(2024, 1, 5)),
+                Gap('AAPL', 'STOCK', date(2024, 1, 9), date(2024, 1, 9))]
+    assert report.gaps == expected
+    assert refilled == expected
+    assert priorities == {Priority.BACKFILL}
+
+    # Same holes found again: only the one that loaded bars is retried
+    assert sync.enqueue(expected) == 1
+    await sync.stop()
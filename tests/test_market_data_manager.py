@@ -0,0 +1,148 @@
+# tests/test_market_data_manager.py
+
+import asyncio
+import pytest
+import pandas as pd
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+from unittest.mock import MagicMock
+from src.cache.ttl_policy import TTLPolicy
+from src.cache.warmup import AccessLog
+from src.database.core import Core
+from src.database_client import DatabaseClient
+from src.fetch_modules.base.base_data_source_ import DataSourceBase
+from src.managers.market_data import MarketDataManager
+
+class Source(DataSourceBase):
+    """Valid daily bars for every weekday, recording requested spans"""
+
+    def __init__(self, close=100.0):
+        self.close = close
+        self.requests = []
+
+    async def fetch_data(self, symbol, start_date, end_date, timeframe='1d'):
+        self.requests.append((start_date.date(), end_date.date(), timeframe))
+        await asyncio.sleep(0)
+        days = pd.bdate_range(start_date.date(), end_date.date(), name='timestamp')
+        return pd.DataFrame({'open': self.close, 'high': self.close + 1,
+                             'low': self.close - 1, 'close': self.close,
+                             'volume': 1000, 'vwap': self.close}, index=days)
+
+    async def fetch_fundamentals(self, symbol):
+        return {}
+
+    async def fetch_news(self, symbol, limit=10):
+        return pd.DataFrame()
+
+def database_client():
+    """DatabaseClient whose query_cache reads miss and writes succeed"""
+    core = MagicMock(spec=Core)
+    core.execute.return_value = []
+    client = MagicMock(spec=DatabaseClient)
+    client.core = core
+    return client
+
+def manager_for(source, **kwargs) -> MarketDataManager:
+    return MarketDataManager(data_source=source, db_client=database_client(),
+                             access_log=AccessLog(), base_delay=0, **kwargs)
+
+@pytest.mark.asyncio
+async def test_get_market_data_fetches_only_gaps():
+    """Test requests are served from the range cache and extended by gaps"""
+    source = Source()
+    manager = manager_for(source)
+
+    january = await manager.get_market_data('AAPL', datetime(2024, 1, 1), datetime(2024, 1, 31))
+    week = await manager.get_market_data('AAPL', datetime(2024, 1, 8), datetime(2024, 1, 12))
+    both = await manager.get_market_data('AAPL', datetime(2024, 1, 1), datetime(2024, 2, 29))
+
+    assert len(january) == 23
+    assert week.index.tolist() == list(pd.bdate_range('2024-01-08', '2024-01-12'))
+    assert len(both) == len(pd.bdate_range('2024-01-01', '2024-02-29'))
+    assert source.requests == [
+        (date(2024, 1, 1), date(2024, 1, 31), '1d'),
+        (date(2024, 2, 1), date(2024, 2, 29), '1d')
+    ]
+    stats = manager.ranges.get_stats()
+    assert (stats['misses'], stats['hits'], stats['partial_hits']) == (1, 1, 1)
+    # Each gap went through the sharded L1 and was written to query_cache
+    assert sorted(await manager.cache.get_all_keys()) == [
+        'AAPL:1d:2024-01-01:2024-01-31', 'AAPL:1d:2024-02-01:2024-02-29'
+    ]
+    assert manager.shared.l2.get_stats()['writes'] == 2
+
+@pytest.mark.asyncio
+async def test_get_market_data_retries_and_validates():
+    """Test failed fetches are retried and invalid bars rejected"""
+    source = Source()
+    failures = [RuntimeError('upstream'), None]
+    fetch = source.fetch_data
+
+    async def flaky(*args):
+        error = failures.pop(0)
+        if error is not None:
+            raise error
+        return await fetch(*args)
+    source.fetch_data = flaky
+    manager = manager_for(source, max_retries=1)
+
+    data = await manager.get_market_data('AAPL', datetime(2024, 1, 8), datetime(2024, 1, 12))
+    assert len(data) == 5 and failures == []
+
+    # High below open fails price consistency and is never cached
+    bad = manager_for(Source())
+
+    async def high_below_open(*args):
+        frame = await fetch(*args)
+        return frame.assign(high=frame['open'] - 5)
+    bad.data_source.fetch_data = high_below_open
+    with pytest.raises(ValueError, match='Invalid market data'):
+        await bad.get_market_data('AAPL', datetime(2024, 1, 8), datetime(2024, 1, 12))
+    assert bad.ranges.coverage('AAPL', '1d') == []
+
+class TooManyRequests(Exception):
+    """429 response error as the rate limiter gives up on it"""
+    status = 429
+    headers = {'Retry-After': '1'}
+
+@pytest.mark.asyncio
+async def test_rate_limited_fetch_not_retried_locally():
+    """Test a 429 left over from the rate limiter is raised without a local retry"""
+    source = Source()
+    calls = []
+
+    async def limited(*args):
+        calls.append(args)
+        raise TooManyRequests()
+    source.fetch_data = limited
+    manager = manager_for(source, max_retries=3)
+
+    with pytest.raises(RuntimeError) as error:
+        await manager.get_market_data('AAPL', datetime(2024, 1, 8), datetime(2024, 1, 12))
+    assert isinstance(error.value.__cause__, TooManyRequests)
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_live_tail_served_stale_and_revalidated():
+    """Test an expired live session is returned at once and refreshed in the background"""
+    source = Source()
+    # Mid-session on Wed 10th: the 8th and 9th are closed, the 10th is live
+    policy = TTLPolicy(live_ttl=0.05, now=lambda: datetime(2024, 1, 10, 12, 0,
+                                                           tzinfo=ZoneInfo('America/New_York')))
+    manager = manager_for(source, ttl_policy=policy)
+    first = await manager.get_market_data('AAPL', datetime(2024, 1, 8), datetime(2024, 1, 10))
+    assert first['close'].tolist() == [100.0] * 3
+
+    await asyncio.sleep(0.1)
+    source.close = 101.0
+    stale = await manager.get_market_data('AAPL', datetime(2024, 1, 8), datetime(2024, 1, 10))
+    assert stale['close'].tolist() == [100.0] * 3
+    await manager.ranges.refresher.join()
+
+    fresh = await manager.get_market_data('AAPL', datetime(2024, 1, 8), datetime(2024, 1, 10))
+    assert fresh['close'].tolist() == [100.0, 100.0, 101.0]
+    # Only the live session was refetched
+    assert source.requests[1:] == [(date(2024, 1, 10), date(2024, 1, 10), '1d')]
+    assert manager.ranges.get_stats()['stale_hits'] >= 1
+    assert manager.ranges.refresher.get_stats()['completed'] >= 1
+    await manager.ranges.refresher.stop()
@@ -0,0 +1,109 @@
+# tests/test_memory_cache.py
+
+import asyncio
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import timedelta
+from unittest.mock import patch
+from src.cache.memory_cache import DataCache, MemoryCache, sizeof
+
+def bars(rows: int) -> pd.DataFrame:
+    """Create daily bars of a known size"""
+    return pd.DataFrame({
+        'close': np.arange(rows, dtype='float64'),
+        'volume': np.arange(rows, dtype='int64')
+    }, index=pd.date_range('2024-01-01', periods=rows, name='timestamp'))
+
+def test_sizeof_uses_deep_memory_usage():
+    """Test DataFrame sizes include object column payloads"""
+    frame = bars(100)
+    assert sizeof(frame) == frame.memory_usage(deep=True).sum()
+
+    frame['symbol'] = 'AAPL' * 50
+    assert sizeof(frame) > 100 * 200
+
+@pytest.mark.asyncio
+async def test_evicts_lru_against_byte_budget():
+    """Test least recently used entries are evicted to fit the budget"""
+    entry = sizeof(bars(100))
+    cache = MemoryCache(max_bytes=entry * 2)
+
+    await cache.set('AAPL:1d', bars(100))
+    await cache.set('MSFT:1d', bars(100))
+    await cache.get('AAPL:1d')
+    await cache.set('GOOG:1d', bars(100))
+
+    assert await cache.get_all_keys() == ['AAPL:1d', 'GOOG:1d']
+    assert await cache.get_memory_usage() == entry * 2
+    assert cache.evictions == 1
+    assert not await cache.set('BIG:1d', bars(1000))
+
+@pytest.mark.asyncio
+async def test_hit_miss_counters():
+    """Test hits and misses are counted on every lookup"""
+    cache = MemoryCache()
+    await cache.set('AAPL:1d', bars(10))
+
+    assert await cache.get('AAPL:1d') is not None
+    assert await cache.get('MSFT:1d') is None
+    assert (await cache.get_hits(), await cache.get_misses()) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_sweep_expires_unread_entries():
+    """Test the heap sweep drops expired entries nobody reads"""
+    cache = MemoryCache(ttl_seconds=10)
+    with patch('src.cache.memory_cache.time.monotonic', return_value=100.0):
+        await cache.set('AAPL:1d', bars(10))
+        await cache.set('MSFT:1d', bars(10), ttl=60)
+        await cache.set('AAPL:1d', bars(10), ttl=5)
+    with patch('src.cache.memory_cache.time.monotonic', return_value=106.0):
+        assert cache.sweep() == 1
+
+    assert await cache.get_all_keys() == ['MSFT:1d']
+    assert await cache.get_memory_usage() == sizeof(bars(10))
+    assert cache.get_stats()['expirations'] == 1
+    assert await cache.get_last_cleanup_time() is not None
+
+@pytest.mark.asyncio
+async def test_background_sweeper():
+    """Test connect() starts a sweeper that expires entries"""
+    cache = MemoryCache(ttl_seconds=0, sweep_interval=0.01)
+    await cache.connect()
+    await cache.set('AAPL:1d', bars(10))
+    await asyncio.sleep(0.05)
+
+    assert await cache.size() == 0
+    assert await cache.is_healthy()
+    await cache.disconnect()
+
+@pytest.mark.asyncio
+async def test_remove_pattern_by_symbol():
+    """Test symbol patterns use the index and globs still work"""
+    cache = MemoryCache()
+    for key in ['AAPL:1d', 'AAPL:1h', 'AAPLX:1d', 'MSFT:1d']:
+        await cache.set(key, bars(5))
+
+    assert await cache.remove_pattern('AAPL:*') == 2
+    assert await cache.remove_pattern('*:1d') == 2
+    assert await cache.get_all_keys() == []
+
+@pytest.mark.asyncio
+async def test_cleanup_by_age():
+    """Test cleanup drops entries older than max_age"""
+    cache = MemoryCache()
+    await cache.set('AAPL:1d', bars(5))
+
+    assert await cache.cleanup(timedelta(hours=1)) == 0
+    assert await cache.cleanup(timedelta(0)) == 1
+
+@pytest.mark.asyncio
+async def test_data_cache_bounds_entries():
+    """Test DataCache keeps its entry-count bound"""
+    cache = DataCache(maxsize=2, ttl=300)
+    for key in ['a', 'b', 'c']:
+        await cache.set(key, key)
+    await cache.remove('b')
+
+    assert await cache.get('a') is None
+    assert await cache.get('c') == 'c'
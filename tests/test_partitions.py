@@ -0,0 +1,99 @@
+# tests/test_partitions.py
+
+import pytest
+from datetime import date, datetime
+from unittest.mock import MagicMock
+from src.database.partitions import (
+    MARKET_DATA_RANGE_QUERY, Partition, PartitionManager, from_days, to_days
+)
+
+SCHEMA_PARTITIONS = [
+    {'name': 'p0', 'bound': str(to_days(date(2024, 12, 31))), 'table_rows': 10},
+    {'name': 'p1', 'bound': str(to_days(date(2025, 12, 31))), 'table_rows': 10},
+    {'name': 'p_future', 'bound': 'MAXVALUE', 'table_rows': 0}
+]
+
+@pytest.fixture
+def core():
+    """Create core reporting the schema.sql partition layout"""
+    core = MagicMock()
+    core.execute.return_value = SCHEMA_PARTITIONS
+    cursor = MagicMock()
+    core.transaction.return_value.__enter__.return_value.cursor.return_value = cursor
+    return core
+
+def test_to_days_matches_mysql():
+    """Test TO_DAYS conversion against known MySQL values"""
+    assert to_days(date(2024, 1, 1)) == 739251
+    assert from_days(739251) == date(2024, 1, 1)
+
+def test_plan_monthly(core):
+    """Test monthly partitions are planned up to `ahead` months past today"""
+    manager = PartitionManager(core, granularity='month', ahead=2)
+    planned = manager.plan(manager.get_partitions(), today=date(2026, 2, 10))
+
+    assert [p.name for p in planned] == [
+        'p202512', 'p202601', 'p202602', 'p202603', 'p202604'
+    ]
+    assert planned[0].bound == date(2026, 1, 1)
+    assert planned[-1].bound == date(2026, 5, 1)
+
+def test_plan_weekly():
+    """Test weekly partitions start on Mondays"""
+    manager = PartitionManager(MagicMock(), granularity='week', ahead=1)
+    existing = [Partition('p20260105', date(2026, 1, 12)), Partition('p_future', None)]
+    planned = manager.plan(existing, today=date(2026, 1, 14))
+
+    assert [p.name for p in planned] == ['p20260112', 'p20260119']
+    assert [p.bound for p in planned] == [date(2026, 1, 19), date(2026, 1, 26)]
+
+def test_plan_noop_when_ahead(core):
+    """Test nothing is planned when partitions already cover the window"""
+    manager = PartitionManager(core, ahead=1)
+    assert manager.plan(manager.get_partitions(), today=date(2025, 6, 1)) == []
+
+def test_ensure_splits_future_partition(core):
+    """Test planned partitions are split off p_future in one REORGANIZE"""
+    manager = PartitionManager(core, ahead=0)
+    names = manager.ensure_future_partitions(today=date(2026, 1, 5))
+
+    assert names == ['p202512', 'p202601']
+    cursor = core.transaction.return_value.__enter__.return_value.cursor.return_value
+    sql = cursor.execute.call_args.args[0]
+    assert sql.startswith('ALTER TABLE market_data REORGANIZE PARTITION p_future INTO')
+    assert f"PARTITION p202601 VALUES LESS THAN ({to_days(date(2026, 2, 1))})" in sql
+    assert sql.endswith('PARTITION p_future VALUES LESS THAN MAXVALUE)')
+
+def test_ensure_requires_catch_all(core):
+    """Test tables without a MAXVALUE partition are rejected"""
+    core.execute.return_value = SCHEMA_PARTITIONS[:2]
+    with pytest.raises(ValueError):
+        PartitionManager(core).ensure_future_partitions()
+
+def test_invalid_granularity(core):
+    """Test unsupported granularities are rejected"""
+    with pytest.raises(ValueError):
+        PartitionManager(core, granularity='day')
+
+def test_verify_pruning(core):
+    """Test EXPLAIN output is checked for partition pruning"""
+    core.execute.side_effect = [
+        [{'table': 'market_data', 'partitions': 'p202601'}],
+        SCHEMA_PARTITIONS
+    ]
+    manager = PartitionManager(core)
+    report = manager.verify_pruning('AAPL', datetime(2026, 1, 5), datetime(2026, 1, 9))
+
+    assert report.pruned
+    assert report.scanned == ['p202601']
+    query, params = core.execute.call_args_list[0].args
+    assert query == f"EXPLAIN {MARKET_DATA_RANGE_QUERY}"
+    assert params == ('AAPL', datetime(2026, 1, 5), datetime(2026, 1, 9))
+
+def test_full_scan_not_pruned(core):
+    """Test a plan touching every partition is reported as unpruned"""
+    core.execute.side_effect = [
+        [{'table': 'market_data', 'partitions': 'p0,p1,p_future'}],
+        SCHEMA_PARTITIONS
+    ]
+    assert not PartitionManager(core).verify_pruning().pruned
@@ -0,0 +1,144 @@
+# tests/test_polygon_client.py
+
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+import pandas as pd
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from datetime import datetime
+from src.fetch_modules.base.rate_limiter import RateLimiter
+from src.fetch_modules.polygon import PolygonClient, PolygonDataSource
+
+DAY_MS = 86400000
+DELAY = 0.05
+
+class StandIn:
+    """Local Polygon stand-in that records concurrency and connections"""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.requests = 0
+        self.connections = set()
+        self.auth = set()
+
+    async def aggs(self, request):
+        self.requests += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        self.connections.add(id(request.transport))
+        self.auth.add(request.headers.get('Authorization'))
+        try:
+            await asyncio.sleep(DELAY)
+        finally:
+            self.running -= 1
+        symbol = request.match_info['symbol']
+        page = int(request.query.get('page', 0))
+        base = 1704153600000 + page * 2 * DAY_MS
+        body = {'ticker': symbol, 'results': [
+            {'t': base + i * DAY_MS, 'o': 10.0, 'h': 12.0, 'l': 9.0, 'c': 11.0,
+             'v': 1000 + i, 'vw': 10.5, 'n': 7}
+            for i in range(2)
+        ]}
+        if symbol == 'PAGED' and page == 0:
+            body['next_url'] = str(request.url.with_query(page=1))
+        return web.json_response(body)
+
+    async def details(self, request):
+        return web.json_response({'results': {'market_cap': 3e12, 'sic_description': 'Computers'}})
+
+    async def news(self, request):
+        return web.json_response({'results': [{
+            'published_utc': '2024-01-02T14:30:00Z', 'title': 'Up',
+            'article_url': 'https://example.com/a', 'publisher': {'name': 'Wire'}
+        }]})
+
+    async def missing(self, request):
+        raise web.HTTPNotFound()
+
+@pytest_asyncio.fixture
+async def server():
+    """Start the stand-in on a local port"""
+    stand_in = StandIn()
+    app = web.Application()
+    app.router.add_get('/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/{start}/{end}',
+                       stand_in.aggs)
+    app.router.add_get('/v3/reference/tickers/{symbol}', stand_in.details)
+    app.router.add_get('/v2/reference/news', stand_in.news)
+    app.router.add_get('/v1/missing', stand_in.missing)
+    server = TestServer(app)
+    await server.start_server()
+    server.stand_in = stand_in
+    yield server
+    await server.close()
+
+def client_for(server, **kwargs) -> PolygonClient:
+    kwargs.setdefault('limiter', RateLimiter(default_rate=1000.0, default_burst=100.0,
+                                             max_in_flight=100))
+    return PolygonClient('test-key', base_url=str(server.make_url('')), **kwargs)
+
+@pytest.mark.asyncio
+async def test_aggs_parsed_to_frame(server):
+    """Test aggregate bars become a timestamp-indexed frame"""
+    async with client_for(server) as client:
+        frame = await client.get_market_data('AAPL', datetime(2024, 1, 2), datetime(2024, 1, 3))
+
+    assert list(frame.columns) == ['symbol', 'open', 'high', 'low', 'close',
+                                   'volume', 'vwap', 'transactions']
+    assert frame.index[0] == pd.Timestamp('2024-01-02')
+    assert frame['volume'].tolist() == [1000, 1001]
+    assert server.stand_in.auth == {'Bearer test-key'}
+
+@pytest.mark.asyncio
+async def test_next_url_pages_followed(server):
+    """Test paginated aggregates are concatenated"""
+    async with client_for(server) as client:
+        results = await client.get_aggs('PAGED', 1, 'day', '2024-01-02', '2024-01-05')
+
+    assert len(results) == 4
+    assert results[-1]['t'] > results[0]['t']
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_overlap_on_pooled_connections(server):
+    """Test symbol fetches run concurrently and reuse kept-alive connections"""
+    symbols = [f"S{i}" for i in range(8)]
+    async with client_for(server, limit_per_host=4) as client:
+        t0 = time.perf_counter()
+        for _ in range(2):
+            await asyncio.gather(*(
+                client.get_aggs(s, 1, 'day', '2024-01-02', '2024-01-03') for s in symbols
+            ))
+        elapsed = time.perf_counter() - t0
+
+    # 16 requests, 4 at a time: 4 rounds instead of 16 sequential ones
+    assert server.stand_in.peak == 4
+    assert elapsed < 16 * DELAY / 2
+    assert len(server.stand_in.connections) <= 4
+
+@pytest.mark.asyncio
+async def test_data_source_uses_async_client(server):
+    """Test PolygonDataSource awaits the client for bars, details and news"""
+    source = PolygonDataSource(client=client_for(server))
+    try:
+        bars = await source.fetch_data('AAPL', datetime(2024, 1, 2), datetime(2024, 1, 3))
+        # Not memoized here: refetches after a market_data write must reach Polygon
+        await source.fetch_data('AAPL', datetime(2024, 1, 2), datetime(2024, 1, 3))
+        details = await source.fetch_fundamentals('AAPL')
+        news = await source.fetch_news('AAPL')
+    finally:
+        await source.close()
+
+    assert 'transactions' not in bars.columns and len(bars) == 2
+    assert server.stand_in.requests == 2
+    assert details['market_cap'] == 3e12 and details['industry'] == 'Computers'
+    assert news['source'].tolist() == ['Wire']
+
+@pytest.mark.asyncio
+async def test_http_errors_raise(server):
+    """Test error statuses surface as exceptions"""
+    async with client_for(server) as client:
+        with pytest.raises(Exception) as excinfo:
+            await client._get('/v1/missing')
+    assert getattr(excinfo.value, 'status', None) == 404
@@ -0,0 +1,123 @@
+# tests/test_pool.py
+
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, Mock
+from src.database.pool import ConnectionPool, PoolTimeoutError
+from src.database.monitoring import Monitoring
+
+@pytest.fixture
+def connect():
+    """Connection factory returning fresh mock connections"""
+    def factory(**params):
+        cnx = MagicMock()
+        cnx.unread_result = False
+        return cnx
+    return Mock(side_effect=factory)
+
+@pytest.fixture
+def pool(connect):
+    """Create a small pool over mock connections"""
+    return ConnectionPool({'host': 'localhost'}, min_size=1, max_size=2,
+                          timeout=0.2, idle_timeout=60, connect=connect)
+
+def test_min_size_created_eagerly(pool, connect):
+    """Test min_size connections are opened up front"""
+    assert connect.call_count == 1
+    assert pool.get_stats()['idle'] == 1
+
+def test_grows_to_max_and_reuses(pool, connect):
+    """Test pool grows on demand and reuses released connections"""
+    a = pool.get_connection()
+    b = pool.get_connection()
+    assert connect.call_count == 2
+    assert pool.get_stats()['in_use'] == 2
+
+    a.close()
+    c = pool.get_connection()
+    assert connect.call_count == 2
+    b.close()
+    c.close()
+    assert pool.get_stats()['in_use'] == 0
+
+def test_exhausted_pool_times_out(pool):
+    """Test checkout raises after the bounded wait"""
+    held = [pool.get_connection(), pool.get_connection()]
+
+    start = time.monotonic()
+    with pytest.raises(PoolTimeoutError):
+        pool.get_connection(timeout=0.1)
+
+    assert time.monotonic() - start >= 0.1
+    assert pool.get_stats()['timeouts'] == 1
+    for conn in held:
+        conn.close()
+
+def test_waiter_gets_released_connection(pool):
+    """Test a blocked checkout is served when a connection is returned"""
+    held = [pool.get_connection(), pool.get_connection()]
+    result = {}
+
+    def waiter():
+        result['conn'] = pool.get_connection(timeout=2)
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    time.sleep(0.05)
+    assert pool.get_stats()['waiters'] == 1
+    held[0].close()
+    thread.join()
+
+    assert 'conn' in result
+    stats = pool.get_stats()
+    assert stats['max_wait'] >= 0.05
+    assert sum(stats['wait_histogram'].values()) == stats['checkouts']
+
+def test_pre_ping_replaces_dead_connection(pool, connect):
+    """Test a connection failing ping is replaced on checkout"""
+    conn = pool.get_connection()
+    dead = conn._cnx
+    conn.close()
+    dead.ping.side_effect = Exception("gone away")
+
+    conn = pool.get_connection()
+
+    assert conn._cnx is not dead
+    assert pool.get_stats()['discarded'] == 1
+    assert pool.get_stats()['size'] == 1
+
+def test_idle_reaping_keeps_min_size(pool):
+    """Test idle connections beyond min_size are closed"""
+    a = pool.get_connection()
+    b = pool.get_connection()
+    a.close()
+    b.close()
+    pool.idle_timeout = 0
+
+    assert pool.reap_idle() == 1
+    assert pool.get_stats()['size'] == 1
+
+def test_release_rolls_back(pool):
+    """Test connections are reset before returning to the pool"""
+    conn = pool.get_connection()
+    cnx = conn._cnx
+    conn.close()
+    cnx.rollback.assert_called_once()
+
+def test_invalid_sizes():
+    """Test inconsistent sizing is rejected"""
+    with pytest.raises(ValueError):
+        ConnectionPool({}, min_size=3, max_size=2, connect=Mock())
+
+def test_monitoring_records_pool_stats(pool):
+    """Test pool stats are written as system metrics"""
+    monitoring = Monitoring(Mock())
+    monitoring.core.execute.reset_mock()
+
+    monitoring.record_pool_stats(pool.get_stats())
+
+    names = [c.args[1][0] for c in monitoring.core.execute.call_args_list]
+    assert 'pool_in_use' in names
+    assert 'pool_waiters' in names
+    assert 'pool_avg_checkout' in names
@@ -0,0 +1,130 @@
+# tests/test_query_cache.py
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+from src.cache.codec import FRAME_ZLIB, JSON_ZLIB, decode_value, encode_value
+from src.cache.memory_cache import MemoryCache
+from src.cache.query_cache import QueryCache, TieredCache, query_hash
+from src.database.core import Core
+
+def bars() -> pd.DataFrame:
+    """Create bars with numeric, string and tz-aware columns"""
+    days = pd.bdate_range('2024-01-01', periods=250, name='timestamp')
+    return pd.DataFrame({
+        'symbol': 'AAPL',
+        'close': np.round(np.linspace(100, 200, len(days)), 2),
+        'volume': np.arange(len(days), dtype='int64') * 1000,
+        'updated_at': days.tz_localize('UTC')
+    }, index=days)
+
+@pytest.fixture
+def core():
+    """Create Core mock whose transaction cursor records statements"""
+    core = MagicMock(spec=Core)
+    cursor = MagicMock()
+    cursor.rowcount = 1
+    core.transaction.return_value.__enter__.return_value.cursor.return_value = cursor
+    return core
+
+def cursor_of(core):
+    return core.transaction.return_value.__enter__.return_value.cursor.return_value
+
+def test_frame_payload_round_trip():
+    """Test frames survive encoding and compress well below JSON size"""
+    frame = bars()
+    payload, encoding = encode_value(frame)
+
+    assert encoding == FRAME_ZLIB
+    pd.testing.assert_frame_equal(decode_value(payload, encoding), frame, check_freq=False)
+    assert len(payload) < len(frame.to_json(date_format='iso'))
+
+def test_json_payload_round_trip():
+    """Test non-frame values use compressed JSON"""
+    payload, encoding = encode_value({'symbol': 'AAPL', 'close': [1.5, 2.5]})
+
+    assert encoding == JSON_ZLIB
+    assert decode_value(payload, encoding) == {'symbol': 'AAPL', 'close': [1.5, 2.5]}
+    with pytest.raises(ValueError):
+        decode_value(payload, 'pickle')
+
+@pytest.mark.asyncio
+async def test_set_writes_binary_payload(core):
+    """Test values are upserted as compressed payloads keyed by hash"""
+    cache = QueryCache(core)
+    assert await cache.set('AAPL:1d', bars(), 60, endpoint='aggs', parameters={'symbol': 'AAPL'})
+
+    sql, params = cursor_of(core).execute.call_args.args
+    assert 'ON DUPLICATE KEY UPDATE' in sql
+    assert params[0] == query_hash('AAPL:1d')
+    assert params[3:7] == (params[3], FRAME_ZLIB, 60, 'AAPL')
+    assert isinstance(params[3], bytes)
+    assert cache.get_stats()['bytes_written'] == len(params[3])
+
+@pytest.mark.asyncio
+async def test_get_decodes_hit(core):
+    """Test hits are decoded and report remaining ttl"""
+    payload, encoding = encode_value(bars())
+    core.execute.return_value = [{'payload': bytearray(payload), 'encoding': encoding, 'ttl': 42}]
+
+    value, ttl = await QueryCache(core).get('AAPL:1d')
+
+    assert len(value) == 250 and ttl == 42
+    assert core.execute.call_args.args[1] == (query_hash('AAPL:1d'),)
+
+@pytest.mark.asyncio
+async def test_errors_degrade_to_miss(core):
+    """Test database failures are reported as misses"""
+    core.execute.side_effect = ConnectionError('down')
+    cache = QueryCache(core)
+
+    assert await cache.get('AAPL:1d') is None
+    assert cache.get_stats()['errors'] == 1
+
+@pytest.mark.asyncio
+async def test_sweep_deletes_in_batches(core):
+    """Test expired rows are deleted until a batch comes back short"""
+    cursor = cursor_of(core)
+    counts = iter([100, 100, 7])
+    cursor.execute.side_effect = lambda *a: setattr(cursor, 'rowcount', next(counts))
+
+    assert await QueryCache(core, sweep_batch=100).sweep() == 207
+    assert cursor.execute.call_count == 3
+    assert cursor.execute.call_args.args == (
+        "DELETE FROM query_cache WHERE expires_at <= NOW() LIMIT %s", (100,)
+    )
+
+@pytest.mark.asyncio
+async def test_core_factory_is_lazy(core):
+    """Test a core factory is only called on first use"""
+    factory = MagicMock(return_value=core)
+    cache = QueryCache(factory)
+    assert not factory.called
+
+    await cache.get('AAPL:1d')
+    await cache.get('AAPL:1d')
+    assert factory.call_count == 1
+
+@pytest.mark.asyncio
+async def test_tiered_read_through(core):
+    """Test L2 hits populate L1 and misses fetch once into both tiers"""
+    payload, encoding = encode_value({'close': 1.0})
+    core.execute.return_value = [{'payload': payload, 'encoding': encoding, 'ttl': 30}]
+    tiered = TieredCache(MemoryCache(), QueryCache(core))
+
+    assert await tiered.get('AAPL:1d') == {'close': 1.0}
+    assert await tiered.get('AAPL:1d') == {'close': 1.0}
+    assert core.execute.call_count == 1
+
+    core.execute.return_value = []
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return {'close': 2.0}
+
+    assert await tiered.get_or_fetch('MSFT:1d', fetch, ttl=60) == {'close': 2.0}
+    assert await tiered.get_or_fetch('MSFT:1d', fetch, ttl=60) == {'close': 2.0}
+    assert len(calls) == 1
+    assert cursor_of(core).execute.call_count == 1
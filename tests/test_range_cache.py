@@ -0,0 +1,133 @@
+# tests/test_range_cache.py
+
+import asyncio
+import pytest
+import pandas as pd
+from datetime import date, datetime
+from src.cache.range_cache import RangeCache, TradingCalendar
+
+class Source:
+    """Daily bars for every weekday, recording requested spans"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def fetch(self, symbol, start, end, timeframe):
+        self.requests.append((start.date(), end.date()))
+        await asyncio.sleep(0)
+        days = pd.bdate_range(start, end)
+        return pd.DataFrame({'close': [float(d.day) for d in days]},
+                            index=pd.DatetimeIndex(days, name='timestamp'))
+
+@pytest.fixture
+def source():
+    return Source()
+
+def test_calendar_normalizes_weekends():
+    """Test requests snap to the sessions they cover"""
+    calendar = TradingCalendar(holidays=[date(2024, 1, 15)])
+
+    assert calendar.normalize(datetime(2024, 1, 6), datetime(2024, 1, 14)) == \
+        (date(2024, 1, 8), date(2024, 1, 12))
+    assert calendar.normalize(datetime(2024, 1, 6), datetime(2024, 1, 7)) is None
+    assert calendar.next_session(date(2024, 1, 12)) == date(2024, 1, 16)
+    assert calendar.previous_session(date(2024, 1, 16)) == date(2024, 1, 12)
+    assert len(calendar.sessions(date(2024, 1, 1), date(2024, 1, 31))) == 22
+
+@pytest.mark.asyncio
+async def test_sub_range_served_from_cache(source):
+    """Test a range inside cached coverage is answered by slicing"""
+    cache = RangeCache()
+    full = await cache.get('AAPL', '1d', datetime(2024, 1, 1), datetime(2024, 12, 31), source.fetch)
+    part = await cache.get('AAPL', '1d', datetime(2024, 1, 1), datetime(2024, 3, 31), source.fetch)
+
+    assert len(source.requests) == 1
+    assert part.index[0] == pd.Timestamp('2024-01-01')
+    assert part.index[-1] == pd.Timestamp('2024-03-29')
+    assert part.equals(full.loc[:'2024-03-31'])
+    assert cache.get_stats()['hits'] == 1
+
+@pytest.mark.asyncio
+async def test_only_gaps_fetched(source):
+    """Test extending a cached range fetches just the missing sessions"""
+    cache = RangeCache()
+    await cache.get('AAPL', '1d', datetime(2024, 2, 1), datetime(2024, 2, 29), source.fetch)
+    await cache.get('AAPL', '1d', datetime(2024, 4, 1), datetime(2024, 4, 30), source.fetch)
+    data = await cache.get('AAPL', '1d', datetime(2024, 1, 1), datetime(2024, 5, 31), source.fetch)
+
+    assert source.requests[2:] == [
+        (date(2024, 1, 1), date(2024, 1, 31)),
+        (date(2024, 3, 1), date(2024, 3, 29)),
+        (date(2024, 5, 1), date(2024, 5, 31))
+    ]
+    assert cache.coverage('AAPL', '1d') == [(date(2024, 1, 1), date(2024, 5, 31))]
+    assert data.index.is_monotonic_increasing and data.index.is_unique
+    assert len(data) == len(pd.bdate_range('2024-01-01', '2024-05-31'))
+
+@pytest.mark.asyncio
+async def test_equivalent_requests_coalesce(source):
+    """Test weekend-padded and concurrent requests share one fetch"""
+    cache = RangeCache()
+    await asyncio.gather(
+        cache.get('AAPL', '1d', datetime(2024, 1, 6), datetime(2024, 1, 14), source.fetch),
+        cache.get('AAPL', '1d', datetime(2024, 1, 8), datetime(2024, 1, 12, 16), source.fetch)
+    )
+    assert source.requests == [(date(2024, 1, 8), date(2024, 1, 12))]
+
+@pytest.mark.asyncio
+async def test_adjacent_spans_merge(source):
+    """Test Friday and Monday spans merge into one segment"""
+    cache = RangeCache()
+    await cache.get('AAPL', '1d', datetime(2024, 1, 8), datetime(2024, 1, 12), source.fetch)
+    await cache.get('AAPL', '1d', datetime(2024, 1, 15), datetime(2024, 1, 19), source.fetch)
+
+    assert cache.coverage('AAPL', '1d') == [(date(2024, 1, 8), date(2024, 1, 19))]
+
+@pytest.mark.asyncio
+async def test_series_are_independent(source):
+    """Test timeframes and symbols are cached separately and can be dropped"""
+    cache = RangeCache(max_series=2)
+    for symbol, timeframe in [('AAPL', '1d'), ('AAPL', '1h'), ('MSFT', '1d')]:
+        await cache.get(symbol, timeframe, datetime(2024, 1, 8), datetime(2024, 1, 12), source.fetch)
+
+    assert len(source.requests) == 3
+    assert cache.get_stats()['evictions'] == 1
+    assert cache.invalidate('AAPL') == 1
+    assert cache.symbols() == ['MSFT']
+
+class MinuteSource:
+    """1-minute bars around the clock for every weekday in [start, end]"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def fetch(self, symbol, start, end, timeframe):
+        self.requests.append((start, end))
+        minutes = pd.date_range(start, end, freq='1min')
+        minutes = minutes[minutes.dayofweek < 5]
+        return pd.DataFrame({'close': range(len(minutes))},
+                            index=pd.DatetimeIndex(minutes, name='timestamp'))
+
+@pytest.mark.asyncio
+async def test_intraday_ranges_fetch_whole_sessions():
+    """Test intraday gaps are fetched as whole days and results cut to the request"""
+    source = MinuteSource()
+    cache = RangeCache()
+    morning = await cache.get('AAPL', '1m', datetime(2024, 1, 2, 10), datetime(2024, 1, 2, 14),
+                              source.fetch)
+
+    assert source.requests == [(datetime(2024, 1, 2), datetime(2024, 1, 2, 23, 59, 59, 999999))]
+    assert len(morning) == 241
+    assert morning.index[0] == pd.Timestamp('2024-01-02 10:00')
+    assert morning.index[-1] == pd.Timestamp('2024-01-02 14:00')
+
+    # A midnight end stands for the whole last day
+    both = await cache.get('AAPL', '1m', datetime(2024, 1, 2), datetime(2024, 1, 3), source.fetch)
+    assert len(both) == 2 * 1440
+    assert both.index[-1] == pd.Timestamp('2024-01-03 23:59')
+
+    # The second day was cached in full, so its afternoon is a hit
+    afternoon = await cache.get('AAPL', '1m', datetime(2024, 1, 3, 13, 30),
+                                datetime(2024, 1, 3, 16), source.fetch)
+    assert len(source.requests) == 2
+    assert len(afternoon) == 151
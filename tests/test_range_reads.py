@@ -0,0 +1,142 @@
+# tests/test_range_reads.py
+
+import os
+import time
+import pytest
+import pandas as pd
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+from src.database.config import Config
+from src.database.core import Core
+from src.database.operations import Operations
+from src.database.partitions import range_slices, to_days
+
+# Simulated server time to scan one day of minute bars
+SCAN_SECONDS_PER_DAY = 0.0004
+
+# market_data partitions as created by db/migrations/schema.sql
+SCHEMA_PARTITIONS = [
+    {'name': f"p{i}", 'bound': str(to_days(date(2024 + i, 12, 31))), 'table_rows': 0}
+    for i in range(4)
+] + [{'name': 'p_future', 'bound': 'MAXVALUE', 'table_rows': 0}]
+
+@pytest.fixture
+def core():
+    """Create Core with schema.sql partitions whose fetch_frame simulates scans"""
+    with patch.dict(os.environ, {
+        'DB_USER': 'test_user',
+        'DB_PASSWORD': 'test_pass',
+        'DB_DATABASE': 'test_db'
+    }), patch('src.database.core.ConnectionPool'):
+        core = Core(Config(pool_size=8))
+
+    def fetch_frame(query, params=None, price_scale=None):
+        lo, hi = params[-2], params[-1]
+        time.sleep((hi - lo).days * SCAN_SECONDS_PER_DAY)
+        days = pd.date_range(lo, hi, freq='D', inclusive='both' if '<=' in query else 'left')
+        return pd.DataFrame({'timestamp': days, 'close': range(len(days))})
+
+    core.fetch_frame = fetch_frame
+    core.execute = MagicMock(return_value=SCHEMA_PARTITIONS)
+    return core
+
+def test_range_slices_follow_month_grid():
+    """Test slices are cut on month starts and keep the end inclusive"""
+    slices = range_slices(datetime(2024, 1, 15), datetime(2024, 3, 10))
+
+    assert slices == [
+        (datetime(2024, 1, 15), datetime(2024, 2, 1)),
+        (datetime(2024, 2, 1), datetime(2024, 3, 1)),
+        (datetime(2024, 3, 1), datetime(2024, 3, 10))
+    ]
+
+def test_range_slices_from_partition_bounds():
+    """Test explicit partition bounds override the calendar grid"""
+    slices = range_slices(datetime(2024, 6, 1), datetime(2026, 6, 1),
+                          bounds=[date(2024, 12, 31), date(2025, 12, 31), None])
+
+    assert [hi for _, hi in slices] == [
+        datetime(2024, 12, 31), datetime(2025, 12, 31), datetime(2026, 6, 1)
+    ]
+
+def test_range_slices_single_period():
+    """Test a range inside one period is one slice"""
+    assert range_slices(datetime(2024, 1, 2), datetime(2024, 1, 5)) == [
+        (datetime(2024, 1, 2), datetime(2024, 1, 5))
+    ]
+    assert range_slices(datetime(2024, 1, 5), datetime(2024, 1, 2)) == []
+
+def test_range_queries_half_open():
+    """Test only the final slice includes its upper bound"""
+    queries = Operations._range_queries('market_data', 'AAPL', datetime(2024, 1, 15),
+                                        datetime(2024, 3, 10), 'STOCK', 'month')
+
+    assert len(queries) == 3
+    assert all('timestamp < %s' in q for q, _ in queries[:-1])
+    assert 'timestamp <= %s' in queries[-1][0]
+    assert queries[0][1] == ('AAPL', 'STOCK', datetime(2024, 1, 15), datetime(2024, 2, 1))
+
+def test_read_range_stitches_in_order(core):
+    """Test slices fetched concurrently come back contiguous and sorted"""
+    frame = Operations(core).read_range('market_data', 'AAPL',
+                                        datetime(2023, 1, 1), datetime(2024, 12, 31))
+
+    expected = pd.date_range('2023-01-01', '2024-12-31', freq='D')
+    assert frame['timestamp'].is_monotonic_increasing
+    assert (frame['timestamp'].to_numpy() == expected.to_numpy()).all()
+
+def test_read_range_slices_on_partition_bounds(core):
+    """Test reads are cut at the table's partition bounds, read once and cached"""
+    ops = Operations(core)
+    queries = []
+    fetch_frame = core.fetch_frame
+    core.fetch_frame = lambda query, params=None, price_scale=None: (
+        queries.append(params) or fetch_frame(query, params, price_scale)
+    )
+    ops.read_range('market_data', 'AAPL', datetime(2024, 6, 1), datetime(2026, 6, 1))
+    ops.read_range('market_data', 'AAPL', datetime(2024, 6, 1), datetime(2024, 7, 1))
+
+    assert [params[-1] for params in queries[:3]] == [
+        datetime(2024, 12, 31), datetime(2025, 12, 31), datetime(2026, 6, 1)
+    ]
+    assert len(queries) == 4
+    assert core.execute.call_count == 1
+
+    # An explicit granularity keeps the calendar grid
+    ops.read_range('market_data', 'AAPL', datetime(2024, 6, 1), datetime(2024, 8, 1),
+                   granularity='month')
+    assert len(queries) == 6
+
+def test_unpartitioned_table_uses_configured_grid(core):
+    """Test tables without RANGE partitions fall back to partition_granularity"""
+    core.execute.return_value = [{'name': None, 'bound': None, 'table_rows': 5}]
+    frame = Operations(core).read_range('quotes', 'AAPL',
+                                        datetime(2024, 1, 15), datetime(2024, 3, 10))
+
+    assert len(frame) == len(pd.date_range('2024-01-15', '2024-03-10'))
+    assert Operations(core).partition_bounds('quotes') is None
+
+@pytest.mark.benchmark
+def test_parallel_range_read_faster(core, benchmark_logger):
+    """Benchmark sliced parallel reads against the single-query path
+
+    Scan time is simulated with time.sleep in fetch_frame, so the ratio
+    shows slice concurrency only, not real MySQL partition scans.
+    """
+    start, end = datetime(2024, 1, 1), datetime(2027, 12, 31)
+
+    t0 = time.perf_counter()
+    single = core.fetch_frame("SELECT * FROM market_data WHERE timestamp <= %s",
+                              ('AAPL', start, end))
+    single_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    parallel = Operations(core).read_range('market_data', 'AAPL', start, end)
+    parallel_time = time.perf_counter() - t0
+
+    benchmark_logger.info(
+        f"simulated range read {len(single)} rows: single {single_time:.3f}s, "
+        f"parallel {parallel_time:.3f}s ({single_time / parallel_time:.1f}x, sleep-based)"
+    )
+    assert (single['timestamp'].to_numpy() == parallel['timestamp'].to_numpy()).all()
+    assert parallel_time < single_time / 2
@@ -0,0 +1,185 @@
+# tests/test_rate_limiter.py
+
+import asyncio
+import time
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from src.fetch_modules.base.rate_limiter import (
+    DEFAULT_RETRY_AFTER, Priority, RateLimiter, fetch_priority, retry_after
+)
+from src.fetch_modules.polygon import PolygonClient
+
+class Status(Exception):
+    """Response error carrying a status and headers like aiohttp's"""
+
+    def __init__(self, status, headers=None):
+        super().__init__(status)
+        self.status = status
+        self.headers = headers or {}
+
+def test_retry_after_parses_seconds_and_dates():
+    """Test Retry-After is read as seconds or an HTTP date, only for 429s"""
+    assert retry_after(Status(429, {'Retry-After': '2.5'})) == 2.5
+    assert retry_after(Status(429)) == DEFAULT_RETRY_AFTER
+    assert retry_after(Status(503, {'Retry-After': '5'})) is None
+    assert retry_after(ValueError('no status')) is None
+    when = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < retry_after(Status(429, {'Retry-After': when})) <= 30
+
+@pytest.mark.asyncio
+async def test_requests_paced_evenly_at_rate():
+    """Test throughput sits at the configured rate without bursts"""
+    limiter = RateLimiter(limits={'polygon': (50.0, 1.0)})
+    starts = []
+
+    async def request():
+        starts.append(time.monotonic())
+
+    t0 = time.monotonic()
+    await asyncio.gather(*(limiter.call('polygon', 'aggs', request) for _ in range(21)))
+    elapsed = time.monotonic() - t0
+
+    # First token is ready at once, the other 20 arrive every 20ms
+    assert 0.38 <= elapsed < 0.6
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.015
+
+@pytest.mark.asyncio
+async def test_endpoint_bucket_applies_with_source_bucket():
+    """Test a source:endpoint limit narrows its endpoint only"""
+    limiter = RateLimiter(limits={'polygon': (1000.0, 10.0), 'polygon:reference': (20.0, 1.0)})
+
+    async def request():
+        pass
+
+    t0 = time.monotonic()
+    await asyncio.gather(*(limiter.call('polygon', 'aggs', request) for _ in range(10)))
+    fast = time.monotonic() - t0
+    t0 = time.monotonic()
+    await asyncio.gather(*(limiter.call('polygon', 'reference', request) for _ in range(5)))
+    slow = time.monotonic() - t0
+
+    assert fast < 0.05
+    assert slow >= 0.19
+
+@pytest.mark.asyncio
+async def test_in_flight_capped():
+    """Test no more than max_in_flight requests run at once"""
+    limiter = RateLimiter(max_in_flight=3, default_rate=1000.0, default_burst=100.0)
+    running = peak = 0
+
+    async def request():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+
+    await asyncio.gather(*(limiter.call('polygon', 'aggs', request) for _ in range(12)))
+
+    assert peak == 3
+    assert limiter.get_stats()['in_flight'] == 0
+
+@pytest.mark.asyncio
+async def test_interactive_overtakes_queued_backfill():
+    """Test an interactive request is served ahead of waiting backfill"""
+    limiter = RateLimiter(limits={'polygon': (50.0, 1.0)})
+    order = []
+
+    def request(tag):
+        async def run():
+            order.append(tag)
+        return run
+
+    async def backfill(i):
+        with fetch_priority(Priority.BACKFILL):
+            await limiter.call('polygon', 'aggs', request(f"b{i}"))
+
+    queued = [asyncio.create_task(backfill(i)) for i in range(6)]
+    await asyncio.sleep(0.03)
+    await limiter.call('polygon', 'aggs', request('user'))
+    await asyncio.gather(*queued)
+
+    # Backfill holding the first tokens ran; the user jumps the rest of the queue
+    assert order.index('user') <= 3
+    assert order[-1].startswith('b')
+    stats = limiter.get_stats()
+    assert (stats['interactive'], stats['backfill']) == (1, 6)
+
+@pytest.mark.asyncio
+async def test_429_blocks_bucket_and_retries():
+    """Test a 429 pauses every caller for Retry-After, then the request is retried"""
+    limiter = RateLimiter(limits={'polygon': (1000.0, 10.0)})
+    calls = []
+
+    async def flaky():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise Status(429, {'Retry-After': '0.1'})
+        return 'ok'
+
+    async def other():
+        calls.append(time.monotonic())
+        return 'other'
+
+    t0 = time.monotonic()
+    first = asyncio.create_task(limiter.call('polygon', 'aggs', flaky))
+    await asyncio.sleep(0.01)
+    assert await limiter.call('polygon', 'aggs', other) == 'other'
+    assert await first == 'ok'
+
+    assert calls[1] - t0 >= 0.1 and calls[2] - t0 >= 0.1
+    stats = limiter.get_stats()
+    assert (stats['throttled'], stats['retries']) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_non_rate_limit_errors_not_retried():
+    """Test other errors surface at once and persistent 429s give up"""
+    limiter = RateLimiter(default_rate=1000.0, default_burst=10.0)
+
+    async def missing():
+        raise Status(404)
+
+    async def limited():
+        raise Status(429, {'Retry-After': '0'})
+
+    with pytest.raises(Status) as excinfo:
+        await limiter.call('polygon', 'aggs', missing)
+    assert excinfo.value.status == 404
+    with pytest.raises(Status) as excinfo:
+        await limiter.call('polygon', 'aggs', limited, retries=2)
+    assert excinfo.value.status == 429
+    assert limiter.get_stats()['retries'] == 2
+
+@pytest.mark.asyncio
+async def test_polygon_client_honors_retry_after():
+    """Test PolygonClient waits out a 429 from the API and retries"""
+    hits = []
+
+    async def aggs(request):
+        hits.append(time.monotonic())
+        if len(hits) == 1:
+            return web.json_response({'status': 'ERROR'}, status=429,
+                                     headers={'Retry-After': '0.1'})
+        return web.json_response({'results': [{'t': 1704153600000, 'o': 1, 'h': 1,
+                                               'l': 1, 'c': 1, 'v': 1}]})
+
+    app = web.Application()
+    app.router.add_get('/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/{start}/{end}',
+                       aggs)
+    server = TestServer(app)
+    await server.start_server()
+    limiter = RateLimiter(limits={'polygon': (100.0, 5.0)})
+    try:
+        async with PolygonClient('test-key', base_url=str(server.make_url('')),
+                                 limiter=limiter) as client:
+            results = await client.get_aggs('AAPL', 1, 'day', '2024-01-02', '2024-01-02')
+    finally:
+        await server.close()
+
+    assert len(results) == 1
+    assert hits[1] - hits[0] >= 0.1
+    assert limiter.get_stats()['throttled'] == 1
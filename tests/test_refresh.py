@@ -0,0 +1,135 @@
+# tests/test_refresh.py
+
+import asyncio
+import time
+import pytest
+import pandas as pd
+from datetime import datetime
+from src.cache.range_cache import RangeCache
+from src.cache.refresh import BackgroundRefresher
+
+class Source:
+    """Daily bars whose close is the fetch generation"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def fetch(self, symbol, start, end, timeframe):
+        self.calls += 1
+        generation = self.calls
+        await asyncio.sleep(self.delay)
+        days = pd.bdate_range(start, end, name='timestamp')
+        return pd.DataFrame({'close': float(generation)}, index=days)
+
+START, END = datetime(2024, 1, 8), datetime(2024, 1, 12)
+
+@pytest.mark.asyncio
+async def test_stale_served_while_revalidating():
+    """Test an expired range is returned at once and refreshed once in background"""
+    source = Source(delay=0.05)
+    cache = RangeCache(ttl=0.01, refresher=BackgroundRefresher())
+    await cache.get('AAPL', '1d', START, END, source.fetch)
+    await asyncio.sleep(0.02)
+
+    t0 = time.perf_counter()
+    stale = await asyncio.gather(*(
+        cache.get('AAPL', '1d', START, END, source.fetch) for _ in range(5)
+    ))
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < source.delay
+    assert all((frame['close'] == 1.0).all() for frame in stale)
+    # Keep the refreshed span fresh for the rest of the test
+    cache.ttl = None
+    await cache.refresher.join()
+    assert source.calls == 2
+    assert cache.get_stats()['refreshes'] == 1
+
+    fresh = await cache.get('AAPL', '1d', START, END, source.fetch)
+    assert (fresh['close'] == 2.0).all()
+    assert source.calls == 2
+    await cache.refresher.stop()
+
+@pytest.mark.asyncio
+async def test_stale_refetched_without_refresher():
+    """Test expired spans are refetched inline when no refresher is set"""
+    source = Source()
+    cache = RangeCache(ttl=0.01)
+    await cache.get('AAPL', '1d', START, END, source.fetch)
+    await asyncio.sleep(0.02)
+
+    data = await cache.get('AAPL', '1d', START, END, source.fetch)
+    assert (data['close'] == 2.0).all()
+
+@pytest.mark.asyncio
+async def test_hot_keys_refreshed_first():
+    """Test queued refreshes run in order of access frequency"""
+    refresher = BackgroundRefresher(max_concurrency=1)
+    order = []
+    gate = asyncio.Event()
+
+    async def blocker():
+        await gate.wait()
+
+    def job(name):
+        async def run():
+            order.append(name)
+        return run
+
+    refresher.schedule('busy', blocker)
+    await asyncio.sleep(0)
+    for name, hits in [('cold', 1), ('hot', 50), ('warm', 10)]:
+        for _ in range(hits):
+            refresher.record_access(name)
+        refresher.schedule(name, job(name))
+    assert not refresher.schedule('hot', job('hot'))
+
+    gate.set()
+    await refresher.join()
+    assert order == ['hot', 'warm', 'cold']
+    assert refresher.get_stats()['deduplicated'] == 1
+    await refresher.stop()
+
+@pytest.mark.asyncio
+async def test_concurrency_limit():
+    """Test no more than max_concurrency refreshes run at once"""
+    refresher = BackgroundRefresher(max_concurrency=2)
+    running = peak = 0
+
+    async def job():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    for i in range(6):
+        refresher.schedule(i, job)
+    await refresher.join()
+
+    assert peak == 2
+    assert refresher.get_stats()['completed'] == 6
+    await refresher.stop()
+
+@pytest.mark.asyncio
+async def test_pending_bound_drops_coldest():
+    """Test a full queue drops the least accessed refresh"""
+    refresher = BackgroundRefresher(max_concurrency=1, max_pending=2)
+    gate = asyncio.Event()
+
+    async def blocker():
+        await gate.wait()
+
+    refresher.schedule('busy', blocker)
+    await asyncio.sleep(0)
+    refresher.record_access('b')
+    refresher.record_access('c')
+    refresher.record_access('c')
+    assert refresher.schedule('a', blocker)
+    assert refresher.schedule('b', blocker)
+    assert refresher.schedule('c', blocker)
+
+    assert set(refresher._pending) == {'b', 'c'}
+    assert refresher.get_stats()['dropped'] == 1
+    await refresher.stop()
@@ -0,0 +1,140 @@
+# tests/test_sharded_cache.py
+
+import asyncio
+import threading
+import time
+import pytest
+from src.cache.memory_cache import MemoryCache
+from src.cache.sharded_cache import ShardedCache
+
+INF = float('inf')
+KEYS = [f"S{i}:1d:2024-01-01:2024-01-31" for i in range(512)]
+
+@pytest.mark.asyncio
+async def test_keys_spread_over_shards():
+    """Test keys are distributed and symbol-wide removal reaches every shard"""
+    cache = ShardedCache(shards=8)
+    for key in KEYS:
+        await cache.set(key, 1)
+    await cache.set('AAPL:1d:2024-01-01:2024-01-05', 2)
+    await cache.set('AAPL:1h:2024-01-01:2024-01-05', 3)
+
+    stats = cache.get_stats()
+    assert stats['size'] == len(KEYS) + 2
+    assert min(stats['shard_sizes']) > 0
+    assert await cache.get('AAPL:1h:2024-01-01:2024-01-05') == 3
+    assert await cache.remove_pattern('AAPL:*') == 2
+    assert cache.remove_where('S1', lambda key: True) == 1
+    assert await cache.size() == len(KEYS) - 1
+
+@pytest.mark.asyncio
+async def test_budget_split_across_shards():
+    """Test each shard enforces its share of the entry budget"""
+    cache = ShardedCache(shards=4, max_entries=8)
+    for key in KEYS[:64]:
+        await cache.set(key, 1)
+
+    assert all(size <= 2 for size in cache.get_stats()['shard_sizes'])
+    assert cache.evictions == 64 - await cache.size()
+
+@pytest.mark.asyncio
+async def test_lock_free_reads_of_immutable_entries():
+    """Test never-expiring entries are read without the lock and stay correct"""
+    cache = MemoryCache()
+    await cache.set('AAPL:closed', 1, ttl=INF)
+    await cache.set('AAPL:live', 2, ttl=60)
+
+    with cache.lock:
+        # Would deadlock if the immutable read took the lock
+        assert await cache.get('AAPL:closed') == 1
+    assert await cache.get('AAPL:live') == 2
+
+    await cache.delete('AAPL:closed')
+    assert await cache.get('AAPL:closed') is None
+
+@pytest.mark.asyncio
+async def test_referenced_entries_get_second_chance():
+    """Test lock-free hits protect an entry from the next eviction"""
+    cache = MemoryCache(max_entries=3)
+    for key in ('A:1', 'B:1', 'C:1'):
+        await cache.set(key, key, ttl=INF)
+    for entry in cache.cache.values():
+        entry.referenced = False
+
+    assert await cache.get('A:1') == 'A:1'
+    await cache.set('D:1', 'D:1', ttl=INF)
+
+    assert sorted(await cache.get_all_keys()) == ['A:1', 'C:1', 'D:1']
+
+def test_concurrent_threads_stay_consistent():
+    """Test mixed reads and writes from many threads keep the cache intact"""
+    cache = ShardedCache(shards=8, max_entries=256)
+    errors = []
+
+    def work(offset):
+        async def loop():
+            for i in range(2000):
+                key = KEYS[(offset + i) % len(KEYS)]
+                if i % 4 == 0:
+                    await cache.set(key, i, ttl=INF if i % 8 else 60)
+                else:
+                    await cache.get(key)
+        try:
+            asyncio.run(loop())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(n * 37,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert asyncio.run(cache.size()) <= 256
+    assert sum(len(s._symbols.get(k.split(':')[0], ())) for s in cache.shards
+               for k in s.cache) == asyncio.run(cache.size())
+
+def read_throughput(cache, workers: int, reads: int = 10000) -> float:
+    """Aggregate get() calls per second over worker threads, best of 3"""
+    def work():
+        async def loop():
+            for i in range(reads):
+                await cache.get(KEYS[i % len(KEYS)])
+        asyncio.run(loop())
+
+    best = 0.0
+    for _ in range(3):
+        threads = [threading.Thread(target=work) for _ in range(workers)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        best = max(best, workers * reads / (time.perf_counter() - t0))
+    return best
+
+@pytest.mark.benchmark
+def test_read_throughput_by_worker_count(benchmark_logger):
+    """Benchmark read throughput of locked vs striped vs lock-free reads"""
+    results = {}
+    for name, make, ttl in [
+        ('single-lock', MemoryCache, 3600),
+        ('sharded', ShardedCache, 3600),
+        ('sharded-immutable', ShardedCache, INF)
+    ]:
+        cache = make()
+        for key in KEYS:
+            asyncio.run(cache.set(key, 1, ttl=ttl))
+        results[name] = {w: read_throughput(cache, w) for w in (1, 2, 4, 8)}
+        benchmark_logger.info(
+            f"{name} reads/s by workers: " +
+            ", ".join(f"{w}={rate / 1e3:.0f}k" for w, rate in results[name].items())
+        )
+
+    # Striping must not collapse under contention
+    assert results['sharded'][8] > results['sharded'][1] * 0.5
+    assert results['sharded-immutable'][8] > results['sharded-immutable'][1] * 0.5
+    # Lock-free reads beat locked ones at every worker count
+    for workers in (1, 2, 4, 8):
+        assert results['sharded-immutable'][workers] > results['sharded'][workers]
@@ -0,0 +1,113 @@
+# tests/test_statements.py
+
+import pytest
+from unittest.mock import MagicMock, Mock
+from src.database.operations import Operations
+from src.database.statements import StatementCache
+from src.database.monitoring import Monitoring
+
+@pytest.fixture
+def connection():
+    """Create connection mock handing out a new cursor per call"""
+    conn = MagicMock()
+    conn.cursor.side_effect = lambda **kwargs: MagicMock(
+        fetchall=Mock(return_value=[{'count': 3}]), rowcount=1, lastrowid=7
+    )
+    return conn
+
+@pytest.fixture
+def ops(connection):
+    """Create Operations over a core yielding one pooled connection"""
+    core = MagicMock()
+    core.config.allow_local_infile = False
+    core.config.statement_cache_size = 4
+    core.transaction.return_value.__enter__.return_value = connection
+    core.get_connection.return_value.__enter__.return_value = connection
+    return Operations(core)
+
+def test_sql_cached_by_shape(ops, connection):
+    """Test repeated lookups reuse SQL text and one prepared cursor"""
+    for symbol in ('AAPL', 'MSFT', 'AAPL'):
+        ops.select('market_data', {'symbol': symbol, 'data_type': 'STOCK'}, limit=100)
+
+    stats = ops.statements.get_stats()
+    assert stats['sql_misses'] == 1
+    assert stats['sql_hits'] == 2
+    assert stats['prepare_misses'] == 1
+    assert stats['prepare_hits'] == 2
+    assert stats['table_hits'] == {'market_data': 2}
+    connection.cursor.assert_called_once_with(prepared=True, dictionary=True)
+
+    query = "SELECT * FROM market_data WHERE symbol = %s AND data_type = %s LIMIT %s"
+    executed = ops.statements._prepared[connection.raw_connection]
+    (key, cursor), = executed.items()
+    assert key == (query, True)
+    assert cursor.execute.call_args.args == (query, ('AAPL', 'STOCK', 100))
+
+def test_same_string_object_reused(ops, connection):
+    """Test the prepared cursor sees the identical SQL object so it skips re-prepare"""
+    ops.delete('market_data', {'symbol': 'AAPL'})
+    ops.delete('market_data', {'symbol': 'MSFT'})
+
+    (_, cursor), = ops.statements._prepared[connection.raw_connection].items()
+    first, second = cursor.execute.call_args_list
+    assert first.args[0] is second.args[0]
+
+def test_different_shapes_miss(ops):
+    """Test each operation, table and column set gets its own entry"""
+    assert ops.insert('market_data', {'symbol': 'AAPL', 'close': 1.0}) == 7
+    assert ops.update('market_data', {'close': 2.0}, {'symbol': 'AAPL'}) == 1
+    assert ops.count('market_data', {'symbol': 'AAPL'}) == 3
+    assert ops.count('market_data') == 3
+
+    stats = ops.statements.get_stats()
+    assert stats['sql_misses'] == 4
+    assert stats['sql_hits'] == 0
+
+def test_lru_eviction_closes_prepared_cursor(connection):
+    """Test cursors beyond max_size are closed to free server statements"""
+    cache = StatementCache(max_size=2)
+    cursors = []
+    for table in ('a', 'b', 'c'):
+        query = cache.sql(('delete', table), lambda: f"DELETE FROM {table} WHERE id = %s")
+        with cache.execute(connection, query, (1,)) as cursor:
+            cursors.append(cursor)
+
+    cursors[0].close.assert_called_once()
+    cursors[2].close.assert_not_called()
+    assert cache.get_stats()['evictions'] == 1
+    assert cache.get_stats()['size'] == 2
+
+def test_failed_execute_drops_cursor(connection):
+    """Test a cursor whose execute fails is not reused"""
+    cache = StatementCache()
+    connection.cursor.side_effect = None
+    connection.cursor.return_value.execute.side_effect = Exception("gone away")
+
+    with pytest.raises(Exception):
+        with cache.execute(connection, "SELECT 1"):
+            pass
+
+    connection.cursor.return_value.close.assert_called_once()
+    assert not cache._prepared[connection.raw_connection]
+
+def test_disabled_cache_uses_plain_cursor(connection):
+    """Test max_size 0 falls back to unprepared, closed cursors"""
+    cache = StatementCache(max_size=0)
+    with cache.execute(connection, "SELECT 1") as cursor:
+        pass
+
+    connection.cursor.assert_called_once_with(dictionary=False)
+    cursor.close.assert_called_once()
+
+def test_monitoring_records_statement_stats(ops):
+    """Test statement cache counters are written as system metrics"""
+    ops.select('market_data', {'symbol': 'AAPL'})
+    monitoring = Monitoring(Mock())
+    monitoring.core.execute.reset_mock()
+
+    monitoring.record_statement_stats(ops.statements.get_stats())
+
+    names = [c.args[1][0] for c in monitoring.core.execute.call_args_list]
+    assert 'statements_prepare_hits' in names
+    assert 'statements_parse_time_saved' in names
@@ -0,0 +1,92 @@
+# tests/test_ttl_policy.py
+
+import asyncio
+import pytest
+import pandas as pd
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+from src.cache.async_memo import AsyncMemo
+from src.cache.memory_cache import MemoryCache
+from src.cache.range_cache import RangeCache
+from src.cache.ttl_policy import TTLPolicy
+
+NY = ZoneInfo('America/New_York')
+INF = float('inf')
+
+def at(*args) -> TTLPolicy:
+    """Policy whose clock is fixed at a New York wall time"""
+    now = datetime(*args, tzinfo=NY)
+    return TTLPolicy(live_ttl=0.01, now=lambda: now)
+
+def test_closed_boundary_follows_session_close():
+    """Test a session counts as closed only after close plus settle"""
+    assert at(2024, 1, 10, 12, 0).closed_through() == date(2024, 1, 9)
+    assert at(2024, 1, 10, 16, 5).closed_through() == date(2024, 1, 9)
+    assert at(2024, 1, 10, 16, 30).closed_through() == date(2024, 1, 10)
+    # Weekends look back to Friday
+    assert at(2024, 1, 13, 9, 0).closed_through() == date(2024, 1, 12)
+    # Other zones are converted to exchange time
+    utc = datetime(2024, 1, 10, 22, 0, tzinfo=ZoneInfo('UTC'))
+    assert TTLPolicy().closed_through(utc) == date(2024, 1, 10)
+
+def test_ttl_and_split():
+    """Test closed ranges never expire and mixed ranges split at the boundary"""
+    policy = at(2024, 1, 10, 12, 0)
+
+    assert policy.ttl_for(datetime(2024, 1, 9)) == INF
+    assert policy.ttl_for(date(2024, 1, 10)) == 0.01
+    assert policy.split(date(2024, 1, 2), date(2024, 1, 10)) == [
+        (date(2024, 1, 2), date(2024, 1, 9), INF),
+        (date(2024, 1, 10), date(2024, 1, 10), 0.01)
+    ]
+    assert policy.split(date(2024, 1, 10), date(2024, 1, 12)) == [
+        (date(2024, 1, 10), date(2024, 1, 12), 0.01)
+    ]
+    assert policy.key_ttl('AAPL:1d:2024-01-02:2024-01-05') == INF
+    assert policy.key_ttl('AAPL:1d:2024-01-02:2024-01-10') == 0.01
+    assert policy.key_ttl('AAPL:latest') is None
+
+@pytest.mark.asyncio
+async def test_range_cache_refreshes_only_live_tail():
+    """Test expiry refetches the current session and keeps closed history"""
+    spans = []
+
+    async def fetch(symbol, start, end, timeframe):
+        spans.append((start.date(), end.date()))
+        days = pd.bdate_range(start, end, name='timestamp')
+        return pd.DataFrame({'close': float(len(spans))}, index=days)
+
+    cache = RangeCache(ttl=3600, policy=at(2024, 1, 10, 12, 0))
+    await cache.get('AAPL', '1d', datetime(2024, 1, 2), datetime(2024, 1, 10), fetch)
+    await asyncio.sleep(0.02)
+    data = await cache.get('AAPL', '1d', datetime(2024, 1, 2), datetime(2024, 1, 10), fetch)
+
+    assert spans == [(date(2024, 1, 2), date(2024, 1, 10)), (date(2024, 1, 10), date(2024, 1, 10))]
+    assert data['close'].tolist() == [1.0] * 6 + [2.0]
+
+@pytest.mark.asyncio
+async def test_memory_cache_and_memo_use_policy():
+    """Test per-key TTLs replace the fixed default"""
+    policy = at(2024, 1, 10, 12, 0)
+    cache = MemoryCache(ttl_seconds=3600, ttl_for=policy.key_ttl)
+    await cache.set('AAPL:1d:2024-01-02:2024-01-05', 1)
+    await cache.set('AAPL:1d:2024-01-02:2024-01-10', 2)
+    await cache.set('AAPL:latest', 3)
+    await asyncio.sleep(0.02)
+
+    assert await cache.get('AAPL:1d:2024-01-02:2024-01-05') == 1
+    assert await cache.get('AAPL:1d:2024-01-02:2024-01-10') is None
+    assert await cache.get('AAPL:latest') == 3
+
+    calls = []
+
+    async def load(symbol, end):
+        calls.append(end)
+        return symbol
+
+    memo = AsyncMemo(load, ttl_for=lambda symbol, end: policy.ttl_for(end))
+    for _ in range(2):
+        await memo('AAPL', date(2024, 1, 5))
+        await memo('AAPL', date(2024, 1, 10))
+        await asyncio.sleep(0.02)
+    assert calls == [date(2024, 1, 5), date(2024, 1, 10), date(2024, 1, 10)]
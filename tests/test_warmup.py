@@ -0,0 +1,120 @@
+# tests/test_warmup.py
+
+import asyncio
+import json
+import time
+import pytest
+from collections import Counter
+from datetime import datetime
+from unittest.mock import MagicMock
+from src.cache.warmup import (
+    ACCESS_METRIC, AccessLog, CacheWarmer, FileAccessStore, MetricsAccessStore, WarmupTarget
+)
+from src.database.core import Core
+
+def target(symbol: str) -> WarmupTarget:
+    return WarmupTarget(symbol, '1d', datetime(2024, 1, 2), datetime(2024, 3, 28, 16, 0))
+
+def test_target_key_round_trip():
+    """Test targets survive the string form used by stores"""
+    t = target('AAPL')
+    assert WarmupTarget.from_key(t.key) == t
+
+@pytest.mark.asyncio
+async def test_file_store_accumulates_across_restarts(tmp_path):
+    """Test flushed counts add up in the file and rank warmup targets"""
+    path = str(tmp_path / 'access.json')
+    log = AccessLog(FileAccessStore(path))
+    for symbol, hits in [('AAPL', 3), ('MSFT', 1)]:
+        for _ in range(hits):
+            log.record(target(symbol))
+    assert await log.flush() == 2
+
+    restarted = AccessLog(FileAccessStore(path))
+    for _ in range(3):
+        restarted.record(target('MSFT'))
+    await restarted.stop()
+
+    with open(path) as f:
+        assert json.load(f) == {target('AAPL').key: 3, target('MSFT').key: 4}
+    assert await AccessLog(FileAccessStore(path)).top(1) == [target('MSFT')]
+
+@pytest.mark.asyncio
+async def test_metrics_store_writes_deltas_and_reads_window():
+    """Test system_metrics gets one row per range and is summed by key"""
+    core = MagicMock(spec=Core)
+    cursor = core.transaction.return_value.__enter__.return_value.cursor.return_value
+    core.execute.return_value = [{'access_key': target('AAPL').key, 'hits': 7.0}]
+    log = AccessLog(MetricsAccessStore(core, window_hours=12))
+    log.record(target('AAPL'))
+    log.record(target('AAPL'))
+
+    assert await log.top(5) == [target('AAPL')]
+    assert core.execute.call_args.args[1] == (ACCESS_METRIC, 12, 5)
+
+    await log.flush()
+    sql, rows = cursor.executemany.call_args.args
+    assert 'INSERT INTO system_metrics' in sql
+    assert rows == [(ACCESS_METRIC, 2, json.dumps({'key': target('AAPL').key}))]
+    assert await log.flush() == 0
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_counts():
+    """Test counts survive a store outage"""
+    store = MagicMock()
+    store.save.side_effect = ConnectionError('down')
+    log = AccessLog(store)
+    log.record(target('AAPL'))
+
+    assert await log.flush() == 0
+    store.save.side_effect = None
+    assert await log.flush() == 1
+    assert store.save.call_args.args[0] == Counter({target('AAPL').key: 1})
+
+@pytest.mark.asyncio
+async def test_warmer_preloads_top_n_concurrently_with_pacing():
+    """Test warmup loads the hottest ranges within concurrency and rate limits"""
+    log = AccessLog()
+    for i, symbol in enumerate(['AAPL', 'MSFT', 'GOOG', 'AMZN', 'TSLA', 'NVDA']):
+        for _ in range(10 - i):
+            log.record(target(symbol))
+    loaded, running, peak, starts = [], 0, 0, []
+    reports = []
+
+    async def load(t):
+        nonlocal running, peak
+        starts.append(time.monotonic())
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.03)
+        running -= 1
+        if t.symbol == 'GOOG':
+            raise RuntimeError('upstream 500')
+        loaded.append(t.symbol)
+
+    warmer = CacheWarmer(log, load, top_n=5, concurrency=2, rate=100.0,
+                         progress=lambda p: reports.append((p.done, p.failed)))
+    progress = await warmer.run()
+
+    assert sorted(loaded) == ['AAPL', 'AMZN', 'MSFT', 'TSLA']
+    assert (progress.done, progress.failed, progress.total) == (4, 1, 5)
+    assert progress.finished
+    assert peak == 2
+    assert min(b - a for a, b in zip(starts, starts[1:])) >= 0.009
+    assert reports[-1] == (4, 1) and len(reports) == 6
+
+@pytest.mark.asyncio
+async def test_warmer_gives_up_after_max_seconds():
+    """Test a slow upstream cannot block startup past max_seconds"""
+    log = AccessLog()
+    for symbol in ('AAPL', 'MSFT', 'GOOG'):
+        log.record(target(symbol))
+
+    async def load(t):
+        await asyncio.sleep(0 if t.symbol == 'AAPL' else 10)
+
+    t0 = time.monotonic()
+    progress = await CacheWarmer(log, load, rate=1000.0, max_seconds=0.05).run()
+
+    assert time.monotonic() - t0 < 1
+    assert (progress.done, progress.skipped) == (1, 2)